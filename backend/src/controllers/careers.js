@@ -3,6 +3,30 @@ const User = require('../models/User');
 
 const ML_SERVICE_URL = process.env.ML_SERVICE_URL || 'http://localhost:5001';
 
+// Last ML response per distinct input, revalidated with its ETag so an unchanged
+// recommendation costs the ML service a hash and a 304 instead of a full predict
+const RECOMMENDATION_CACHE_SIZE = 500;
+const recommendationCache = new Map();
+
+const fetchRecommendations = async (mlData) => {
+  const key = JSON.stringify(mlData);
+  const cached = recommendationCache.get(key);
+  const response = await axios.post(`${ML_SERVICE_URL}/api/career/recommend`, mlData, {
+    headers: cached ? { 'If-None-Match': cached.etag } : {},
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+  });
+
+  const data = response.status === 304 ? cached.data : response.data;
+  recommendationCache.delete(key);
+  if (response.headers.etag) {
+    recommendationCache.set(key, { etag: response.headers.etag, data });
+    if (recommendationCache.size > RECOMMENDATION_CACHE_SIZE) {
+      recommendationCache.delete(recommendationCache.keys().next().value);
+    }
+  }
+  return data;
+};
+
 const getCareerSuggestions = async (req, res) => {
   try {
     const { skills, interests, education, experience, goals } = req.body;
@@ -17,7 +41,7 @@ const getCareerSuggestions = async (req, res) => {
     };
     
     // Call ML service
-    const response = await axios.post(`${ML_SERVICE_URL}/api/career/recommend`, mlData);
+    const result = await fetchRecommendations(mlData);
     
     // Save to user history if user exists
     if (req.user) {
@@ -25,8 +49,8 @@ const getCareerSuggestions = async (req, res) => {
         $push: {
           careerHistory: {
             input: mlData,
-            recommendations: response.data.recommendations,
-            insights: response.data.insights,
+            recommendations: result.recommendations,
+            insights: result.insights,
             timestamp: new Date()
           }
         }
@@ -35,8 +59,8 @@ const getCareerSuggestions = async (req, res) => {
     
     res.status(200).json({
       status: 'success',
-      data: response.data.recommendations,
-      insights: response.data.insights
+      data: result.recommendations,
+      insights: result.insights
     });
   } catch (error) {
     console.error('Career suggestions error:', error.message);
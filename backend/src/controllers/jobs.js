@@ -2,6 +2,7 @@ const { Job, Application } = require('../models');
 const { Op } = require('sequelize');
 const { validationResult } = require('express-validator');
 const jobExpiryService = require('../services/jobExpiryService');
+const jobIndexSync = require('../services/jobIndexSync');
 
 // @desc    Create new job
 // @route   POST /api/jobs
@@ -48,6 +49,7 @@ const createJob = async (req, res) => {
       recruiterId: req.user.id,
       company: req.user.company || req.user.name
     });
+    jobIndexSync.syncJob(job);
 
     res.status(201).json({
       status: 'success',
@@ -201,6 +203,7 @@ const updateJob = async (req, res) => {
 
     await job.update(req.body);
     await job.reload();
+    jobIndexSync.syncJob(job);
 
     res.status(200).json({
       status: 'success',
@@ -240,6 +243,7 @@ const closeJob = async (req, res) => {
 
     job.status = 'closed';
     await job.save();
+    jobIndexSync.syncJob(job);
 
     res.status(200).json({
       status: 'success',
@@ -289,6 +293,7 @@ const toggleJobStatus = async (req, res) => {
 
     job.status = job.status === 'active' ? 'paused' : 'active';
     await job.save();
+    jobIndexSync.syncJob(job);
 
     res.status(200).json({
       status: 'success',
@@ -327,6 +332,7 @@ const deleteJob = async (req, res) => {
     }
 
     await job.destroy();
+    jobIndexSync.removeJob(job.id);
 
     res.status(200).json({
       status: 'success',
@@ -382,6 +388,7 @@ const updateJobStatus = async (req, res) => {
 
     job.status = status;
     await job.save();
+    jobIndexSync.syncJob(job);
 
     res.status(200).json({
       status: 'success',
@@ -433,6 +440,7 @@ const extendJobDeadline = async (req, res) => {
     job.isExpired = false;
     job.status = 'active';
     await job.save();
+    jobIndexSync.syncJob(job);
 
     res.status(200).json({
       status: 'success',
@@ -474,6 +482,7 @@ const rejectExtension = async (req, res) => {
     job.isExpired = true;
     job.extensionRequested = false;
     await job.save();
+    jobIndexSync.syncJob(job);
 
     res.status(200).json({
       status: 'success',
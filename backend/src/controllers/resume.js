@@ -31,6 +31,10 @@ const analyzeResume = async (req, res) => {
       contentType: req.file.mimetype
     });
     formData.append('job_role', jobRole);
+    if (req.user) {
+      // Lets the ML service group near-duplicate uploads by applicant
+      formData.append('applicant_id', req.user.id);
+    }
     
     console.log('Calling ML service at:', `${ML_SERVICE_URL}/api/resume/analyze`);
     
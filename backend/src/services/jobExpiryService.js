@@ -1,6 +1,7 @@
 const { Job, User } = require('../models');
 const { Op } = require('sequelize');
 const emailNotificationService = require('./emailNotificationService');
+const jobIndexSync = require('./jobIndexSync');
 
 class JobExpiryService {
   // Check for jobs expiring in 3 days and send extension emails
@@ -54,6 +55,10 @@ class JobExpiryService {
         }
       );
 
+      if (affectedRows > 0) {
+        await jobIndexSync.expireJobs();
+      }
+
       return affectedRows;
     } catch (error) {
       console.error('Error marking expired jobs:', error);
@@ -0,0 +1,36 @@
+const axios = require('axios');
+
+const ML_SERVICE_URL = process.env.ML_SERVICE_URL || 'http://localhost:5001';
+
+// Keeps the ML service's job recommendation index in step with the jobs table.
+// Failures are logged and never block the job request that triggered them.
+class JobIndexSync {
+  // Push a job's current state; the index drops it if it is no longer open
+  async syncJob(job) {
+    try {
+      const posting = typeof job.toJSON === 'function' ? job.toJSON() : job;
+      await axios.post(`${ML_SERVICE_URL}/api/jobs`, posting, { timeout: 2000 });
+    } catch (error) {
+      console.error('Failed to sync job to ML index:', error.message);
+    }
+  }
+
+  async removeJob(jobId) {
+    try {
+      await axios.delete(`${ML_SERVICE_URL}/api/jobs/${jobId}`, { timeout: 2000 });
+    } catch (error) {
+      console.error('Failed to remove job from ML index:', error.message);
+    }
+  }
+
+  // Tombstone every posting past its deadline, mirroring markExpiredJobs
+  async expireJobs() {
+    try {
+      await axios.post(`${ML_SERVICE_URL}/api/jobs/expire`, {}, { timeout: 2000 });
+    } catch (error) {
+      console.error('Failed to expire jobs in ML index:', error.message);
+    }
+  }
+}
+
+module.exports = new JobIndexSync();
@@ -4,12 +4,48 @@ import { FiMessageCircle, FiSend, FiTrash2, FiX } from "react-icons/fi";
 import { useSelector } from "react-redux";
 import chatbotService from "../services/chatbotService";
 
+const CAREER_ADVICE_PATTERN =
+  /\b(career|job role|career path|what should i|which role|suits me|fit me)\b/i;
+
+const formatStreamEvent = (event, data, hasOthers) => {
+  switch (event) {
+    case "top": {
+      const salary = data.salary_range;
+      let text = `🎯 **Top Match: ${data.career}** (${data.match_percentage}% match)`;
+      if (salary) {
+        text += `\n💰 $${salary.min.toLocaleString()} - $${salary.max.toLocaleString()}`;
+      }
+      if (data.missing_required_skills?.length) {
+        text += `\n📚 Skills to build: ${data.missing_required_skills.slice(0, 3).join(", ")}`;
+      }
+      return text;
+    }
+    case "recommendation":
+      return `${hasOthers ? "" : "\n\n**Other good fits:**"}\n• ${data.career} (${data.match_percentage}% match)`;
+    case "insights":
+      return data?.length
+        ? `\n\n💡 **Insights:**\n${data.map((insight) => `• ${insight}`).join("\n")}`
+        : "";
+    default:
+      return "";
+  }
+};
+
+// A random, unguessable id per conversation: the ML service keys session state
+// on it, so it must not be derived from the user's id.
+const newSessionId = () => {
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  return Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0")).join("");
+};
+
 const Chatbot = () => {
   const [isOpen, setIsOpen] = useState(false);
   const [messages, setMessages] = useState([]);
   const [inputMessage, setInputMessage] = useState("");
   const [isLoading, setIsLoading] = useState(false);
   const messagesEndRef = useRef(null);
+  const streamControllerRef = useRef(null);
+  const sessionIdRef = useRef(newSessionId());
   const { user } = useSelector((state) => state.auth);
 
   const scrollToBottom = () => {
@@ -20,6 +56,14 @@ const Chatbot = () => {
     scrollToBottom();
   }, [messages]);
 
+  // Unmounting drops any in-flight stream; closing the chat does so in toggleChat
+  useEffect(() => () => streamControllerRef.current?.abort(), []);
+
+  const toggleChat = () => {
+    if (isOpen) streamControllerRef.current?.abort();
+    setIsOpen(!isOpen);
+  };
+
   useEffect(() => {
     if (isOpen && messages.length === 0) {
       // Send welcome message when chatbot opens
@@ -49,6 +93,11 @@ const Chatbot = () => {
     setInputMessage("");
     setIsLoading(true);
 
+    if (CAREER_ADVICE_PATTERN.test(inputMessage)) {
+      const streamed = await streamCareerAdvice(inputMessage);
+      if (streamed) return;
+    }
+
     try {
       const response = await chatbotService.sendMessage(inputMessage);
 
@@ -82,12 +131,64 @@ const Chatbot = () => {
     }
   };
 
+  // Renders the ML service's SSE stream into one bot message as events arrive.
+  // Returns false if nothing was received so the caller can fall back.
+  const streamCareerAdvice = async (message) => {
+    const botMessageId = Date.now() + 1;
+    const controller = new AbortController();
+    streamControllerRef.current = controller;
+    let received = false;
+    let hasOthers = false;
+
+    try {
+      await chatbotService.streamCareerAdvice(message, {
+        sessionId: sessionIdRef.current,
+        signal: controller.signal,
+        onEvent: (event, data) => {
+          const chunk = formatStreamEvent(event, data, hasOthers);
+          if (event === "recommendation") hasOthers = true;
+          if (!chunk) return;
+
+          if (!received) {
+            received = true;
+            setIsLoading(false);
+            setMessages((prev) => [
+              ...prev,
+              { id: botMessageId, text: chunk, sender: "bot", timestamp: new Date() },
+            ]);
+          } else {
+            setMessages((prev) =>
+              prev.map((msg) =>
+                msg.id === botMessageId ? { ...msg, text: msg.text + chunk } : msg
+              )
+            );
+          }
+        },
+      });
+    } catch (error) {
+      if (error.name !== "AbortError") {
+        console.error("Career advice stream failed:", error);
+      }
+    } finally {
+      if (streamControllerRef.current === controller) {
+        streamControllerRef.current = null;
+      }
+      if (received) setIsLoading(false);
+    }
+
+    return received;
+  };
+
   const clearChat = async () => {
+    streamControllerRef.current?.abort();
     try {
       await chatbotService.clearSession();
+      await chatbotService.clearCareerSession(sessionIdRef.current);
     } catch (error) {
       console.error("Failed to clear session:", error);
     } finally {
+      // A cleared chat is a new conversation
+      sessionIdRef.current = newSessionId();
       const welcomeMessage = {
         id: Date.now(),
         text: `Hello ${
@@ -127,7 +228,7 @@ const Chatbot = () => {
         whileTap={{ scale: 0.95 }}
       >
         <button
-          onClick={() => setIsOpen(!isOpen)}
+          onClick={toggleChat}
           className="relative bg-gradient-to-r from-blue-600 to-purple-600 hover:from-blue-700 hover:to-purple-700 text-white p-4 rounded-full shadow-xl transition-all duration-300 group"
         >
           <div className="absolute inset-0 bg-gradient-to-r from-blue-600 to-purple-600 rounded-full animate-ping opacity-20"></div>
@@ -71,5 +71,5 @@ mlApi.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
-export { mlApi };
+export { mlApi, ML_API_URL };
 export default api;
\ No newline at end of file
@@ -1,4 +1,4 @@
-import api from './api';
+import api, { mlApi, ML_API_URL } from './api';
 
 const sendMessage = async (message) => {
   try {
@@ -20,9 +20,60 @@ const clearSession = async () => {
   }
 };
 
+const clearCareerSession = async (sessionId) => {
+  const response = await mlApi.post('/chatbot/clear-session', { session_id: sessionId });
+  return response.data;
+};
+
+// Streams career advice from the ML service as Server-Sent Events.
+// onEvent(event, data) is called for "session", "top", "recommendation" and "insights";
+// aborting the signal closes the connection and stops the computation server-side.
+const streamCareerAdvice = async (message, { sessionId, onEvent, signal } = {}) => {
+  const response = await fetch(`${ML_API_URL}/chatbot/career-advice/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify({ message, session_id: sessionId }),
+    signal
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`Streaming request failed (${response.status})`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      let data = '';
+      frame.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+
+      const payload = data ? JSON.parse(data) : null;
+      if (event === 'error') throw new Error(payload?.error || 'Streaming failed');
+      if (event === 'done') return;
+      onEvent?.(event, payload);
+    }
+  }
+};
+
 const chatbotService = {
   sendMessage,
-  clearSession
+  clearSession,
+  clearCareerSession,
+  streamCareerAdvice
 };
 
 export default chatbotService;
\ No newline at end of file
@@ -1,31 +1,475 @@
-from flask import Flask, request, jsonify
+import time
+_import_started = time.perf_counter()
+
+from flask import Flask, Request, Response, g, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
+import hmac
+import json
 import os
+import random
+import tempfile
+import threading
 from dotenv import load_dotenv
-from services.career_recommender import CareerRecommender
-from services.resume_analyzer import ResumeAnalyzer
-from services.chatbot_ml import ChatbotML
+from services.admission import AdmissionRejected, AdmissionScheduler, upload_pages
+from services.http_cache import choose_encoding, compress, request_etag
+from services.profiling import PROFILE_MODES, ProfileStore, start_profiler
+from services.single_flight import FileSingleFlight, SingleFlight, SingleFlightTimeout, request_key
+from services.uploads import SpooledUpload, UploadBudget, UploadTooLarge, detach_upload, upload_digest
+
+# Service modules (numpy, PyPDF2, python-docx, scikit-learn...) are imported by the
+# factories below on first use, so a worker can answer /api/health before any of them load
 
 load_dotenv()
 
+# Upload limits: bytes per resume file, bytes of all files in one request, and how much
+# of each file is held in memory before it is spooled to a temporary file
+MAX_RESUME_BYTES = int(os.getenv('MAX_RESUME_BYTES', 10 * 1024 * 1024))
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', 64 * 1024 * 1024))
+UPLOAD_SPOOL_BYTES = int(os.getenv('UPLOAD_SPOOL_BYTES', 1024 * 1024))
+
+class UploadRequest(Request):
+    """Spools each multipart file into a size-checked buffer as the body is parsed"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if not hasattr(self, '_upload_budget'):
+            self._upload_budget = UploadBudget(MAX_UPLOAD_BYTES)
+        return SpooledUpload(MAX_RESUME_BYTES, self._upload_budget, UPLOAD_SPOOL_BYTES)
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)
 
-# Initialize ML services
-career_recommender = CareerRecommender()
-resume_analyzer = ResumeAnalyzer()
-chatbot_ml = ChatbotML()
+@app.before_request
+def reject_oversize_uploads():
+    """Refuse multipart bodies over MAX_UPLOAD_BYTES from Content-Length, then parse them here
+    so a file crossing a limit mid-stream is a 413 rather than an error inside the view"""
+    if request.mimetype != 'multipart/form-data':
+        return None
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+        return jsonify({'error': f"Upload exceeds the {MAX_UPLOAD_BYTES} byte limit"}), 413
+    request.files
+    return None
+
+@app.errorhandler(UploadTooLarge)
+def upload_too_large(e):
+    return jsonify({'error': str(e)}), 413
+
+# Admission: at most ADMISSION_MAX_CONCURRENT requests run at once (0 turns admission off);
+# requests estimated over ADMISSION_SLOW_COST_MS share only ADMISSION_SLOW_LIMIT of those slots
+ADMISSION_MAX_CONCURRENT = int(os.getenv('ADMISSION_MAX_CONCURRENT', 8))
+admission = AdmissionScheduler(
+    max_concurrent=ADMISSION_MAX_CONCURRENT,
+    fast_limit=int(os.getenv('ADMISSION_FAST_LIMIT', ADMISSION_MAX_CONCURRENT)),
+    # Slow requests are CPU bound: by default they get half the cores, so cheap ones always find one free
+    slow_limit=int(os.getenv('ADMISSION_SLOW_LIMIT', max((os.cpu_count() or 1) // 2, 1))),
+    slow_cost_ms=float(os.getenv('ADMISSION_SLOW_COST_MS', 100)),
+    queue_timeout=float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 30))
+) if ADMISSION_MAX_CONCURRENT > 0 else None
+ADMISSION_EXEMPT = {'health_check', 'admission_stats', 'static'}
+
+def request_units():
+    """Size of the request in cost-model units: resume pages for uploads, profiles for batches, else 1"""
+    if request.files:
+        return sum(upload_pages(file.stream) for key in request.files for file in request.files.getlist(key))
+    if request.endpoint == 'recommend_career_batch':
+        users = (request.get_json(silent=True) or {}).get('users')
+        return len(users) if isinstance(users, list) else 1
+    return 1
+
+@app.before_request
+def admit_request():
+    """Wait for a slot in the lane the request's estimated cost puts it in, or answer 503"""
+    if admission is None or request.method == 'OPTIONS' or request.endpoint in ADMISSION_EXEMPT or request.endpoint is None:
+        return None
+    units = request_units()
+    try:
+        g.admission = (admission.acquire(admission.cost_model.estimate(request.endpoint, units)), units)
+    except AdmissionRejected as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    return None
+
+@app.teardown_request
+def release_admission(exc=None):
+    # Runs after a streamed response has finished, so streams hold their slot while they send
+    ticket = g.pop('admission', None)
+    if ticket is not None:
+        admission.release(ticket[0], request.endpoint, ticket[1])
+
+# Per-request profiling, off unless PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set. A request
+# carrying "X-Profile: <PROFILE_TOKEN>" is profiled (X-Profile-Mode: sample or cprofile), and
+# PROFILE_SAMPLE_RATE of all requests are sampled. The hooks are only installed when enabled.
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN') or None
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL_MS', 5)) / 1000
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'ml-service-profiles'))
+PROFILE_EXEMPT = {'list_profiles', 'download_profile', 'static'}
+profile_store = ProfileStore(PROFILE_DIR, keep=int(os.getenv('PROFILE_KEEP', 100))) \
+    if PROFILE_TOKEN or PROFILE_SAMPLE_RATE > 0 else None
+
+def profile_admin():
+    header = request.headers.get('X-Profile')
+    return PROFILE_TOKEN is not None and header is not None and hmac.compare_digest(header, PROFILE_TOKEN)
+
+def start_request_profile():
+    """Registered after admit_request, so time spent queueing for a slot is not profiled"""
+    if request.endpoint in PROFILE_EXEMPT:
+        return None
+    if profile_admin():
+        reason, mode = 'header', request.headers.get('X-Profile-Mode', 'sample')
+        if mode not in PROFILE_MODES:
+            return jsonify({'error': f"X-Profile-Mode must be one of {', '.join(PROFILE_MODES)}"}), 400
+    elif PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        reason, mode = 'sampled', 'sample'
+    else:
+        return None
+    try:
+        profiler = start_profiler(mode, PROFILE_INTERVAL)
+    except ValueError as e:
+        # cProfile cannot run in two threads at once on newer Pythons; the request goes on unprofiled
+        print(f"[WARNING] Could not start {mode} profiler: {e}")
+        return None
+    g.profile = (profile_store.new_id(), reason, mode, time.time(), time.perf_counter(), profiler)
+    return None
+
+def tag_request_profile(response):
+    profile = g.get('profile')
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profile[0]
+        g.profile_status = response.status_code
+    return response
+
+def save_request_profile(exc=None):
+    # Teardown, so a streamed response is profiled until its last chunk
+    profile = g.pop('profile', None)
+    if profile is None:
+        return
+    profile_id, reason, mode, started_at, started, profiler = profile
+    profiler.stop()
+    try:
+        profile_store.save(profile_id, profiler, {
+            'method': request.method, 'path': request.path, 'endpoint': request.endpoint,
+            'status': g.get('profile_status'), 'reason': reason, 'mode': mode,
+            'started_at': started_at, 'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+    except OSError as e:
+        print(f"[WARNING] Could not save profile {profile_id}: {e}")
+
+if profile_store is not None:
+    app.before_request(start_request_profile)
+    app.after_request(tag_request_profile)
+    app.teardown_request(save_request_profile)
+
+# Identical requests in flight at the same time (double clicks, client retries) share one
+# computation; SINGLE_FLIGHT_DIR extends that across the worker processes of a host
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', 60))
+single_flight = SingleFlight()
+file_single_flight = FileSingleFlight(os.getenv('SINGLE_FLIGHT_DIR')) if os.getenv('SINGLE_FLIGHT_DIR') else None
+
+def release_admission_early():
+    # A request waiting on another one's result does no work, so it gives its slot back
+    ticket = g.pop('admission', None)
+    if ticket is not None:
+        admission.release(ticket[0])
+
+def coalesced(key, compute):
+    """compute(), shared with every identical request (same key) in flight at the same time"""
+    if file_single_flight is not None:
+        run = lambda: file_single_flight.do(key, compute, SINGLE_FLIGHT_TIMEOUT)
+    else:
+        run = compute
+    return single_flight.do(key, run, SINGLE_FLIGHT_TIMEOUT, on_wait=release_admission_early)
+
+MARKET_STATS_PATH = os.getenv('JOB_MARKET_STATS_PATH', os.path.join('models', 'job_market_stats.json'))
+
+def load_market_stats():
+    """Sketches saved by train_models.py, plus any postings export named in JOB_POSTINGS_PATH"""
+    from services.market_stats import JobMarketStats
+    stats = JobMarketStats()
+    if os.path.exists(MARKET_STATS_PATH):
+        stats = JobMarketStats.load(MARKET_STATS_PATH)
+    postings_path = os.getenv('JOB_POSTINGS_PATH')
+    if postings_path and os.path.exists(postings_path):
+        stats.ingest_file(postings_path)
+    return stats
+
+CANDIDATE_INDEX_PATH = os.getenv('CANDIDATE_INDEX_PATH', os.path.join('models', 'candidate_index'))
+
+# Above one, the candidate and job indexes are partitioned across this many worker processes
+INDEX_SHARDS = int(os.getenv('INDEX_SHARDS', 1))
+
+def load_candidate_index(vocabulary):
+    """Index saved by a previous ?persist=true call, or an empty one over the analyser's skills"""
+    from services.candidate_index import CandidateIndex
+    from services.sharded_index import ShardedCandidateIndex
+    if INDEX_SHARDS > 1:
+        return ShardedCandidateIndex(vocabulary, INDEX_SHARDS, CANDIDATE_INDEX_PATH)
+    if os.path.exists(CANDIDATE_INDEX_PATH + '.json'):
+        return CandidateIndex.load(CANDIDATE_INDEX_PATH)
+    return CandidateIndex(vocabulary)
+
+def load_job_index(vocabulary):
+    """Open postings from the JSONL snapshot named in JOB_POSTINGS_PATH, kept current via /api/jobs"""
+    from services.job_index import JobIndex
+    from services.sharded_index import ShardedJobIndex
+    job_index = ShardedJobIndex(vocabulary, INDEX_SHARDS) if INDEX_SHARDS > 1 else JobIndex(vocabulary)
+    postings_path = os.getenv('JOB_POSTINGS_PATH')
+    if postings_path and postings_path.endswith('.jsonl') and os.path.exists(postings_path):
+        job_index.ingest_file(postings_path)
+        job_index.expire_before()
+    return job_index
+
+PROFILE_INDEX_PATH = os.getenv('PROFILE_INDEX_PATH', os.path.join('models', 'profile_index'))
+
+def load_profile_index(encoder):
+    """Similar-profile ANN index saved alongside the candidate index, or an empty one"""
+    from services.ann_index import ANNIndex
+    if os.path.exists(PROFILE_INDEX_PATH + '.json'):
+        return ANNIndex.load(PROFILE_INDEX_PATH)
+    return ANNIndex(encoder.dim)
+
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', os.path.join('models', 'snapshot'))
+
+def load_service_snapshot():
+    """Matcher tables precomputed by train_models.py, memory-mapped read-only and shared by all workers"""
+    from services.snapshot import load_snapshot
+    return load_snapshot(SNAPSHOT_PATH)
+
+RESUME_BATCH_MAX_FILES = int(os.getenv('RESUME_BATCH_MAX_FILES', 50))
+
+# JSON bodies at least this large are gzip/zstd compressed for clients that accept it
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+
+# Seconds each service took to build, in the order they were first used
+service_timings = {}
+_service_getters = []
+
+def lazy_service(name, factory):
+    """Getter that builds the service on its first call, once per process, and records the cost"""
+    instance = []
+    lock = threading.Lock()
+    
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    started = time.perf_counter()
+                    instance.append(factory())
+                    service_timings[name] = round(time.perf_counter() - started, 3)
+                    print(f"[startup] {name} ready in {service_timings[name]:.3f}s")
+        return instance[0]
+    
+    _service_getters.append(get)
+    return get
+
+def _build_career_recommender():
+    from services.career_recommender import CareerRecommender
+    from services.shared_cache import SharedCache
+    # Predictions are kept per worker, and with RECOMMENDATION_CACHE_DB in an SQLite
+    # file every worker on the host reads, so one worker's answer serves them all
+    cache = SharedCache(
+        path=os.getenv('RECOMMENDATION_CACHE_DB') or None,
+        maxsize=int(os.getenv('RECOMMENDATION_CACHE_SIZE', 10000)),
+        ttl=int(os.getenv('RECOMMENDATION_CACHE_TTL', 3600)),
+        local_size=int(os.getenv('RECOMMENDATION_CACHE_LOCAL_SIZE', 1024))
+    )
+    return CareerRecommender(snapshot=service_snapshot(), cache=cache)
+
+def _build_resume_analyzer():
+    from services.extractors import ExtractorRegistry, parse_order
+    from services.resume_analyzer import ResumeAnalyzer
+    # e.g. RESUME_EXTRACTORS="pdf=pdfminer,pypdf2;docx=streaming,python-docx"
+    extractors = ExtractorRegistry(parse_order(os.getenv('RESUME_EXTRACTORS')))
+    return ResumeAnalyzer(snapshot=service_snapshot(), max_upload_bytes=MAX_RESUME_BYTES, extractors=extractors)
+
+def _build_profile_encoder():
+    from services.ann_index import ProfileEncoder
+    return ProfileEncoder(skill_vocabulary(), snapshot=service_snapshot())
+
+def _build_chatbot_ml():
+    from services.chatbot_ml import ChatbotML
+    return ChatbotML(
+        session_ttl=int(os.getenv('CHATBOT_SESSION_TTL', 1800)),
+        session_db=os.getenv('CHATBOT_SESSION_DB') or None,
+        market_stats=market_stats(),
+        career_recommender=career_recommender()
+    )
+
+# ML services, each built on first use
+service_snapshot = lazy_service('snapshot', load_service_snapshot)
+career_recommender = lazy_service('career_recommender', _build_career_recommender)
+resume_analyzer = lazy_service('resume_analyzer', _build_resume_analyzer)
+market_stats = lazy_service('market_stats', load_market_stats)
+skill_vocabulary = lazy_service('skill_vocabulary', lambda: [
+    skill for skills in resume_analyzer().skill_patterns.values() for skill in skills
+])
+candidate_index = lazy_service('candidate_index', lambda: load_candidate_index(skill_vocabulary()))
+job_index = lazy_service('job_index', lambda: load_job_index(skill_vocabulary()))
+profile_encoder = lazy_service('profile_encoder', _build_profile_encoder)
+profile_index = lazy_service('profile_index', lambda: load_profile_index(profile_encoder()))
+# Changes whenever the career catalogue does, invalidating every recommendation ETag
+career_catalogue_version = lazy_service(
+    'career_catalogue_version', lambda: career_recommender().catalogue_fingerprint()
+)
+chatbot_ml = lazy_service('chatbot_ml', _build_chatbot_ml)
+
+def warm_up():
+    """Build every service now instead of on its first request, e.g. before taking traffic"""
+    from services.intent_classifier import get_intent_classifier
+    started = time.perf_counter()
+    for get in _service_getters:
+        get()
+    get_intent_classifier()
+    print(f"[startup] warm-up finished in {time.perf_counter() - started:.3f}s")
+    return dict(service_timings)
+
+@app.after_request
+def compress_response(response):
+    """Compress large JSON responses according to Accept-Encoding; streamed responses pass through"""
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.content_length or 0) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if encoding:
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def conditional_response(etag, build):
+    """304 when the client's If-None-Match already names ``etag``, else ``build()``; both carry the tag"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    # Weak, since the same content may be sent with different Content-Encodings
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def wants_ndjson():
+    """Streaming mode: ?stream=ndjson, or an Accept header preferring NDJSON over JSON"""
+    if request.args.get('stream') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def ndjson_response(items, summary=None):
+    """Newline-delimited JSON written item by item as the generator produces them.
+    
+    The last line is ``{"done": true, ...summary()}``, or ``{"error": ...}`` if
+    the generator failed part way. Nothing is buffered here: the generator is
+    only advanced when the server is ready to send more.
+    """
+    def generate():
+        try:
+            for item in items:
+                yield json.dumps(item) + '\n'
+            yield json.dumps(dict(summary() if summary else {}, done=True)) + '\n'
+        except Exception as e:
+            yield json.dumps({'error': str(e)}) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'service': 'ML Service'})
+    # Never builds a service: answers as soon as the worker has imported app.py
+    return jsonify({'status': 'healthy', 'service': 'ML Service', 'loaded_services': service_timings})
+
+@app.route('/api/admission', methods=['GET'])
+def admission_stats():
+    if admission is None:
+        return jsonify({'enabled': False, 'coalescing': single_flight.stats()})
+    return jsonify(dict(admission.stats(), enabled=True, coalescing=single_flight.stats()))
+
+@app.route('/api/career/cache', methods=['GET'])
+def recommendation_cache_stats():
+    try:
+        return jsonify(career_recommender().cache.stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Under /api/debug so profile ids never collide with /api/profiles/similar. Reading
+# profiles always needs the token, even when only PROFILE_SAMPLE_RATE is set.
+def profile_access_error():
+    if profile_store is None:
+        return jsonify({'error': 'Profiling is off; set PROFILE_TOKEN or PROFILE_SAMPLE_RATE'}), 404
+    if PROFILE_TOKEN is None:
+        return jsonify({'error': 'Set PROFILE_TOKEN to read profiles'}), 403
+    if not profile_admin():
+        return jsonify({'error': 'X-Profile token required'}), 403
+    return None
+
+@app.route('/api/debug/profiles', methods=['GET'])
+def list_profiles():
+    error = profile_access_error()
+    if error is not None:
+        return error
+    try:
+        return jsonify({'profiles': profile_store.list(int(request.args.get('limit', 50)))})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/debug/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    error = profile_access_error()
+    if error is not None:
+        return error
+    path = profile_store.path(profile_id)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_file(path, as_attachment=True, mimetype='application/octet-stream')
+
+@app.route('/api/warm-up', methods=['POST'])
+def warm_up_services():
+    try:
+        return jsonify({'status': 'ready', 'loaded_services': warm_up()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/career/recommend', methods=['POST'])
 def recommend_career():
     try:
         data = request.json
-        result = career_recommender.predict(data)
-        return jsonify(result)
+        # predict is a pure function of the input and the catalogue, so a revalidation skips it
+        # and identical requests in flight share one prediction
+        etag = request_etag(data, career_catalogue_version())
+        return conditional_response(
+            etag,
+            lambda: jsonify(coalesced(f"recommend-{etag}", lambda: career_recommender().predict(data)))
+        )
+    except SingleFlightTimeout as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/career/recommend-batch', methods=['POST'])
+def recommend_career_batch():
+    try:
+        users = (request.json or {}).get('users')
+        if not isinstance(users, list):
+            return jsonify({'error': 'users must be a list of profiles'}), 400
+        
+        def predictions():
+            for position, user_data in enumerate(users):
+                try:
+                    yield {'index': position, 'recommendations': career_recommender().predict(user_data)}
+                except Exception as e:
+                    yield {'index': position, 'error': str(e)}
+        
+        if wants_ndjson():
+            return ndjson_response(predictions(), lambda: {'users': len(users)})
+        return conditional_response(
+            request_etag(users, career_catalogue_version()),
+            lambda: jsonify({'results': list(predictions())})
+        )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -36,10 +480,80 @@ def analyze_resume():
             return jsonify({'error': 'No resume file provided'}), 400
         
         file = request.files['resume']
+        if getattr(file.stream, 'oversize', False):
+            return jsonify({'error': str(UploadTooLarge(MAX_RESUME_BYTES))}), 413
         job_role = request.form.get('job_role', 'Software Developer')
+        from services.resume_analyzer import DUPLICATE_MODES
+        duplicates = request.form.get('duplicates', 'off')
+        if duplicates not in DUPLICATE_MODES:
+            return jsonify({'error': f"duplicates must be one of {', '.join(DUPLICATE_MODES)}"}), 400
         
-        analysis = resume_analyzer.analyze(file, job_role)
+        applicant_id = request.form.get('applicant_id')
+        key = request_key('analyze', upload_digest(file), job_role, duplicates, applicant_id)
+        analysis = coalesced(key, lambda: resume_analyzer().analyze(
+            file, job_role, duplicates=duplicates, applicant_id=applicant_id
+        ))
         return jsonify(analysis)
+    except SingleFlightTimeout as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resume/analyze-batch', methods=['POST'])
+def analyze_resume_batch():
+    try:
+        files = request.files.getlist('resumes')
+        if not files:
+            return jsonify({'error': 'No resume files provided'}), 400
+        if len(files) > RESUME_BATCH_MAX_FILES:
+            return jsonify({'error': f"At most {RESUME_BATCH_MAX_FILES} resumes per batch"}), 400
+        
+        # One job_role for the whole batch, or one per file in upload order
+        job_roles = request.form.getlist('job_role') or ['Software Developer']
+        if len(job_roles) == 1:
+            job_roles = job_roles * len(files)
+        if len(job_roles) != len(files):
+            return jsonify({'error': 'Send one job_role, or one per resume file'}), 400
+        from services.resume_analyzer import DUPLICATE_MODES
+        duplicates = request.form.get('duplicates', 'off')
+        if duplicates not in DUPLICATE_MODES:
+            return jsonify({'error': f"duplicates must be one of {', '.join(DUPLICATE_MODES)}"}), 400
+        
+        if wants_ndjson():
+            # Flask closes the uploads when this view returns, before the stream is read,
+            # so each is copied into a spool of its own (memory-bounded like the original)
+            results = resume_analyzer().iter_analyze_batch(
+                [detach_upload(file, UPLOAD_SPOOL_BYTES) for file in files], job_roles,
+                duplicates=duplicates, applicant_id=request.form.get('applicant_id')
+            )
+            # Each result is sent as soon as its chunk of files is scored
+            counts = {'analyzed': 0, 'failed': 0}
+            def counted():
+                for result in results:
+                    counts['failed' if 'error' in result else 'analyzed'] += 1
+                    yield result
+            return ndjson_response(counted(), lambda: counts)
+        results = resume_analyzer().analyze_batch(
+            files, job_roles, duplicates=duplicates, applicant_id=request.form.get('applicant_id')
+        )
+        failed = sum(1 for result in results if 'error' in result)
+        return jsonify({'results': results, 'analyzed': len(results) - failed, 'failed': failed})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resume/duplicates', methods=['GET'])
+def resume_duplicates():
+    try:
+        min_size = int(request.args.get('min_size', 2))
+        clusters = resume_analyzer().deduplicator.clusters(min_size)
+        return jsonify({'clusters': clusters, 'indexed_resumes': len(resume_analyzer().deduplicator)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resume/extractors', methods=['GET'])
+def resume_extractors():
+    try:
+        return jsonify({'formats': resume_analyzer().extractors.metrics()})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -48,9 +562,88 @@ def chatbot_career_advice():
     try:
         data = request.json
         user_input = data.get('message', '')
+        session_id = data.get('session_id')
         
-        recommendations = chatbot_ml.get_career_recommendations(user_input)
+        recommendations = chatbot_ml().get_career_recommendations(user_input, session_id)
         return jsonify({'recommendations': recommendations})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/chatbot/career-advice/stream', methods=['GET', 'POST'])
+def chatbot_career_advice_stream():
+    data = request.args if request.method == 'GET' else (request.json or {})
+    user_input = data.get('message', '')
+    session_id = data.get('session_id')
+    if session_id:
+        from services.chatbot_ml import check_session_id
+        try:
+            check_session_id(session_id)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    def generate():
+        # The WSGI server closes this generator when the client disconnects, which
+        # stops the lazily evaluated recommendation stream at the next yield.
+        try:
+            for event, payload in chatbot_ml().stream_career_recommendations(user_input, session_id):
+                yield sse_event(event, payload)
+            yield sse_event('done', {})
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/chatbot/message', methods=['POST'])
+def chatbot_message():
+    try:
+        data = request.json
+        user_input = data.get('message', '')
+        
+        result = chatbot_ml().handle_message(
+            user_input,
+            session_id=data.get('session_id'),
+            skills=data.get('skills'),
+            career=data.get('career')
+        )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/chatbot/intent', methods=['POST'])
+def chatbot_intent():
+    try:
+        data = request.json
+        messages = data.get('messages')
+        if messages is None:
+            messages = [data.get('message', '')]
+        
+        return jsonify({'intents': chatbot_ml().classify_intents(messages)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/chatbot/clear-session', methods=['POST'])
+def chatbot_clear_session():
+    try:
+        data = request.json
+        session_id = data.get('session_id')
+        if not session_id:
+            return jsonify({'error': 'session_id is required'}), 400
+        
+        cleared = chatbot_ml().clear_session(session_id)
+        return jsonify({'cleared': cleared})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -61,11 +654,236 @@ def chatbot_skills_gap():
         user_skills = data.get('skills', [])
         target_career = data.get('career', '')
         
-        gap_analysis = chatbot_ml.analyze_skills_gap(user_skills, target_career)
+        gap_analysis = chatbot_ml().analyze_skills_gap(user_skills, target_career)
         return jsonify(gap_analysis)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/market/insights', methods=['GET'])
+def market_insights():
+    try:
+        role = request.args.get('role', '')
+        return jsonify(chatbot_ml().get_job_market_insights(role))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/market/ingest', methods=['POST'])
+def market_ingest():
+    try:
+        # Either a multipart export file or a raw CSV/JSONL body; both are read as a stream
+        if 'postings' in request.files:
+            upload = request.files['postings']
+            fmt = 'csv' if upload.filename.lower().endswith('.csv') else 'jsonl'
+            stream = upload.stream
+        else:
+            fmt = 'csv' if 'csv' in (request.content_type or '') else 'jsonl'
+            stream = request.stream
+        
+        ingested, skipped = market_stats().ingest_stream(stream, fmt)
+        if request.args.get('persist') == 'true':
+            market_stats().save(MARKET_STATS_PATH)
+        return jsonify({
+            'ingested': ingested,
+            'skipped': skipped,
+            'total_postings': market_stats().total_postings,
+            'roles': sorted(market_stats().roles)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates', methods=['POST'])
+def candidates_add():
+    try:
+        # Either an uploaded resume (analysed here) or already extracted features as JSON
+        if 'resume' in request.files:
+            candidate_id = request.form.get('candidate_id')
+            career = request.form.get('career')
+            features = resume_analyzer().extract_features(request.files['resume'])
+        else:
+            data = request.json or {}
+            candidate_id = data.get('candidate_id')
+            career = data.get('career')
+            features = {
+                'extracted_skills': data.get('skills', []),
+                'experience_years': data.get('experience_years', 0),
+                'education': data.get('education', [])
+            }
+        if not candidate_id:
+            return jsonify({'error': 'candidate_id is required'}), 400
+        
+        candidate_index().add_analysis(candidate_id, features)
+        profile_index().add(
+            candidate_id,
+            profile_encoder().encode(features['extracted_skills'], features['experience_years'], features['education']),
+            metadata={'career': career} if career else None
+        )
+        if request.args.get('persist') == 'true':
+            candidate_index().save(CANDIDATE_INDEX_PATH)
+            profile_index().save(PROFILE_INDEX_PATH)
+        return jsonify({
+            'candidate_id': candidate_id,
+            'skills': features['extracted_skills'],
+            'experience_years': features['experience_years'],
+            'indexed_candidates': len(candidate_index())
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates/<candidate_id>', methods=['DELETE'])
+def candidates_delete(candidate_id):
+    try:
+        deleted = candidate_index().delete(candidate_id)
+        profile_index().remove(candidate_id)
+        if deleted and request.args.get('persist') == 'true':
+            candidate_index().save(CANDIDATE_INDEX_PATH)
+            profile_index().save(PROFILE_INDEX_PATH)
+        return jsonify({'deleted': deleted, 'indexed_candidates': len(candidate_index())})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates/search', methods=['POST'])
+def candidates_search():
+    try:
+        data = request.json or {}
+        required_skills = data.get('required_skills') or data.get('skills') or []
+        if not required_skills:
+            return jsonify({'error': 'required_skills is required'}), 400
+        min_education = data.get('min_education')
+        if min_education is not None:
+            from services.candidate_index import min_education_tier
+            try:
+                min_education = min_education_tier(min_education)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        results = candidate_index().search(
+            required_skills,
+            preferred_skills=data.get('preferred_skills', []),
+            top_k=int(data.get('top_k', 20)),
+            min_experience=data.get('min_experience'),
+            max_experience=data.get('max_experience'),
+            experience_level=data.get('experience_level'),
+            min_education=min_education
+        )
+        if wants_ndjson():
+            return ndjson_response(iter(results), lambda: {'indexed_candidates': len(candidate_index())})
+        return jsonify({'candidates': results, 'indexed_candidates': len(candidate_index())})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/profiles/similar', methods=['POST'])
+def profiles_similar():
+    try:
+        data = request.json or {}
+        k = int(data.get('k', 10))
+        candidate_id = data.get('candidate_id')
+        if candidate_id is not None:
+            vector = profile_index().vector(candidate_id)
+            if vector is None:
+                return jsonify({'error': 'Unknown candidate_id'}), 404
+        else:
+            vector = profile_encoder().encode(
+                data.get('skills', []), data.get('experience_years', 0), data.get('education')
+            )
+        
+        neighbours = profile_index().query(vector, k, probes=int(data.get('probes', 0)), exclude=candidate_id)
+        careers = {}
+        def similar():
+            for neighbour_id, similarity in neighbours:
+                career = profile_index().metadata.get(neighbour_id, {}).get('career')
+                if career:
+                    careers[career] = careers.get(career, 0) + 1
+                yield {'candidate_id': neighbour_id, 'similarity': round(similarity, 3), 'career': career}
+        
+        # "People like you became..." from the careers recorded on the neighbours
+        def career_counts():
+            return {'careers': [
+                {'career': career, 'count': count}
+                for career, count in sorted(careers.items(), key=lambda item: item[1], reverse=True)
+            ]}
+        
+        if wants_ndjson():
+            return ndjson_response(similar(), career_counts)
+        return jsonify({'similar': list(similar()), **career_counts()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def jobs_upsert():
+    try:
+        # A single Job, {"postings": [...]}, or a JSONL body
+        if request.is_json:
+            data = request.json
+            postings = data.get('postings', [data]) if isinstance(data, dict) else data
+            indexed = sum(1 for posting in postings if job_index().add_posting(posting))
+            skipped = len(postings) - indexed
+        else:
+            indexed, skipped = job_index().ingest_stream(request.stream)
+        return jsonify({'indexed': indexed, 'skipped': skipped, **job_index().stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def jobs_delete(job_id):
+    try:
+        return jsonify({'deleted': job_index().expire(job_id), **job_index().stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/expire', methods=['POST'])
+def jobs_expire():
+    try:
+        return jsonify({'expired': job_index().expire_before(), **job_index().stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/recommend', methods=['POST'])
+def jobs_recommend():
+    try:
+        data = request.json or {}
+        skills = data.get('skills', [])
+        if isinstance(skills, str):
+            skills = skills.split(',')
+        
+        jobs = job_index().recommend(
+            skills,
+            experience_years=data.get('experience_years', 0),
+            top_k=int(data.get('top_k', 20)),
+            offset=int(data.get('offset', 0))
+        )
+        if wants_ndjson():
+            return ndjson_response(iter(jobs), lambda: {'open_postings': len(job_index())})
+        return jsonify({'jobs': jobs, 'open_postings': len(job_index())})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/index/shards', methods=['POST'])
+def index_resize_shards():
+    try:
+        shards = int((request.json or {}).get('shards', 0))
+        if shards < 1:
+            return jsonify({'error': 'shards must be a positive integer'}), 400
+        
+        from services.sharded_index import ShardedIndex
+        moved = {}
+        for name, index in (('candidates', candidate_index()), ('jobs', job_index())):
+            if not isinstance(index, ShardedIndex):
+                return jsonify({'error': 'Start the service with INDEX_SHARDS > 1 to resize'}), 400
+            moved[name] = index.resize(shards)
+        return jsonify({'shards': shards, 'moved': moved})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# lazy (default): build on first use; background: start building in a thread now;
+# eager: build before the module finishes importing, as before
+ML_WARM_UP = os.getenv('ML_WARM_UP', 'lazy')
+if ML_WARM_UP == 'eager':
+    warm_up()
+elif ML_WARM_UP == 'background':
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+print(f"[startup] app imported in {time.perf_counter() - _import_started:.3f}s (ML_WARM_UP={ML_WARM_UP})")
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5001))
     app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Recall vs latency of the ANN profile index against brute force on synthetic data
+"""
+
+import argparse
+import time
+import numpy as np
+from services.ann_index import ANNIndex
+
+def synthetic_profiles(count, dim, clusters, seed=0):
+    """Sparse binary skill-like vectors drawn around cluster prototypes, L2-normalised"""
+    generator = np.random.RandomState(seed)
+    prototypes = generator.rand(clusters, dim) < 0.12
+    labels = generator.randint(0, clusters, size=count)
+    flips = generator.rand(count, dim) < 0.04
+    vectors = (prototypes[labels] ^ flips).astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-6)
+    return vectors
+
+def recall_at_k(index, queries, k, probes):
+    hits = 0
+    started = time.perf_counter()
+    approximate = [index.query(query, k, probes) for query in queries]
+    elapsed = time.perf_counter() - started
+    for query, found in zip(queries, approximate):
+        # Score-based so that ties at the k-th similarity count as hits
+        kth_score = index.brute_force(query, k)[-1][1]
+        hits += sum(1 for _, score in found if score >= kth_score - 1e-6)
+    return hits / (len(queries) * k), elapsed / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--dim', type=int, default=64)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = synthetic_profiles(args.count + args.queries, args.dim, args.clusters)
+    data, queries = vectors[:args.count], vectors[args.count:]
+    ids = list(range(args.count))
+
+    reference = ANNIndex(args.dim, n_tables=1, n_bits=1)
+    reference.build(ids, data)
+    started = time.perf_counter()
+    for query in queries:
+        reference.brute_force(query, args.k)
+    brute_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    print(f"{args.count} vectors, dim {args.dim}, recall@{args.k} over {args.queries} queries")
+    print(f"brute force: {brute_ms:.2f} ms/query")
+    print(f"{'tables':>6} {'bits':>4} {'probes':>6} {'build s':>8} {'recall':>7} {'ms/query':>9} {'speedup':>8}")
+    for n_tables, n_bits in [(8, 8), (16, 10), (16, 12), (32, 12)]:
+        index = ANNIndex(args.dim, n_tables=n_tables, n_bits=n_bits)
+        started = time.perf_counter()
+        index.build(ids, data)
+        build_seconds = time.perf_counter() - started
+        for probes in (0, 2, 4):
+            recall, query_ms = recall_at_k(index, queries, args.k, probes)
+            print(f"{n_tables:>6} {n_bits:>4} {probes:>6} {build_seconds:>8.2f} {recall:>7.3f} "
+                  f"{query_ms:>9.2f} {brute_ms / query_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Speed, peak memory and text coverage of the streaming DOCX extractor against python-docx on synthetic resumes
+"""
+
+import argparse
+import io
+import random
+import time
+import tracemalloc
+import docx
+from services.docx_text import extract_docx_text
+from services.resume_analyzer import ResumeAnalyzer
+
+SKILLS = ['python', 'javascript', 'java', 'react', 'node.js', 'sql', 'docker', 'aws', 'machine learning',
+          'pandas', 'tensorflow', 'git', 'html', 'css', 'mongodb', 'typescript', 'excel', 'tableau']
+ROLES = ['Software Engineer', 'Data Analyst', 'Backend Developer', 'ML Engineer', 'Frontend Developer']
+
+def synthetic_resume(generator, jobs, table_skills=True):
+    """A resume laid out the way templates often do it: contact details in the header, skills in a table"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = f"Candidate {generator.randint(1, 10 ** 6)} | candidate@example.com"
+    document.sections[0].footer.paragraphs[0].text = "References available on request"
+    document.add_heading('Summary', level=1)
+    document.add_paragraph(f"Engineer with {generator.randint(2, 15)} years of experience shipping production systems.")
+    document.add_heading('Skills', level=1)
+    skills = generator.sample(SKILLS, 9)
+    if table_skills:
+        table = document.add_table(rows=3, cols=3)
+        for cell, skill in zip((cell for row in table.rows for cell in row.cells), skills):
+            cell.text = skill
+    else:
+        document.add_paragraph(', '.join(skills))
+    document.add_heading('Experience', level=1)
+    year = 2024
+    for _ in range(jobs):
+        start = year - generator.randint(1, 3)
+        document.add_paragraph(f"{generator.choice(ROLES)}, Company {generator.randint(1, 500)}, {start} - {year}")
+        for _ in range(4):
+            document.add_paragraph(f"Built services for {generator.randint(2, 200)} teams, "
+                                   f"improving latency by {generator.randint(5, 60)}%", style='List Bullet')
+        year = start
+    document.add_heading('Education', level=1)
+    document.add_paragraph("Bachelor of Science in Computer Science, State University")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_text(file_stream):
+    """The previous extractor: body paragraphs through the python-docx object model"""
+    return ''.join(paragraph.text + '\n' for paragraph in docx.Document(file_stream).paragraphs)
+
+
+def measure(extract, corpus):
+    started = time.perf_counter()
+    texts = [extract(io.BytesIO(data)) for data in corpus]
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    for data in corpus[:20]:
+        extract(io.BytesIO(data))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return texts, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=6, help='Experience entries per resume')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    corpus = [synthetic_resume(generator, args.jobs, table_skills=generator.random() < 0.5) for _ in range(args.count)]
+    analyzer = ResumeAnalyzer()
+    print(f"{args.count} synthetic resumes, {sum(map(len, corpus)) / len(corpus) / 1024:.1f} KiB each on average")
+    print(f"{'extractor':<12} {'ms/doc':>7} {'peak KiB':>9} {'chars/doc':>10} {'skills/doc':>11}")
+    for name, extract in (('python-docx', python_docx_text), ('streaming', extract_docx_text)):
+        texts, elapsed, peak = measure(extract, corpus)
+        skills = sum(len(analyzer.extract_skills(text)[0]) for text in texts) / len(texts)
+        chars = sum(map(len, texts)) / len(texts)
+        print(f"{name:<12} {elapsed / len(corpus) * 1000:>7.2f} {peak / 1024:>9.0f} {chars:>10.0f} {skills:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Load test of the ML service: starts it locally, sweeps client concurrency over a mix of
+recommend, resume analysis, chatbot and health traffic, and reports throughput, latency
+percentiles, error rates and per-process RSS at each level
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from benchmark_docx import ROLES, SKILLS, synthetic_resume
+
+DEFAULT_MIX = 'recommend=50,chatbot=25,analyze=15,health=10'
+INTERESTS = ['data analysis', 'design', 'technology', 'security', 'business', 'automation', 'user experience',
+             'research', 'leadership', 'mobile technology']
+EDUCATION = ['', 'Bachelor of Science', "Master's in Computer Science", 'MBA', 'PhD in Statistics']
+CHAT_TEMPLATES = [
+    "I know {skills} and have {years} years of experience, what career fits me?",
+    "What skills am I missing to become a {role}? I know {skills}",
+    "How is the job market for a {role}?",
+    "Recommend courses to learn {skill}",
+]
+
+def resume_lines(generator, jobs):
+    lines = [f"Candidate {generator.randint(1, 10 ** 6)} | candidate@example.com", '', 'Summary',
+             f"Engineer with {generator.randint(2, 15)} years of experience shipping production systems.",
+             '', 'Skills', ', '.join(generator.sample(SKILLS, 9)), '', 'Experience']
+    year = 2024
+    for _ in range(jobs):
+        start = year - generator.randint(1, 3)
+        lines.append(f"{generator.choice(ROLES)}, Company {generator.randint(1, 500)}, {start} - {year}")
+        lines += [f"- Built services for {generator.randint(2, 200)} teams, improving latency by "
+                  f"{generator.randint(5, 60)}%" for _ in range(4)]
+        year = start
+    return lines + ['', 'Education', 'Bachelor of Science in Computer Science, State University']
+
+
+def synthetic_pdf(lines, lines_per_page=50):
+    """A minimal text PDF, one Helvetica content stream per page, that PyPDF2 can extract"""
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in pages:
+        escaped = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in page]
+        stream = ('BT /F1 10 Tf 14 TL 50 800 Td ' + ' '.join(f"({line}) Tj T*" for line in escaped) + ' ET').encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> '
+                       b'/Contents %d 0 R >>' % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(output.tell())
+        output.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    output.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def multipart(fields, files):
+    """Body and content type of a multipart/form-data request; files are (field, filename, bytes)"""
+    boundary = f"----benchmark{random.getrandbits(64):016x}"
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, filename, data in files:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Workload:
+    """Deterministic request generator: the same seed and client number give the same request sequence"""
+
+    def __init__(self, mix, documents, duplicates):
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.documents = documents
+        self.duplicates = duplicates
+
+    def request(self, generator):
+        kind = generator.choices(self.kinds, self.weights)[0]
+        if kind == 'health':
+            return kind, 'GET', '/api/health', None, None
+        if kind == 'recommend':
+            profile = {
+                'skills': ', '.join(generator.sample(SKILLS, generator.randint(2, 8))),
+                'interests': ', '.join(generator.sample(INTERESTS, generator.randint(0, 3))),
+                'experience': f"{generator.randint(0, 12)} years",
+                'education': generator.choice(EDUCATION)
+            }
+            return kind, 'POST', '/api/career/recommend', json.dumps(profile).encode(), 'application/json'
+        if kind == 'chatbot':
+            message = generator.choice(CHAT_TEMPLATES).format(
+                skills=', '.join(generator.sample(SKILLS, 3)), skill=generator.choice(SKILLS),
+                years=generator.randint(0, 12), role=generator.choice(ROLES)
+            )
+            return kind, 'POST', '/api/chatbot/message', json.dumps({'message': message}).encode(), 'application/json'
+        filename, data = generator.choice(self.documents)
+        body, content_type = multipart(
+            {'job_role': generator.choice(ROLES), 'duplicates': self.duplicates}, [('resume', filename, data)]
+        )
+        return kind, 'POST', '/api/resume/analyze', body, content_type
+
+
+def send(base_url, method, path, body, content_type, timeout):
+    request = urllib.request.Request(base_url + path, data=body, method=method)
+    if content_type:
+        request.add_header('Content-Type', content_type)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+
+
+def process_tree(root_pid):
+    """root_pid and all its descendants, from the parent pids in /proc"""
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # The command name may contain spaces; the parent pid follows its closing parenthesis
+                parent = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(name))
+    pids, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, []))
+    return pids
+
+
+def rss_mib(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RSSMonitor(threading.Thread):
+    """Peak RSS of every process in the server's tree, sampled while a level runs"""
+
+    def __init__(self, root_pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.root_pid = root_pid
+        self.interval = interval
+        self.peaks = {}
+        self.stopped = threading.Event()
+
+    def run(self):
+        while True:
+            for pid in process_tree(self.root_pid):
+                rss = rss_mib(pid)
+                if rss is not None:
+                    self.peaks[pid] = max(rss, self.peaks.get(pid, 0))
+            if self.stopped.wait(self.interval):
+                return
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(samples, seconds):
+    """Counts, throughput and latency percentiles (ms) of (status, latency) samples"""
+    ok = sorted(latency for status, latency in samples if status is not None and status < 400)
+    rejected = sum(1 for status, _ in samples if status in (429, 503))
+    errors = len(samples) - len(ok) - rejected
+    return {
+        'requests': len(samples),
+        'throughput': round(len(ok) / seconds, 2),
+        'errors': errors,
+        'rejected': rejected,
+        'error_rate': round(errors / len(samples), 4) if samples else 0,
+        'latency_ms': {name: ok and round(percentile(ok, fraction) * 1000, 1)
+                       for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))}
+    }
+
+
+def run_level(base_url, workload, concurrency, warmup, duration, seed, timeout, server_pid):
+    """Closed loop: each client sends its next request as soon as the previous one returns"""
+    samples = []
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    def client(number):
+        generator = random.Random(f"{seed}-{concurrency}-{number}")
+        while time.monotonic() < stop_at:
+            kind, method, path, body, content_type = workload.request(generator)
+            sent = time.monotonic()
+            try:
+                status = send(base_url, method, path, body, content_type, timeout)
+            except Exception:
+                status = None
+            finished = time.monotonic()
+            if sent >= measure_from and finished <= stop_at:
+                samples.append((kind, status, finished - sent))
+
+    monitor = RSSMonitor(server_pid) if server_pid else None
+    if monitor:
+        monitor.start()
+    threads = [threading.Thread(target=client, args=(number,), daemon=True) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if monitor:
+        monitor.stopped.set()
+        monitor.join()
+
+    result = dict(summarize([(status, latency) for _, status, latency in samples], duration), concurrency=concurrency)
+    result['by_kind'] = {
+        kind: summarize([(status, latency) for sample_kind, status, latency in samples if sample_kind == kind], duration)
+        for kind in workload.kinds
+    }
+    if monitor:
+        # The root is the gunicorn master or the Flask reloader; its children serve requests
+        result['rss_mib'] = {
+            'parent': round(monitor.peaks.get(server_pid, 0), 1),
+            'workers': [round(rss, 1) for pid, rss in sorted(monitor.peaks.items()) if pid != server_pid]
+        }
+    return result
+
+
+def saturation_point(levels, tolerance=0.05):
+    """Lowest concurrency reaching (1 - tolerance) of the best throughput; more clients only add latency"""
+    best = max(level['throughput'] for level in levels)
+    return next(level for level in levels if level['throughput'] >= best * (1 - tolerance))
+
+
+def start_service(args):
+    env = dict(os.environ, PORT=str(args.port))
+    env.setdefault('ML_WARM_UP', 'eager')
+    for assignment in args.env:
+        name, _, value = assignment.partition('=')
+        env[name] = value
+    if args.mode == 'flask':
+        command = [sys.executable, 'app.py']
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '--workers', str(args.workers), '--threads', str(args.threads),
+                   '--bind', f'127.0.0.1:{args.port}', '--timeout', '120'] + args.gunicorn_args.split() + ['app:app']
+    log = open(args.server_log, 'w')
+    # A session of its own, so the Flask reloader child or gunicorn workers go down with it
+    cpus = parse_cpus(args.server_cpus) if args.server_cpus else None
+    server = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                              stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+                              preexec_fn=(lambda: os.sched_setaffinity(0, cpus)) if cpus else None)
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Service exited with {server.returncode}, see {args.server_log}")
+        try:
+            if send(f'http://127.0.0.1:{args.port}', 'GET', '/api/health', None, None, 2) == 200:
+                return server
+        except Exception:
+            pass
+        time.sleep(0.25)
+    stop_service(server)
+    raise RuntimeError(f"Service not healthy after {args.startup_timeout}s, see {args.server_log}")
+
+
+def stop_service(server):
+    try:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        os.killpg(server.pid, signal.SIGKILL)
+        server.wait()
+    except ProcessLookupError:
+        pass
+
+
+def parse_cpus(spec):
+    """'0-3,6' -> {0, 1, 2, 3, 6}"""
+    cpus = set()
+    for part in spec.split(','):
+        first, _, last = part.partition('-')
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(','):
+        kind, _, weight = part.partition('=')
+        if kind.strip() not in ('recommend', 'chatbot', 'analyze', 'health'):
+            raise ValueError(f"Unknown request kind: {kind}")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def print_level(level):
+    latency = level['latency_ms']
+    rss = level.get('rss_mib')
+    rss = f"{rss['parent']:.0f} | {' '.join(f'{value:.0f}' for value in rss['workers'])}" if rss else ''
+    print(f"{level['concurrency']:>5} {level['throughput']:>8.1f} {latency['p50'] or 0:>8.1f} {latency['p95'] or 0:>8.1f} "
+          f"{latency['p99'] or 0:>8.1f} {level['error_rate'] * 100:>6.1f}% {level['rejected']:>6}  "
+          f"{rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=['flask', 'gunicorn', 'external'], default='gunicorn',
+                        help="How to serve app.py; 'external' targets an already running service at --url")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--gunicorn-args', default='', help="Extra gunicorn arguments, e.g. '--preload'")
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help='Environment for the service, e.g. ADMISSION_MAX_CONCURRENT=0; repeatable')
+    parser.add_argument('--server-cpus', help="Pin the service to these CPUs, e.g. '1-3', leaving the rest to the clients")
+    parser.add_argument('--port', type=int, default=5091)
+    parser.add_argument('--url', help='Base URL for --mode external')
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32', help='Client counts to sweep')
+    parser.add_argument('--duration', type=float, default=15, help='Measured seconds per level')
+    parser.add_argument('--warmup', type=float, default=3, help='Unmeasured seconds before each level')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Request kind weights')
+    parser.add_argument('--documents', type=int, default=40, help='Synthetic resumes uploaded, half PDF, half DOCX')
+    parser.add_argument('--jobs', type=int, default=6, help='Experience entries per resume')
+    parser.add_argument('--duplicates', default='off', help='duplicates mode sent with uploads (off analyses every one)')
+    parser.add_argument('--timeout', type=float, default=60, help='Client timeout per request')
+    parser.add_argument('--max-error-rate', type=float, default=0.2, help='Stop the sweep past this error rate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--startup-timeout', type=float, default=120)
+    parser.add_argument('--server-log', default=os.path.join(tempfile.gettempdir(), 'benchmark_load_server.log'))
+    parser.add_argument('--json', help='Write the results to this file')
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    documents = []
+    for number in range(args.documents):
+        if number % 2:
+            documents.append((f'resume{number}.docx', synthetic_resume(generator, args.jobs, generator.random() < 0.5)))
+        else:
+            documents.append((f'resume{number}.pdf', synthetic_pdf(resume_lines(generator, args.jobs))))
+    workload = Workload(parse_mix(args.mix), documents, args.duplicates)
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    server = None
+    if args.mode == 'external':
+        base_url = (args.url or f'http://127.0.0.1:{args.port}').rstrip('/')
+    else:
+        base_url = f'http://127.0.0.1:{args.port}'
+        started = time.perf_counter()
+        server = start_service(args)
+        print(f"Service ({args.mode}) healthy after {time.perf_counter() - started:.1f}s")
+
+    setup = {
+        'mode': args.mode, 'workers': args.workers if args.mode == 'gunicorn' else None,
+        'threads': args.threads if args.mode == 'gunicorn' else None, 'env': args.env, 'server_cpus': args.server_cpus,
+        'mix': dict(zip(workload.kinds, workload.weights)), 'duration': args.duration,
+        'warmup': args.warmup, 'seed': args.seed, 'documents': args.documents, 'duplicates': args.duplicates,
+        'cpus': os.cpu_count(), 'python': platform.python_version(), 'platform': platform.platform()
+    }
+    print(json.dumps(setup))
+    print(f"{'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'503s':>6}  peak RSS MiB parent | workers")
+    results = []
+    try:
+        for concurrency in levels:
+            level = run_level(base_url, workload, concurrency, args.warmup, args.duration, args.seed, args.timeout,
+                              server.pid if server else None)
+            results.append(level)
+            print_level(level)
+            if level['error_rate'] > args.max_error_rate:
+                print(f"Stopping: error rate {level['error_rate']:.1%} over {args.max_error_rate:.0%}")
+                break
+    finally:
+        if server is not None:
+            stop_service(server)
+
+    if results:
+        knee = saturation_point(results)
+        print(f"Saturation: {knee['throughput']:.1f} req/s at concurrency {knee['concurrency']} "
+              f"(p99 {knee['latency_ms']['p99']} ms)")
+        for kind in workload.kinds:
+            summary = knee['by_kind'][kind]
+            print(f"  {kind:<10} {summary['throughput']:>7.1f} req/s  p50 {summary['latency_ms']['p50']} ms  "
+                  f"p99 {summary['latency_ms']['p99']} ms  errors {summary['errors']}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'setup': setup, 'levels': results,
+                       'saturation': results and saturation_point(results)['concurrency']}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Bulk resume ingestion: analyse a directory or archive of resumes offline
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from services.resume_analyzer import ResumeAnalyzer
+
+FORMATS = ('.pdf', '.docx', '.odt', '.rtf', '.html', '.htm', '.txt')
+
+class SourceFile:
+    """The file interface ResumeAnalyzer.extract_text expects (filename + read)"""
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.data = data
+
+    def read(self):
+        return self.data
+
+
+def list_sources(input_path):
+    """Resume files under a directory, or members of a .zip / .tar(.gz) archive, in a stable order"""
+    if os.path.isdir(input_path):
+        sources = []
+        for root, _, files in os.walk(input_path):
+            for name in files:
+                if name.lower().endswith(FORMATS):
+                    sources.append(os.path.relpath(os.path.join(root, name), input_path))
+        return sorted(sources)
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            return sorted(name for name in archive.namelist() if name.lower().endswith(FORMATS))
+    if tarfile.is_tarfile(input_path):
+        with tarfile.open(input_path) as archive:
+            return sorted(member.name for member in archive.getmembers()
+                          if member.isfile() and member.name.lower().endswith(FORMATS))
+    raise ValueError(f"{input_path} is not a directory, zip or tar archive")
+
+
+def load_checkpoint(output_path):
+    """Sources already written to the JSONL output; a torn last line from a crash is cut off"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    valid_bytes = 0
+    with open(output_path, 'rb') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['source'])
+            except (ValueError, KeyError):
+                break
+            valid_bytes += len(line)
+    with open(output_path, 'r+b') as f:
+        f.truncate(valid_bytes)
+    return done
+
+
+# Per-worker state, set up once by the pool initializer
+_analyzer = None
+_input_path = None
+_archive = None
+
+def _init_worker(input_path):
+    global _analyzer, _input_path, _archive
+    _analyzer = ResumeAnalyzer()
+    _input_path = input_path
+    if os.path.isdir(input_path):
+        _archive = None
+    elif zipfile.is_zipfile(input_path):
+        _archive = zipfile.ZipFile(input_path)
+    else:
+        _archive = tarfile.open(input_path)
+
+
+def _read_source(source):
+    if _archive is None:
+        with open(os.path.join(_input_path, source), 'rb') as f:
+            return f.read()
+    if isinstance(_archive, zipfile.ZipFile):
+        return _archive.read(source)
+    return _archive.extractfile(source).read()
+
+
+def analyze_chunk(args):
+    """Analyse one chunk of sources in a worker; failures become error records"""
+    sources, job_role = args
+    records = []
+    for source in sources:
+        record = {'source': source, 'format': os.path.splitext(source)[1].lower().lstrip('.'), 'job_role': job_role}
+        started = time.perf_counter()
+        try:
+            resume = SourceFile(os.path.basename(source), _read_source(source))
+            record['analysis'] = _analyzer.analyze(resume, job_role, duplicates='off')
+        except Exception as e:
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - started, 4)
+        records.append(record)
+    return records
+
+
+def parquet_available():
+    return any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet'))
+
+
+def write_parquet(jsonl_path, parquet_path):
+    """Convert the finished JSONL to Parquet, the analysis kept as a JSON string column"""
+    import pandas as pd
+    frame = pd.read_json(jsonl_path, lines=True)
+    if 'analysis' in frame:
+        frame['analysis'] = frame['analysis'].map(lambda value: json.dumps(value) if isinstance(value, dict) else None)
+    frame.to_parquet(parquet_path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', help='Directory, .zip or .tar(.gz) of PDF/DOCX/ODT/RTF/HTML/TXT resumes')
+    parser.add_argument('--output', default='resume_analyses.jsonl',
+                        help='JSONL results file, also the checkpoint (default: %(default)s)')
+    parser.add_argument('--parquet', help='Also write the results to this Parquet file when done')
+    parser.add_argument('--job-role', default='Software Developer')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=16, help='Files handed to a worker at a time')
+    parser.add_argument('--retry-failed', action='store_true', help='Analyse sources that failed last run again')
+    args = parser.parse_args(argv)
+
+    if args.parquet and not parquet_available():
+        print("[ERROR] Parquet output needs pyarrow or fastparquet installed")
+        return 2
+    
+    sources = list_sources(args.input)
+    done = load_checkpoint(args.output)
+    if args.retry_failed and done:
+        # Keep only the successful records, so failed sources are queued again
+        with open(args.output) as f:
+            kept = [line for line in f if 'error' not in json.loads(line)]
+        with open(args.output, 'w') as f:
+            f.writelines(kept)
+        done = {json.loads(line)['source'] for line in kept}
+    pending = [source for source in sources if source not in done]
+    print(f"=== Resume Ingestion: {len(sources)} files, {len(done)} already done, {len(pending)} to go ===")
+
+    chunks = [(pending[i:i + args.chunk_size], args.job_role) for i in range(0, len(pending), args.chunk_size)]
+    processed = 0
+    per_format = {}
+    started = time.perf_counter()
+    with open(args.output, 'a') as output, \
+            multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(args.input,)) as pool:
+        for records in pool.imap_unordered(analyze_chunk, chunks):
+            for record in records:
+                output.write(json.dumps(record) + '\n')
+                counts = per_format.setdefault(record['format'], {'ok': 0, 'failed': 0})
+                counts['failed' if 'error' in record else 'ok'] += 1
+            # A chunk is checkpointed once its records are on disk
+            output.flush()
+            os.fsync(output.fileno())
+            processed += len(records)
+            elapsed = time.perf_counter() - started
+            print(f"  {processed}/{len(pending)} files, {processed / elapsed:.1f} files/sec", flush=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n=== Ingestion Complete ===")
+    print(f"Processed {processed} files in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f} files/sec)")
+    for fmt, counts in sorted(per_format.items()):
+        print(f"  {fmt}: {counts['ok']} ok, {counts['failed']} failed")
+
+    if args.parquet:
+        write_parquet(args.output, args.parquet)
+        print(f"[SUCCESS] Wrote {args.parquet}")
+    return 1 if any(counts['failed'] for counts in per_format.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import io
+import re
+import threading
+import time
+from .market_stats import QuantileSketch
+
+# Starting estimate of milliseconds per unit of work for each endpoint. A unit is
+# one request, or for uploads one resume page; measured times replace these.
+DEFAULT_UNIT_COSTS = {
+    'recommend_career': 5,
+    'recommend_career_batch': 5,
+    'analyze_resume': 40,
+    'analyze_resume_batch': 40,
+    'candidates_add': 40,
+    'chatbot_message': 10,
+    'chatbot_career_advice': 10,
+    'chatbot_career_advice_stream': 50,
+    'candidates_search': 10,
+    'profiles_similar': 5,
+    'jobs_recommend': 10,
+    'market_ingest': 200,
+    'warm_up_services': 2000,
+    'index_resize_shards': 2000,
+}
+DEFAULT_UNIT_COST = 10
+
+# Rough bytes per page for uploads whose pages cannot be counted (DOCX, compressed PDFs)
+BYTES_PER_PAGE = 50 * 1024
+# Bytes of a PDF scanned for page objects; enough for the page tree of typical resumes
+PAGE_SCAN_BYTES = 4 * 1024 * 1024
+PDF_PAGE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+
+def upload_pages(file_stream):
+    """Estimated pages in an upload: PDF page objects when visible, else its size over BYTES_PER_PAGE"""
+    position = file_stream.tell()
+    size = file_stream.seek(0, io.SEEK_END)
+    file_stream.seek(0)
+    head = file_stream.read(PAGE_SCAN_BYTES)
+    file_stream.seek(position)
+    pages = len(PDF_PAGE.findall(head)) if head.startswith(b'%PDF') else 0
+    return max(pages, -(-size // BYTES_PER_PAGE), 1)
+
+
+class CostModel:
+    """Milliseconds a request is expected to take, from its endpoint and size in units.
+
+    Starts from DEFAULT_UNIT_COSTS and follows the measured time per unit of
+    each endpoint with an exponential moving average, so the estimates adapt
+    to the host and the document mix.
+    """
+
+    def __init__(self, unit_costs=None, smoothing=0.2):
+        self.unit_costs = dict(DEFAULT_UNIT_COSTS, **(unit_costs or {}))
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def estimate(self, endpoint, units=1):
+        return self.unit_costs.get(endpoint, DEFAULT_UNIT_COST) * max(units, 1)
+
+    def observe(self, endpoint, units, milliseconds):
+        per_unit = milliseconds / max(units, 1)
+        with self._lock:
+            current = self.unit_costs.get(endpoint, DEFAULT_UNIT_COST)
+            self.unit_costs[endpoint] = current + self.smoothing * (per_unit - current)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason, retry_after=1):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    def __init__(self, lane, cost, start_tag, finish_tag):
+        self.lane = lane
+        self.cost = cost
+        self.start_tag = start_tag
+        self.finish_tag = finish_tag
+        self.granted = False
+        self.event = threading.Event()
+        self.enqueued = time.perf_counter()
+        self.admitted = None
+
+
+class AdmissionScheduler:
+    """Admission control for requests of very different cost, in front of the handlers.
+
+    A request whose estimated cost is at most ``slow_cost_ms`` goes to the fast
+    lane, anything bigger to the slow lane. Each lane has its own concurrency
+    limit and queue bound. Both lanes also share ``max_concurrent`` slots,
+    handed out by weighted fair queuing: a request's tag is its lane's
+    previous tag (or the virtual clock, if later) plus cost / lane weight, and
+    the smallest tag whose lane has room runs next. Cheap requests carry
+    small tags and a heavier lane weight, so they overtake queued uploads, and
+    a slow-lane limit below ``max_concurrent`` keeps slots for them even
+    while a burst of uploads is running.
+    """
+
+    def __init__(self, max_concurrent=8, fast_limit=8, slow_limit=2, fast_weight=4, slow_weight=1,
+                 fast_queue=256, slow_queue=32, slow_cost_ms=100, queue_timeout=30, cost_model=None):
+        self.max_concurrent = max_concurrent
+        self.slow_cost_ms = slow_cost_ms
+        self.queue_timeout = queue_timeout
+        self.cost_model = cost_model or CostModel()
+        self.lanes = {
+            'fast': {'limit': fast_limit, 'weight': fast_weight, 'max_queue': fast_queue},
+            'slow': {'limit': slow_limit, 'weight': slow_weight, 'max_queue': slow_queue},
+        }
+        self._running = {lane: 0 for lane in self.lanes}
+        self._queued = {lane: 0 for lane in self.lanes}
+        self._last_tag = {lane: 0.0 for lane in self.lanes}
+        self._counts = {lane: {'admitted': 0, 'rejected': 0, 'timed_out': 0} for lane in self.lanes}
+        self._waits = {lane: QuantileSketch() for lane in self.lanes}
+        self._virtual = 0.0
+        self._waiting = []
+        self._lock = threading.Lock()
+
+    def lane_for(self, cost):
+        return 'fast' if cost <= self.slow_cost_ms else 'slow'
+
+    def acquire(self, cost, timeout=None):
+        """Block until the request may run; returns the Ticket to release, or raises AdmissionRejected"""
+        lane = self.lane_for(cost)
+        settings = self.lanes[lane]
+        with self._lock:
+            if self._queued[lane] >= settings['max_queue']:
+                self._counts[lane]['rejected'] += 1
+                raise AdmissionRejected(f"The {lane} request queue is full", retry_after=1 if lane == 'fast' else 5)
+            start = max(self._virtual, self._last_tag[lane])
+            ticket = Ticket(lane, cost, start, start + cost / settings['weight'])
+            self._last_tag[lane] = ticket.finish_tag
+            self._waiting.append(ticket)
+            self._queued[lane] += 1
+            self._dispatch()
+
+        if not ticket.event.wait(self.queue_timeout if timeout is None else timeout):
+            with self._lock:
+                if not ticket.granted:
+                    self._waiting.remove(ticket)
+                    self._queued[lane] -= 1
+                    self._counts[lane]['timed_out'] += 1
+                    raise AdmissionRejected(f"Timed out waiting in the {lane} request queue", retry_after=5)
+        return ticket
+
+    def release(self, ticket, endpoint=None, units=1):
+        """Free the ticket's slot and, given the endpoint, feed its run time back to the cost model"""
+        if endpoint is not None:
+            self.cost_model.observe(endpoint, units, (time.perf_counter() - ticket.admitted) * 1000)
+        with self._lock:
+            self._running[ticket.lane] -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        # Called with the lock held: grant queued tickets in tag order while there is room
+        while self._waiting and sum(self._running.values()) < self.max_concurrent:
+            eligible = [ticket for ticket in self._waiting
+                        if self._running[ticket.lane] < self.lanes[ticket.lane]['limit']]
+            if not eligible:
+                return
+            ticket = min(eligible, key=lambda ticket: (ticket.finish_tag, ticket.enqueued))
+            self._waiting.remove(ticket)
+            self._queued[ticket.lane] -= 1
+            self._running[ticket.lane] += 1
+            self._virtual = max(self._virtual, ticket.start_tag)
+            ticket.granted = True
+            ticket.admitted = time.perf_counter()
+            self._counts[ticket.lane]['admitted'] += 1
+            self._waits[ticket.lane].add((ticket.admitted - ticket.enqueued) * 1000)
+            ticket.event.set()
+
+    def stats(self):
+        with self._lock:
+            lanes = {}
+            for lane, settings in self.lanes.items():
+                p50, p95, p99 = self._waits[lane].quantiles([0.5, 0.95, 0.99])
+                lanes[lane] = dict(
+                    settings, running=self._running[lane], queued=self._queued[lane], **self._counts[lane],
+                    wait_ms={'p50': p50 and round(p50, 2), 'p95': p95 and round(p95, 2), 'p99': p99 and round(p99, 2)}
+                )
+            return {
+                'max_concurrent': self.max_concurrent,
+                'slow_cost_ms': self.slow_cost_ms,
+                'lanes': lanes,
+                'unit_costs_ms': {endpoint: round(cost, 2) for endpoint, cost in sorted(self.cost_model.unit_costs.items())}
+            }
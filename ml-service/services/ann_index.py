@@ -0,0 +1,256 @@
+import json
+import threading
+import numpy as np
+from .candidate_index import education_tier, skills_match
+from .http_cache import content_version
+
+class ProfileEncoder:
+    """Fixed-length vectors for resumes and user profiles.
+
+    One dimension per vocabulary skill (a profile skill sets every column it
+    matches under the service's substring rule), plus experience and education
+    scaled to the same range. Vectors are L2-normalised so a dot product is
+    the cosine similarity.
+    """
+
+    def __init__(self, vocabulary, experience_weight=0.5, education_weight=0.3, snapshot=None):
+        self.vocabulary = list(dict.fromkeys(skill.strip().lower() for skill in vocabulary))
+        self.experience_weight = experience_weight
+        self.education_weight = education_weight
+        self._columns = {skill: column for column, skill in enumerate(self.vocabulary)}
+        # Row i: every column a profile skill equal to vocabulary[i] sets
+        metadata = snapshot.section('profile_encoder', content_version(self.vocabulary)) if snapshot else None
+        if metadata is None:
+            self._match_table = self.snapshot_tables()[1]['profile_match_table']
+        else:
+            self._match_table = snapshot.array('profile_match_table')
+    
+    def snapshot_tables(self):
+        table = np.array([[skills_match(skill, known) for known in self.vocabulary] for skill in self.vocabulary], dtype=bool)
+        return {'fingerprint': content_version(self.vocabulary)}, {'profile_match_table': table}
+
+    @property
+    def dim(self):
+        return len(self.vocabulary) + 2
+
+    def encode(self, skills, experience_years=0, education=None):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for skill in skills or []:
+            skill = skill.strip().lower()
+            if not skill:
+                continue
+            if skill in self._columns:
+                vector[:-2][self._match_table[self._columns[skill]]] = 1
+                continue
+            for column, known in enumerate(self.vocabulary):
+                if skills_match(skill, known):
+                    vector[column] = 1
+        vector[-2] = min(float(experience_years or 0), 10) / 10 * self.experience_weight * 4
+        vector[-1] = education_tier(education) / 3 * self.education_weight * 4
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class ANNIndex:
+    """Random-hyperplane LSH for cosine nearest neighbours, CPU only.
+
+    Each of ``n_tables`` tables hashes a vector to ``n_bits`` sign bits of its
+    projections onto random hyperplanes. A query looks in its own bucket in
+    every table plus, with multi-probe, the ``probes`` buckets reached by
+    flipping its least certain bits (smallest projections), then re-ranks the
+    union exactly. More tables or probes raise recall and cost latency; more
+    bits make buckets smaller and queries cheaper at lower recall.
+
+    Replacing or removing an item leaves a dead row behind; once dead rows
+    are more than ``compact_ratio`` of all rows the index is rebuilt from the
+    live ones, so repeated updates do not grow it.
+    """
+
+    def __init__(self, dim, n_tables=16, n_bits=10, seed=0, capacity=1024, compact_ratio=0.25):
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.planes = np.random.RandomState(seed).standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._powers = (1 << np.arange(n_bits, dtype=np.int64))
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.ids = []
+        self.rows = {}
+        self.metadata = {}
+        self.tables = [{} for _ in range(n_tables)]
+        self.compact_ratio = compact_ratio
+        self._dead = 0
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _codes(self, vectors):
+        """(n, n_tables) bucket keys plus the raw (n, n_tables, n_bits) projections"""
+        projections = (vectors @ self.planes.T).reshape(len(vectors), self.n_tables, self.n_bits)
+        return (projections > 0) @ self._powers, projections
+
+    def _reserve(self, count):
+        needed = len(self.ids) + count
+        if needed > len(self.vectors):
+            capacity = max(needed, len(self.vectors) * 2)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:len(self.ids)] = self.vectors[:len(self.ids)]
+            self.vectors = vectors
+            self.alive = np.concatenate([self.alive, np.zeros(capacity - len(self.alive), dtype=bool)])
+
+    def build(self, ids, vectors, metadata=None):
+        """Bulk insert: one projection matrix product and one sort per table"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self.lock:
+            for item_id in ids:
+                if item_id in self.rows:
+                    self.remove(item_id)
+            start = len(self.ids)
+            self._reserve(len(ids))
+            self.vectors[start:start + len(ids)] = vectors
+            self.alive[start:start + len(ids)] = True
+            for offset, item_id in enumerate(ids):
+                self.rows[item_id] = start + offset
+                if metadata is not None and metadata[offset] is not None:
+                    self.metadata[item_id] = metadata[offset]
+            self.ids.extend(ids)
+            self._index_rows(np.arange(start, start + len(ids)))
+
+    def _index_rows(self, rows):
+        codes, _ = self._codes(self.vectors[rows])
+        for table, table_codes in zip(self.tables, codes.T):
+            order = np.argsort(table_codes, kind='stable')
+            keys, starts = np.unique(table_codes[order], return_index=True)
+            for key, bucket in zip(keys.tolist(), np.split(rows[order], starts[1:])):
+                table.setdefault(key, []).extend(bucket.tolist())
+
+    def add(self, item_id, vector, metadata=None):
+        """Incremental insert (or replace) of one vector"""
+        with self.lock:
+            if item_id in self.rows:
+                self.remove(item_id)
+            row = len(self.ids)
+            self._reserve(1)
+            self.vectors[row] = vector
+            self.alive[row] = True
+            self.ids.append(item_id)
+            self.rows[item_id] = row
+            if metadata is not None:
+                self.metadata[item_id] = metadata
+            codes, _ = self._codes(self.vectors[row:row + 1])
+            for table, key in zip(self.tables, codes[0].tolist()):
+                table.setdefault(key, []).append(row)
+
+    def remove(self, item_id):
+        """Mark the row dead; bucket entries are skipped at query time"""
+        with self.lock:
+            row = self.rows.pop(item_id, None)
+            if row is None:
+                return False
+            self.alive[row] = False
+            self.metadata.pop(item_id, None)
+            self._dead += 1
+            if self._dead > self.compact_ratio * len(self.ids):
+                self.compact()
+            return True
+
+    def compact(self):
+        """Rebuild the rows and buckets from the live rows only"""
+        with self.lock:
+            live = np.flatnonzero(self.alive[:len(self.ids)])
+            ids = [self.ids[row] for row in live]
+            self.vectors[:len(live)] = self.vectors[live]
+            self.alive[:] = False
+            self.alive[:len(live)] = True
+            self.ids = ids
+            self.rows = {item_id: row for row, item_id in enumerate(ids)}
+            self.tables = [{} for _ in range(self.n_tables)]
+            self._dead = 0
+            if ids:
+                self._index_rows(np.arange(len(ids)))
+
+    def vector(self, item_id):
+        """Copy of an item's stored vector, or None; rows move when the index compacts"""
+        with self.lock:
+            row = self.rows.get(item_id)
+            return None if row is None else self.vectors[row].copy()
+
+    def candidates(self, vector, probes=0):
+        codes, projections = self._codes(np.asarray(vector, dtype=np.float32)[None, :])
+        rows = []
+        for table_index, table in enumerate(self.tables):
+            key = int(codes[0, table_index])
+            rows.extend(table.get(key, ()))
+            if probes:
+                # Flip the bits whose hyperplanes the query sits closest to
+                margins = np.abs(projections[0, table_index])
+                for bit in np.argsort(margins)[:probes].tolist():
+                    rows.extend(table.get(key ^ (1 << bit), ()))
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.sort(np.array(rows, dtype=np.int64))
+        keep = self.alive[rows]
+        keep[1:] &= rows[1:] != rows[:-1]
+        return rows[keep]
+
+    def query(self, vector, k=10, probes=0, exclude=None):
+        """Approximate k most similar items as (id, cosine similarity), best first"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self.lock:
+            rows = self.candidates(vector, probes)
+            if exclude is not None and exclude in self.rows:
+                rows = rows[rows != self.rows[exclude]]
+            return self._rank(rows, vector, k)
+
+    def brute_force(self, vector, k=10, exclude=None):
+        """Exact k most similar items, the reference for recall measurements"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self.lock:
+            rows = np.flatnonzero(self.alive[:len(self.ids)])
+            if exclude is not None and exclude in self.rows:
+                rows = rows[rows != self.rows[exclude]]
+            return self._rank(rows, vector, k)
+
+    def _rank(self, rows, vector, k):
+        if not len(rows):
+            return []
+        scores = self.vectors[rows] @ vector
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.ids[rows[position]], float(scores[position])) for position in top]
+
+    def save(self, path):
+        """Live vectors, liveness and hyperplanes in a .npz; ids, metadata and settings as JSON.
+
+        Buckets are not stored: reloading re-hashes every vector in one batch,
+        which keeps the file format independent of the table layout.
+        """
+        with self.lock:
+            live = np.flatnonzero(self.alive[:len(self.ids)])
+            np.savez(path, vectors=self.vectors[live], alive=np.ones(len(live), dtype=bool), planes=self.planes)
+            with open(path + '.json', 'w') as f:
+                json.dump({
+                    'dim': self.dim,
+                    'n_tables': self.n_tables,
+                    'n_bits': self.n_bits,
+                    'ids': [self.ids[row] for row in live],
+                    'metadata': {str(item_id): value for item_id, value in self.metadata.items()}
+                }, f)
+
+    @classmethod
+    def load(cls, path):
+        arrays = np.load(path if path.endswith('.npz') else path + '.npz')
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        index = cls(meta['dim'], meta['n_tables'], meta['n_bits'], capacity=max(len(meta['ids']), 1))
+        index.planes = arrays['planes']
+        alive = arrays['alive']
+        live = np.flatnonzero(alive)
+        ids = [meta['ids'][row] for row in live]
+        metadata = [meta['metadata'].get(str(item_id)) for item_id in ids]
+        index.build(ids, arrays['vectors'][live], metadata)
+        return index
@@ -0,0 +1,335 @@
+import json
+import threading
+import numpy as np
+
+# Education tiers stored per candidate; the score each tier contributes
+EDUCATION_TIERS = {'none': 0, 'bachelor': 1, 'master': 2, 'phd': 3}
+EDUCATION_SCORES = np.array([0, 60, 80, 100], dtype=np.float32)
+# Other spellings accepted for a min_education filter
+EDUCATION_ALIASES = {
+    'bachelors': 'bachelor', 'ba': 'bachelor', 'bs': 'bachelor', 'bsc': 'bachelor',
+    'masters': 'master', 'ma': 'master', 'ms': 'master', 'msc': 'master', 'mba': 'master',
+    'doctorate': 'phd', 'doctoral': 'phd'
+}
+
+# Skill vectors are 0/1, so rows take one byte per skill; scoring casts to float32
+SKILL_DTYPE = np.uint8
+
+# Backend Job.experience levels mapped to minimum years for pre-filtering
+EXPERIENCE_LEVEL_YEARS = {
+    'Entry Level': 0,
+    'Mid Level': 2,
+    'Senior Level': 5,
+    'Executive': 8
+}
+
+def skills_match(first, second):
+    """Skill equivalence used across the service: either name contains the other"""
+    return first in second or second in first
+
+
+def education_tier(education):
+    """Highest degree tier found in extracted education strings or a degree name"""
+    if isinstance(education, int):
+        return education
+    if isinstance(education, str):
+        education = [education]
+    tier = 0
+    for entry in education or []:
+        entry = entry.lower()
+        if 'phd' in entry or 'ph.d' in entry or 'doctor' in entry:
+            tier = max(tier, 3)
+        elif 'master' in entry or 'mba' in entry or 'm.s' in entry:
+            tier = max(tier, 2)
+        elif entry.strip():
+            tier = max(tier, 1)
+    return tier
+
+
+def min_education_tier(value):
+    """Tier for a min_education filter: a tier name, a common spelling of one, or a tier number"""
+    if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < len(EDUCATION_TIERS):
+        return value
+    if isinstance(value, str):
+        name = value.strip().lower().replace("'", '').replace('.', '')
+        name = EDUCATION_ALIASES.get(name, name)
+        if name in EDUCATION_TIERS:
+            return EDUCATION_TIERS[name]
+    raise ValueError(f"min_education must be one of: {', '.join(EDUCATION_TIERS)}")
+
+
+def top_k_rows(scores, k):
+    """Indices of the k largest scores, best first (ties keep row order)"""
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+class SkillVectorStore:
+    """Growable row store of binary skill vectors plus per-row numeric features.
+
+    Rows are addressed by external id. Deleted rows are only marked dead and
+    recycled by later inserts, so add/update/delete are O(vocabulary) and the
+    matrix is never rebuilt. Columns are added on first sight of a skill.
+    """
+
+    def __init__(self, vocabulary=(), capacity=1024):
+        vocabulary = list(vocabulary)
+        self.vocabulary = {}
+        self.skill_names = []
+        self.skills = np.zeros((capacity, max(len(vocabulary), 16)), dtype=SKILL_DTYPE)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.ids = [None] * capacity
+        self.rows = {}
+        self._free = []
+        self._size = 0
+        self.lock = threading.RLock()
+        for skill in vocabulary:
+            self.column(skill)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, skill):
+        skill = skill.strip().lower()
+        index = self.vocabulary.get(skill)
+        if index is None:
+            index = len(self.skill_names)
+            if index >= self.skills.shape[1]:
+                grown = np.zeros((self.skills.shape[0], self.skills.shape[1] * 2), dtype=SKILL_DTYPE)
+                grown[:, :self.skills.shape[1]] = self.skills
+                self.skills = grown
+            self.vocabulary[skill] = index
+            self.skill_names.append(skill)
+        return index
+
+    def _grow_rows(self):
+        capacity = self.skills.shape[0] * 2
+        skills = np.zeros((capacity, self.skills.shape[1]), dtype=SKILL_DTYPE)
+        skills[:self.skills.shape[0]] = self.skills
+        self.skills = skills
+        self.alive = np.concatenate([self.alive, np.zeros(capacity - len(self.alive), dtype=bool)])
+        self.ids.extend([None] * (capacity - len(self.ids)))
+        self._on_grow(capacity)
+
+    def _on_grow(self, capacity):
+        """Subclasses extend their per-row feature arrays here"""
+
+    def upsert(self, item_id, skills):
+        """Write the skill vector for item_id, returning its row"""
+        with self.lock:
+            row = self.rows.get(item_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    if self._size == self.skills.shape[0]:
+                        self._grow_rows()
+                    row = self._size
+                    self._size += 1
+                self.rows[item_id] = row
+                self.ids[row] = item_id
+
+            columns = [self.column(skill) for skill in skills if skill and skill.strip()]
+            self.skills[row] = 0
+            self.skills[row, columns] = 1
+            self.alive[row] = True
+            return row
+
+    def delete(self, item_id):
+        with self.lock:
+            row = self.rows.pop(item_id, None)
+            if row is None:
+                return False
+            self.alive[row] = False
+            self.skills[row] = 0
+            self.ids[row] = None
+            self._free.append(row)
+            return True
+
+    def query_columns(self, query_skills):
+        """(n_vocabulary, n_query) matrix marking which columns satisfy each query skill"""
+        matrix = np.zeros((self.skills.shape[1], len(query_skills)), dtype=np.float32)
+        for position, query_skill in enumerate(query_skills):
+            query_skill = query_skill.strip().lower()
+            for skill, index in self.vocabulary.items():
+                if skills_match(query_skill, skill):
+                    matrix[index, position] = 1
+        return matrix
+
+    def row_skills(self, row):
+        return [self.skill_names[index] for index in np.flatnonzero(self.skills[row, :len(self.skill_names)])]
+
+
+class CandidateIndex(SkillVectorStore):
+    """Analysed resumes as compact features, ranked against a job's skill requirements.
+
+    Scoring mirrors ResumeAnalyzer.calculate_job_match where the features
+    allow it: skill match (70% required, 30% preferred), experience at 20
+    points per year up to 100, and an education-tier score. Keyword density
+    needs the full text and is left out.
+    """
+
+    WEIGHTS = {'skills': 0.5, 'experience': 0.3, 'education': 0.2}
+
+    def __init__(self, vocabulary=(), capacity=1024):
+        super().__init__(vocabulary, capacity)
+        self.experience = np.zeros(capacity, dtype=np.float32)
+        self.education = np.zeros(capacity, dtype=np.uint8)
+
+    def _on_grow(self, capacity):
+        self.experience = np.concatenate([self.experience, np.zeros(capacity - len(self.experience), dtype=np.float32)])
+        self.education = np.concatenate([self.education, np.zeros(capacity - len(self.education), dtype=np.uint8)])
+
+    def add(self, candidate_id, skills, experience_years=0, education=None):
+        """Insert or replace a candidate"""
+        with self.lock:
+            row = self.upsert(candidate_id, skills)
+            self.experience[row] = float(experience_years or 0)
+            self.education[row] = education_tier(education)
+            return row
+
+    def add_analysis(self, candidate_id, analysis):
+        """Index the output of ResumeAnalyzer.analyze"""
+        return self.add(
+            candidate_id,
+            analysis.get('extracted_skills', []),
+            analysis.get('experience_years', 0),
+            analysis.get('education', [])
+        )
+
+    def delete(self, candidate_id):
+        with self.lock:
+            row = self.rows.get(candidate_id)
+            if row is not None:
+                self.experience[row] = 0
+                self.education[row] = 0
+            return super().delete(candidate_id)
+
+    def pop_record(self, candidate_id):
+        """Remove a candidate and return what add_record needs to rebuild it elsewhere"""
+        with self.lock:
+            row = self.rows[candidate_id]
+            record = {
+                'id': candidate_id,
+                'skills': self.row_skills(row),
+                'experience_years': float(self.experience[row]),
+                'education': int(self.education[row])
+            }
+            self.delete(candidate_id)
+            return record
+
+    def add_record(self, record):
+        return self.add(record['id'], record['skills'], record['experience_years'], record['education'])
+
+    def search(self, required_skills, preferred_skills=(), top_k=20, min_experience=None,
+               max_experience=None, experience_level=None, min_education=None):
+        required_skills = [skill.lower() for skill in required_skills or []]
+        preferred_skills = [skill.lower() for skill in preferred_skills or []]
+        if experience_level in EXPERIENCE_LEVEL_YEARS and min_experience is None:
+            min_experience = EXPERIENCE_LEVEL_YEARS[experience_level]
+        if min_education is not None:
+            min_education = min_education_tier(min_education)
+        
+        with self.lock:
+            size = self._size
+            # Pre-filters are a boolean mask over the live prefix
+            mask = self.alive[:size].copy()
+            if min_experience is not None:
+                mask &= self.experience[:size] >= float(min_experience)
+            if max_experience is not None:
+                mask &= self.experience[:size] <= float(max_experience)
+            if min_education is not None:
+                mask &= self.education[:size] >= min_education
+            if not mask.any():
+                return []
+            
+            scores, hits = self.score(required_skills, preferred_skills)
+            scores[~mask] = -np.inf
+            
+            rows = top_k_rows(scores, min(top_k, int(mask.sum())))
+            required_count = len(required_skills)
+            results = []
+            for row in rows:
+                required_hits = hits[row, :required_count]
+                preferred_hits = hits[row, required_count:]
+                results.append({
+                    'candidate_id': self.ids[row],
+                    'score': round(float(scores[row]), 1),
+                    'skill_match': round(float(self._skill_score(required_hits, preferred_hits)), 1),
+                    'matched_required_skills': [
+                        skill for skill, hit in zip(required_skills, required_hits) if hit
+                    ],
+                    'missing_required_skills': [
+                        skill for skill, hit in zip(required_skills, required_hits) if not hit
+                    ],
+                    'matched_preferred_skills': [
+                        skill for skill, hit in zip(preferred_skills, preferred_hits) if hit
+                    ],
+                    'experience_years': float(self.experience[row]),
+                    'education_tier': int(self.education[row])
+                })
+            return results
+
+    def score(self, required_skills, preferred_skills):
+        """Scores for every row of the live prefix, plus the (rows, query skills) hit matrix"""
+        size = self._size
+        query_skills = required_skills + preferred_skills
+        weights = np.zeros(len(query_skills), dtype=np.float32)
+        if required_skills:
+            weights[:len(required_skills)] = 0.7 * 100 / len(required_skills)
+        if preferred_skills:
+            weights[len(required_skills):] = 0.3 * 100 / len(preferred_skills)
+        
+        # One BLAS product over the contiguous live prefix, clipped to 0/1 per query skill
+        hits = self.skills[:size].astype(np.float32) @ self.query_columns(query_skills)
+        np.minimum(hits, 1, out=hits)
+        skill_score = hits @ weights
+        
+        scores = skill_score * self.WEIGHTS['skills']
+        scores += np.minimum(self.experience[:size] * 20, 100) * self.WEIGHTS['experience']
+        scores += EDUCATION_SCORES[self.education[:size]] * self.WEIGHTS['education']
+        return scores, hits
+
+    def _skill_score(self, required_hits, preferred_hits):
+        required_score = required_hits.mean() * 100 if len(required_hits) else 0
+        preferred_score = preferred_hits.mean() * 100 if len(preferred_hits) else 0
+        return required_score * 0.7 + preferred_score * 0.3
+
+    def save(self, path):
+        """Persist to a .npz file (features) with the ids and vocabulary alongside as JSON"""
+        with self.lock:
+            size = self._size
+            np.savez(
+                path,
+                skills=self.skills[:size, :len(self.skill_names)],
+                alive=self.alive[:size],
+                experience=self.experience[:size],
+                education=self.education[:size]
+            )
+            with open(path + '.json', 'w') as f:
+                json.dump({'ids': self.ids[:size], 'skills': self.skill_names}, f)
+
+    @classmethod
+    def load(cls, path):
+        arrays = np.load(path if path.endswith('.npz') else path + '.npz')
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        size = len(meta['ids'])
+        index = cls(meta['skills'], capacity=max(size, 1024))
+        index.skills[:size, :len(meta['skills'])] = arrays['skills']
+        index.alive[:size] = arrays['alive']
+        index.experience[:size] = arrays['experience']
+        index.education[:size] = arrays['education']
+        index._size = size
+        for row, item_id in enumerate(meta['ids']):
+            if index.alive[row]:
+                index.ids[row] = item_id
+                index.rows[item_id] = row
+            else:
+                index._free.append(row)
+        return index
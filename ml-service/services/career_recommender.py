@@ -1,11 +1,20 @@
 import re
 import numpy as np
 from collections import Counter
+from .http_cache import content_version
+from .single_flight import request_key
 
 class CareerRecommender:
-    def __init__(self):
+    def __init__(self, snapshot=None, cache=None):
         self.career_database = self._initialize_career_database()
         self.skill_keywords = self._initialize_skill_keywords()
+        self._initialize_skill_tables(snapshot)
+        # Optional SharedCache of predictions, keyed by canonical profile and catalogue fingerprint
+        self.cache = cache
+        self._fingerprint = self.catalogue_fingerprint()
+        if cache is not None:
+            # Entries computed from any other catalogue can never be served again
+            cache.invalidate(self._fingerprint)
     
     def _initialize_career_database(self):
         return {
@@ -123,6 +132,52 @@ class CareerRecommender:
             'devops': ['jenkins', 'gitlab', 'ansible', 'prometheus', 'grafana', 'linux']
         }
     
+    def catalogue_fingerprint(self):
+        return content_version(self.career_database, self.skill_keywords)
+    
+    def snapshot_tables(self):
+        """Career x skill match tables over every skill the catalogue names, for the snapshot"""
+        careers = list(self.career_database)
+        skill_terms = list(dict.fromkeys(
+            [skill for skills in self.skill_keywords.values() for skill in skills] +
+            [skill for info in self.career_database.values() for skill in info['required_skills'] + info['preferred_skills']]
+        ))
+        required_slots = [
+            [career_index, skill]
+            for career_index, career_name in enumerate(careers)
+            for skill in self.career_database[career_name]['required_skills']
+        ]
+        required = np.array([
+            [term in skill or skill in term for _, skill in required_slots] for term in skill_terms
+        ], dtype=bool)
+        preferred = np.array([
+            [
+                any(term in skill or skill in term for skill in self.career_database[career_name]['preferred_skills'])
+                for career_name in careers
+            ]
+            for term in skill_terms
+        ], dtype=bool)
+        metadata = {
+            'fingerprint': self.catalogue_fingerprint(),
+            'careers': careers,
+            'skill_terms': skill_terms,
+            'required_slots': required_slots
+        }
+        return metadata, {'career_required_table': required, 'career_preferred_table': preferred}
+    
+    def _initialize_skill_tables(self, snapshot=None):
+        """Which careers' required slots and preferred lists each known skill matches, from the snapshot if current"""
+        metadata = snapshot.section('career_recommender', self.catalogue_fingerprint()) if snapshot else None
+        if metadata is None:
+            metadata, arrays = self.snapshot_tables()
+        else:
+            arrays = {name: snapshot.array(name) for name in ('career_required_table', 'career_preferred_table')}
+        self._careers = metadata['careers']
+        self._skill_columns = {skill: column for column, skill in enumerate(metadata['skill_terms'])}
+        self._required_slots = [tuple(slot) for slot in metadata['required_slots']]
+        self._required_table = arrays['career_required_table']
+        self._preferred_table = arrays['career_preferred_table']
+    
     def _parse_skills(self, skills_text):
         if not skills_text:
             return []
@@ -136,38 +191,6 @@ class CareerRecommender:
         match = re.search(r'(\d+)', str(experience_text))
         return int(match.group(1)) if match else 0
     
-    def _calculate_skill_match(self, user_skills, career_skills):
-        if not user_skills or not career_skills:
-            return 0
-        
-        user_skills_lower = [skill.lower() for skill in user_skills]
-        career_skills_lower = [skill.lower() for skill in career_skills]
-        
-        matched_skills = []
-        for user_skill in user_skills_lower:
-            for career_skill in career_skills_lower:
-                if user_skill in career_skill or career_skill in user_skill:
-                    matched_skills.append(career_skill)
-                    break
-        
-        return len(matched_skills) / len(career_skills_lower) * 100
-    
-    def _calculate_interest_match(self, user_interests, career_interests):
-        if not user_interests or not career_interests:
-            return 50  # Default neutral score
-        
-        user_interests_lower = [interest.strip().lower() for interest in user_interests]
-        career_interests_lower = [interest.lower() for interest in career_interests]
-        
-        matches = 0
-        for user_interest in user_interests_lower:
-            for career_interest in career_interests_lower:
-                if user_interest in career_interest or career_interest in user_interest:
-                    matches += 1
-                    break
-        
-        return min(matches / len(career_interests_lower) * 100, 100)
-    
     def _calculate_salary_range(self, base_salary, experience_years, skill_match_score):
         experience_multiplier = 1 + (experience_years * 0.08)  # 8% per year
         skill_multiplier = 1 + (skill_match_score / 100 * 0.3)  # Up to 30% for perfect skill match
@@ -181,7 +204,60 @@ class CareerRecommender:
             'currency': 'USD'
         }
     
+    def canonical_profile(self, user_data):
+        """Everything predict's output depends on, in one canonical form, for the cache key.
+        
+        Skills and interests (goals included) are sorted but keep duplicates,
+        which count twice; experience stays in exact years, which the salary
+        ranges scale with; education is reduced to the keyword its bonus keys
+        on. The only thing input order decides, the strongest skill area when
+        two areas tie, is kept as is. Profiles sharing this form get identical
+        predictions, so they can share one cache entry.
+        """
+        education = user_data.get('education', '').lower()
+        if 'master' in education or 'mba' in education:
+            education = 'master'
+        elif 'phd' in education or 'doctorate' in education:
+            education = 'phd'
+        else:
+            education = ''
+        skills = self._parse_skills(user_data.get('skills', ''))
+        return {
+            'skills': sorted(skills),
+            'interests': sorted(
+                self._parse_skills(user_data.get('interests', '')) + self._parse_skills(user_data.get('goals', ''))
+            ),
+            'experience': self._parse_experience(user_data.get('experience', '0')),
+            'education': education,
+            'strongest_area': self._strongest_skill_area(skills)
+        }
+    
+    def profile_key(self, profile):
+        return request_key(profile)
+    
+    def cached_prediction(self, user_data):
+        """predict's result for this profile if the cache holds it, else None"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.profile_key(self.canonical_profile(user_data)), self._fingerprint)
+    
+    def remember_prediction(self, user_data, result):
+        if self.cache is not None:
+            self.cache.set(self.profile_key(self.canonical_profile(user_data)), self._fingerprint, result)
+    
     def predict(self, user_data):
+        if self.cache is None:
+            return self._predict(user_data)
+        
+        # Cached results are shared between callers and workers, so they are read-only
+        key = self.profile_key(self.canonical_profile(user_data))
+        result = self.cache.get(key, self._fingerprint)
+        if result is None:
+            result = self._predict(user_data)
+            self.cache.set(key, self._fingerprint, result)
+        return result
+    
+    def _predict(self, user_data):
         # Parse user input
         user_skills = self._parse_skills(user_data.get('skills', ''))
         user_interests = self._parse_skills(user_data.get('interests', ''))
@@ -189,17 +265,130 @@ class CareerRecommender:
         experience_years = self._parse_experience(user_data.get('experience', '0'))
         education = user_data.get('education', '').lower()
         
-        recommendations = []
+        partials = self.new_partial_scores()
+        self.update_partial_scores(partials, user_skills, user_interests + user_goals)
+        
+        return self.rank_from_partial_scores(
+            partials, user_skills, user_interests, len(user_interests) + len(user_goals),
+            experience_years, education
+        )
+    
+    def new_partial_scores(self):
+        """Per-career match counters that can be updated one skill or interest at a time"""
+        return {
+            career_name: {
+                'required_hits': 0,
+                'preferred_hits': 0,
+                'interest_hits': 0,
+                'matched_required': set()
+            }
+            for career_name in self.career_database
+        }
+    
+    def update_partial_scores(self, partials, new_skills, new_interests):
+        """Fold additional (already lowercased) skills and interests into the per-career counters"""
+        unknown_skills = []
+        for user_skill in new_skills:
+            column = self._skill_columns.get(user_skill)
+            if column is None:
+                unknown_skills.append(user_skill)
+                continue
+            # A skill the catalogue names reads its matches off the precomputed tables
+            slots = np.flatnonzero(self._required_table[column]).tolist()
+            for slot in slots:
+                career_index, career_skill = self._required_slots[slot]
+                partials[self._careers[career_index]]['matched_required'].add(career_skill)
+            for career_index in {self._required_slots[slot][0] for slot in slots}:
+                partials[self._careers[career_index]]['required_hits'] += 1
+            for career_index in np.flatnonzero(self._preferred_table[column]).tolist():
+                partials[self._careers[career_index]]['preferred_hits'] += 1
+        
+        for career_name, career_info in self.career_database.items():
+            partial = partials[career_name]
+            for user_skill in unknown_skills:
+                matched = False
+                for career_skill in career_info['required_skills']:
+                    if user_skill in career_skill or career_skill in user_skill:
+                        partial['matched_required'].add(career_skill)
+                        matched = True
+                if matched:
+                    partial['required_hits'] += 1
+                for career_skill in career_info['preferred_skills']:
+                    if user_skill in career_skill or career_skill in user_skill:
+                        partial['preferred_hits'] += 1
+                        break
+            
+            for user_interest in new_interests:
+                user_interest = user_interest.strip().lower()
+                for career_interest in career_info['interests']:
+                    if user_interest in career_interest or career_interest in user_interest:
+                        partial['interest_hits'] += 1
+                        break
+        
+        return partials
+    
+    def rank_from_partial_scores(self, partials, user_skills, user_interests, interest_count,
+                                 experience_years, education):
+        """Turn per-career counters into the ranked recommendations returned by predict"""
+        result = {'recommendations': [], 'insights': []}
+        for event, data in self.iter_rank_from_partial_scores(
+            partials, user_skills, user_interests, interest_count, experience_years, education
+        ):
+            if event == 'recommendation':
+                result['recommendations'].append(data)
+            else:
+                result['insights'] = data
+        return result
+    
+    def iter_predict(self, user_data):
+        """Same result as predict, yielded as ('recommendation', ...) events best-first, then ('insights', ...)"""
+        user_skills = self._parse_skills(user_data.get('skills', ''))
+        user_interests = self._parse_skills(user_data.get('interests', ''))
+        user_goals = self._parse_skills(user_data.get('goals', ''))
+        experience_years = self._parse_experience(user_data.get('experience', '0'))
+        education = user_data.get('education', '').lower()
+        
+        partials = self.new_partial_scores()
+        self.update_partial_scores(partials, user_skills, user_interests + user_goals)
+        
+        return self.iter_rank_from_partial_scores(
+            partials, user_skills, user_interests, len(user_interests) + len(user_goals),
+            experience_years, education
+        )
+    
+    def iter_rank_from_partial_scores(self, partials, user_skills, user_interests, interest_count,
+                                      experience_years, education):
+        """Score every career, then build and yield the top 5 one at a time followed by insights.
+        
+        Only the cheap match percentages are computed up front; salary ranges,
+        skill lists and insights are built lazily, so a consumer that stops
+        early (e.g. a disconnected stream) skips that work.
+        """
+        # Calculate education bonus
+        education_bonus = 0
+        if 'master' in education or 'mba' in education:
+            education_bonus = 10
+        elif 'phd' in education or 'doctorate' in education:
+            education_bonus = 15
+        
+        scored = []
         
         # Calculate matches for each career
         for career_name, career_info in self.career_database.items():
+            partial = partials[career_name]
+            
             # Calculate skill match
-            required_skill_match = self._calculate_skill_match(user_skills, career_info['required_skills'])
-            preferred_skill_match = self._calculate_skill_match(user_skills, career_info['preferred_skills'])
+            required_skill_match = 0
+            preferred_skill_match = 0
+            if user_skills:
+                required_skill_match = partial['required_hits'] / len(career_info['required_skills']) * 100
+                preferred_skill_match = partial['preferred_hits'] / len(career_info['preferred_skills']) * 100
             overall_skill_match = (required_skill_match * 0.7) + (preferred_skill_match * 0.3)
             
             # Calculate interest match
-            interest_match = self._calculate_interest_match(user_interests + user_goals, career_info['interests'])
+            interest_match = 50  # Default neutral score
+            if interest_count:
+                interest_match = min(partial['interest_hits'] / len(career_info['interests']) * 100, 100)
             
             # Calculate experience match
             experience_match = 100
@@ -208,13 +397,6 @@ class CareerRecommender:
             elif experience_years >= 5 and 'Senior' not in career_info['experience_levels']:
                 experience_match = 80
             
-            # Calculate education bonus
-            education_bonus = 0
-            if 'master' in education or 'mba' in education:
-                education_bonus = 10
-            elif 'phd' in education or 'doctorate' in education:
-                education_bonus = 15
-            
             # Calculate overall match percentage
             overall_match = (
                 overall_skill_match * 0.4 +
@@ -223,56 +405,56 @@ class CareerRecommender:
                 education_bonus * 0.1
             )
             
-            # Calculate confidence based on data quality
-            confidence = min(overall_match / 100, 0.95)
-            
-            # Get matched and missing skills
-            matched_required = []
-            missing_required = []
-            
-            for skill in career_info['required_skills']:
-                found = False
-                for user_skill in user_skills:
-                    if user_skill.lower() in skill.lower() or skill.lower() in user_skill.lower():
-                        matched_required.append(skill)
-                        found = True
-                        break
-                if not found:
-                    missing_required.append(skill)
-            
-            # Calculate salary range
-            salary_range = self._calculate_salary_range(
-                career_info['salary_range'], 
-                experience_years, 
-                overall_skill_match
-            )
-            
-            recommendation = {
-                'career': career_name,
-                'match_percentage': round(overall_match, 1),
-                'skill_match': round(overall_skill_match, 1),
-                'confidence': round(confidence, 3),
-                'salary_range': salary_range,
-                'industries': career_info['industries'][:3],  # Top 3 industries
-                'experience_level': self._get_experience_level(experience_years),
-                'growth_potential': career_info['growth_potential'],
-                'remote_friendly': career_info['remote_friendly'],
-                'matched_required_skills': matched_required[:5],  # Top 5 matches
-                'missing_required_skills': missing_required[:5]   # Top 5 missing
-            }
-            
-            recommendations.append(recommendation)
+            scored.append((round(overall_match, 1), overall_match, overall_skill_match, career_name))
         
         # Sort by match percentage and return top 5
-        recommendations.sort(key=lambda x: x['match_percentage'], reverse=True)
-        top_recommendations = recommendations[:5]
+        scored.sort(key=lambda x: x[0], reverse=True)
+        
+        top_recommendations = []
+        for _, overall_match, overall_skill_match, career_name in scored[:5]:
+            recommendation = self._build_recommendation(
+                career_name, partials[career_name], overall_match, overall_skill_match, experience_years
+            )
+            top_recommendations.append(recommendation)
+            yield 'recommendation', recommendation
         
         # Add insights
-        insights = self._generate_insights(user_skills, user_interests, experience_years, top_recommendations)
+        yield 'insights', self._generate_insights(user_skills, user_interests, experience_years, top_recommendations)
+    
+    def _build_recommendation(self, career_name, partial, overall_match, overall_skill_match, experience_years):
+        career_info = self.career_database[career_name]
+        
+        # Calculate confidence based on data quality
+        confidence = min(overall_match / 100, 0.95)
+        
+        # Get matched and missing skills
+        matched_required = []
+        missing_required = []
+        for skill in career_info['required_skills']:
+            if skill in partial['matched_required']:
+                matched_required.append(skill)
+            else:
+                missing_required.append(skill)
+        
+        # Calculate salary range
+        salary_range = self._calculate_salary_range(
+            career_info['salary_range'], 
+            experience_years, 
+            overall_skill_match
+        )
         
         return {
-            'recommendations': top_recommendations,
-            'insights': insights
+            'career': career_name,
+            'match_percentage': round(overall_match, 1),
+            'skill_match': round(overall_skill_match, 1),
+            'confidence': round(confidence, 3),
+            'salary_range': salary_range,
+            'industries': career_info['industries'][:3],  # Top 3 industries
+            'experience_level': self._get_experience_level(experience_years),
+            'growth_potential': career_info['growth_potential'],
+            'remote_friendly': career_info['remote_friendly'],
+            'matched_required_skills': matched_required[:5],  # Top 5 matches
+            'missing_required_skills': missing_required[:5]   # Top 5 missing
         }
     
     def _get_experience_level(self, years):
@@ -285,6 +467,15 @@ class CareerRecommender:
         else:
             return 'Senior Level'
     
+    def _strongest_skill_area(self, user_skills):
+        """Category with the most of the user's skills; a tie goes to the category the user listed first"""
+        skill_categories = Counter()
+        for skill in user_skills:
+            for category, keywords in self.skill_keywords.items():
+                if any(keyword in skill.lower() for keyword in keywords):
+                    skill_categories[category] += 1
+        return skill_categories.most_common(1)[0][0] if skill_categories else None
+    
     def _generate_insights(self, user_skills, user_interests, experience_years, recommendations):
         insights = []
         
@@ -308,14 +499,8 @@ class CareerRecommender:
                 insights.append(f"Consider learning {missing_skills} to strengthen your profile.")
         
         # Skill category analysis
-        skill_categories = Counter()
-        for skill in user_skills:
-            for category, keywords in self.skill_keywords.items():
-                if any(keyword in skill.lower() for keyword in keywords):
-                    skill_categories[category] += 1
-        
-        if skill_categories:
-            top_category = skill_categories.most_common(1)[0][0]
+        top_category = self._strongest_skill_area(user_skills)
+        if top_category:
             insights.append(f"Your strongest skill area is {top_category}. Consider roles that leverage this expertise.")
         
         return insights[:4]  # Return top 4 insights
\ No newline at end of file
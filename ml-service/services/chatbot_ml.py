@@ -1,24 +1,259 @@
 import re
+import threading
 from collections import Counter
+from .cache import LRUCache
 from .career_recommender import CareerRecommender
-from .resume_analyzer import ResumeAnalyzer
+from .intent_classifier import GENERAL_INTENT, get_intent_classifier
+from .session_store import SessionStore
+
+# Session ids are bearer tokens generated by the client, e.g. 16 random bytes as
+# hex or a UUID: anyone who knows one can continue or clear that conversation,
+# so user ids and other guessable values are refused.
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{32,128}$')
+
+def check_session_id(session_id):
+    """Raise ValueError unless session_id looks like a random token of at least 128 bits"""
+    if not isinstance(session_id, str) or not SESSION_ID_PATTERN.match(session_id) \
+            or len(set(session_id)) < 8:
+        raise ValueError(
+            "session_id must be a random token of 32-128 letters, digits, '-' or '_' (e.g. a UUID)"
+        )
+
+class ChatSession:
+    """Profile accumulated over one conversation plus its per-career partial scores"""
+    
+    def __init__(self, partials):
+        self.skills = []
+        self.interests = []
+        self.goals = []
+        self.experience = None
+        self.turns = 0
+        self.partials = partials
+        self.lock = threading.Lock()
+    
+    def to_dict(self):
+        return {
+            'skills': self.skills,
+            'interests': self.interests,
+            'goals': self.goals,
+            'experience': self.experience,
+            'turns': self.turns
+        }
+
+# Answer to messages no intent fits (greetings, small talk, empty input)
+GENERAL_RESPONSE = {
+    'message': "I can suggest careers, find skill gaps, recommend learning resources "
+               "and share job market insights. Try one of these:",
+    'examples': [
+        'What career suits someone who knows Python and SQL?',
+        'What skills am I missing for Data Scientist?',
+        'Recommend courses to learn React',
+        'What is the salary of a DevOps Engineer?'
+    ]
+}
 
 class ChatbotML:
-    def __init__(self):
-        self.career_recommender = CareerRecommender()
-        self.resume_analyzer = ResumeAnalyzer()
+    def __init__(self, cache_size=2048, session_ttl=1800, session_db=None, market_stats=None, career_recommender=None):
+        # The app passes its own recommender so the catalogue is only built once per process
+        self.career_recommender = career_recommender or CareerRecommender()
+        # JobMarketStats built from real postings; mocked figures are used without it
+        self.market_stats = market_stats
+        # Normalized message -> parsed profile / recommendation result. Cached
+        # values are shared between callers and must be treated as read-only.
+        self.parse_cache = LRUCache(maxsize=cache_size)
+        self.recommendation_cache = LRUCache(maxsize=cache_size)
+        self.session_store = SessionStore(
+            ttl=session_ttl,
+            sqlite_path=session_db,
+            serialize=ChatSession.to_dict,
+            deserialize=self._restore_session
+        )
         
-    def get_career_recommendations(self, user_input):
+    def get_career_recommendations(self, user_input, session_id=None):
         """Get career recommendations based on user input"""
+        if session_id:
+            check_session_id(session_id)
         try:
+            if session_id:
+                return self._get_session_recommendations(session_id, user_input)
+            
+            cache_key = self._normalize_message(user_input)
+            result = self.recommendation_cache.get(cache_key)
+            if result is not None:
+                return result
+            
             # Parse user input for career recommendation
             parsed_input = self._parse_user_input(user_input)
             result = self.career_recommender.predict(parsed_input)
+            self.recommendation_cache.set(cache_key, result)
             return result
         except Exception as e:
             print(f"Error getting career recommendations: {e}")
             return None
     
+    def handle_message(self, message, session_id=None, skills=None, career=None):
+        """Classify a free-text message and route it to the matching chatbot capability"""
+        if session_id:
+            check_session_id(session_id)
+        prediction = get_intent_classifier().predict(message)
+        intent = prediction['intent']
+        
+        if intent == GENERAL_INTENT:
+            return {'intent': intent, 'confidence': prediction['confidence'], 'career': None, 'response': GENERAL_RESPONSE}
+        if intent == 'recommendations':
+            response = self.get_career_recommendations(message, session_id)
+            return {'intent': intent, 'confidence': prediction['confidence'], 'response': response}
+        
+        normalized = self._normalize_message(message)
+        profile = self._parse_message(normalized)
+        user_skills = list(skills or profile['skills'])
+        session = self.session_store.get(session_id) if session_id else None
+        if session is not None:
+            user_skills += [skill for skill in session.skills if skill not in user_skills]
+        
+        target_career = None
+        if intent == 'learning_resources' and profile['skills']:
+            # Skills named in the message are what the user wants to learn
+            response = self.get_learning_recommendations(profile['skills'])
+        else:
+            target_career = career or self._find_career_in_text(normalized) or self._top_career(message)
+            if intent == 'skills_gap':
+                response = self.analyze_skills_gap(user_skills, target_career)
+            elif intent == 'learning_resources':
+                gap = self.analyze_skills_gap(user_skills, target_career) or {}
+                response = self.get_learning_recommendations(gap.get('missing_required', []))
+            else:
+                response = self.get_job_market_insights(target_career)
+        
+        return {
+            'intent': intent,
+            'confidence': prediction['confidence'],
+            'career': target_career,
+            'response': response
+        }
+    
+    def classify_intents(self, messages):
+        """Batch intent classification without routing"""
+        return get_intent_classifier().predict_batch(messages)
+    
+    def clear_session(self, session_id):
+        """Forget the profile accumulated for a conversation"""
+        check_session_id(session_id)
+        return self.session_store.delete(session_id)
+    
+    def stream_career_recommendations(self, user_input, session_id=None):
+        """Yield (event, data) pairs: 'top' as soon as the best career is ranked, then each
+        further 'recommendation', then 'insights'. Work stops when the consumer stops iterating."""
+        if session_id:
+            check_session_id(session_id)
+            session_info, rank_args = self._apply_session_turn(session_id, user_input)
+            yield 'session', session_info
+            events = self.career_recommender.iter_rank_from_partial_scores(*rank_args)
+            yield from self._label_stream_events(events)
+            return
+        
+        cache_key = self._normalize_message(user_input)
+        result = self.recommendation_cache.get(cache_key)
+        parsed_input = None
+        if result is None:
+            # Another worker may already have answered the same profile
+            parsed_input = self._parse_user_input(user_input)
+            result = self.career_recommender.cached_prediction(parsed_input)
+            if result is not None:
+                self.recommendation_cache.set(cache_key, result)
+        if result is not None:
+            events = [('recommendation', recommendation) for recommendation in result['recommendations']]
+            events.append(('insights', result['insights']))
+            yield from self._label_stream_events(events)
+            return
+        
+        result = {'recommendations': [], 'insights': []}
+        events = self.career_recommender.iter_predict(parsed_input)
+        for event, data in self._label_stream_events(events):
+            if event == 'insights':
+                result['insights'] = data
+            else:
+                result['recommendations'].append(data)
+            yield event, data
+        # Only a fully consumed stream leaves a complete result to cache
+        self.recommendation_cache.set(cache_key, result)
+        self.career_recommender.remember_prediction(parsed_input, result)
+    
+    def _label_stream_events(self, events):
+        first = True
+        for event, data in events:
+            if event == 'recommendation' and first:
+                event = 'top'
+                first = False
+            yield event, data
+    
+    def _get_session_recommendations(self, session_id, user_input):
+        """Fold one conversation turn into the session profile and re-rank from partial scores"""
+        session_info, rank_args = self._apply_session_turn(session_id, user_input)
+        result = self.career_recommender.rank_from_partial_scores(*rank_args)
+        result['session'] = session_info
+        return result
+    
+    def _apply_session_turn(self, session_id, user_input):
+        """Update the session profile with one turn; returns session info and ranking arguments"""
+        session = self.session_store.get_or_create(session_id, self._new_session)
+        
+        with session.lock:
+            normalized = self._normalize_message(user_input)
+            profile = self._parse_message(normalized)
+            
+            # Only the delta against the accumulated profile touches the partial scores
+            new_skills = [skill for skill in profile['skills'] if skill not in session.skills]
+            new_interests = [interest for interest in profile['interests'] if interest not in session.interests]
+            new_goals = [goal for goal in self.career_recommender._parse_skills(normalized) if goal not in session.goals]
+            self.career_recommender.update_partial_scores(session.partials, new_skills, new_interests + new_goals)
+            
+            session.skills.extend(new_skills)
+            session.interests.extend(new_interests)
+            session.goals.extend(new_goals)
+            if profile['experience']:
+                session.experience = profile['experience']
+            session.turns += 1
+            self.session_store.save(session_id, session)
+            
+            # Snapshot so ranking can run (or stream) outside the session lock
+            partials = {
+                career: dict(partial, matched_required=set(partial['matched_required']))
+                for career, partial in session.partials.items()
+            }
+            rank_args = (
+                partials,
+                list(session.skills),
+                list(session.interests),
+                len(session.interests) + len(session.goals),
+                self.career_recommender._parse_experience(session.experience or '1 year'),
+                ''
+            )
+            session_info = {
+                'session_id': session_id,
+                'turns': session.turns,
+                'skills': list(session.skills),
+                'interests': list(session.interests),
+                'experience': session.experience
+            }
+        
+        return session_info, rank_args
+    
+    def _new_session(self):
+        return ChatSession(self.career_recommender.new_partial_scores())
+    
+    def _restore_session(self, state):
+        session = self._new_session()
+        session.skills = state['skills']
+        session.interests = state['interests']
+        session.goals = state['goals']
+        session.experience = state['experience']
+        session.turns = state['turns']
+        self.career_recommender.update_partial_scores(
+            session.partials, session.skills, session.interests + session.goals
+        )
+        return session
+    
     def analyze_skills_gap(self, user_skills, target_career):
         """Analyze skill gaps for a target career"""
         try:
@@ -110,7 +345,12 @@ class ChatbotML:
     
     def get_job_market_insights(self, role, location='Remote'):
         """Get job market insights for a specific role"""
-        # Mock job market data - in production, this would come from real job APIs
+        if self.market_stats is not None:
+            insights = self.market_stats.insights(role)
+            if insights:
+                return insights
+        
+        # Mock job market data, used until job postings have been ingested
         market_data = {
             'Software Engineer': {
                 'demand': 'Very High',
@@ -145,78 +385,169 @@ class ChatbotML:
     
     def _parse_user_input(self, user_input):
         """Parse user input to extract relevant information for ML models"""
-        # Extract skills mentioned in the input
-        skills = self._extract_skills_from_text(user_input)
+        normalized = self._normalize_message(user_input)
+        profile = self._parse_message(normalized)
+        
+        return {
+            'skills': ', '.join(profile['skills']),
+            'interests': ', '.join(profile['interests']),
+            'experience': profile['experience'] or '1 year',
+            'education': '',  # Could be extracted if mentioned
+            'goals': normalized  # Use full input as goals context
+        }
+    
+    def _top_career(self, message):
+        recommendations = self.get_career_recommendations(message)
+        if recommendations and recommendations['recommendations']:
+            return recommendations['recommendations'][0]['career']
+        return None
+    
+    def _find_career_in_text(self, normalized):
+        """Return the catalogue career named in the message, if any"""
+        for alias, career in _CAREER_ALIASES:
+            if alias in normalized:
+                return career
+        return None
+    
+    def _normalize_message(self, text):
+        """Lowercase and collapse whitespace so equivalent prompts share a cache entry"""
+        return ' '.join(str(text or '').lower().split())
+    
+    def _parse_message(self, normalized):
+        """Cached single-pass extraction for an already normalized message"""
+        profile = self.parse_cache.get(normalized)
+        if profile is None:
+            profile = self._extract_profile_from_text(normalized)
+            self.parse_cache.set(normalized, profile)
+        return profile
+    
+    def _extract_profile_from_text(self, text):
+        """Extract skills, interests and experience from normalized text in one regex pass"""
+        skills = set()
+        interests = set()
+        levels = set()
+        experience_candidates = [None, None, None]  # "years of experience", "years in", bare "years"
         
-        # Extract experience level
-        experience = self._extract_experience_from_text(user_input)
+        for keyword, years, plus, of_experience, within in _MESSAGE_MATCHER.findall(text):
+            if keyword:
+                keyword_skills, keyword_interests, keyword_levels = _KEYWORD_EFFECTS[keyword]
+                skills.update(keyword_skills)
+                interests.update(keyword_interests)
+                levels.update(keyword_levels)
+                continue
+            
+            if of_experience and not plus and experience_candidates[0] is None:
+                experience_candidates[0] = years
+            elif within and not plus and experience_candidates[1] is None:
+                experience_candidates[1] = years
+            if experience_candidates[2] is None:
+                experience_candidates[2] = years
         
-        # Extract interests
-        interests = self._extract_interests_from_text(user_input)
+        experience = None
+        for years in experience_candidates:
+            if years is not None:
+                experience = f"{years} years"
+                break
+        if experience is None:
+            for level, label in _LEVEL_EXPERIENCE:
+                if level in levels:
+                    experience = label
+                    break
         
         return {
-            'skills': ', '.join(skills) if skills else '',
-            'interests': ', '.join(interests) if interests else '',
-            'experience': experience,
-            'education': '',  # Could be extracted if mentioned
-            'goals': user_input  # Use full input as goals context
+            'skills': sorted(skills, key=_SKILL_KEYWORDS.index),
+            'interests': sorted(interests, key=_INTEREST_KEYWORDS.index),
+            'experience': experience
         }
+
+
+def _keyword_trie_pattern(keywords):
+    """Build a prefix-factored alternation that prefers the longest keyword at each position"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
     
-    def _extract_skills_from_text(self, text):
-        """Extract skills mentioned in text"""
-        # Common skills to look for
-        skill_patterns = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'html', 'css',
-            'machine learning', 'data analysis', 'project management', 'leadership',
-            'communication', 'problem solving', 'teamwork', 'git', 'docker', 'aws'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in skill_patterns:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
-    
-    def _extract_experience_from_text(self, text):
-        """Extract experience level from text"""
-        # Look for experience patterns
-        experience_patterns = [
-            r'(\d+)\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\s*years?\s*in',
-            r'(\d+)\+?\s*years?'
-        ]
-        
-        for pattern in experience_patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                return f"{match.group(1)} years"
-        
-        # Look for experience level keywords
-        if any(word in text.lower() for word in ['beginner', 'entry', 'junior', 'new']):
-            return '0 years'
-        elif any(word in text.lower() for word in ['senior', 'lead', 'principal']):
-            return '5+ years'
-        elif any(word in text.lower() for word in ['mid', 'intermediate']):
-            return '2-4 years'
-        
-        return '1 year'
-    
-    def _extract_interests_from_text(self, text):
-        """Extract interests from text"""
-        interest_keywords = [
-            'web development', 'data science', 'machine learning', 'mobile development',
-            'game development', 'cybersecurity', 'cloud computing', 'ai', 'blockchain',
-            'design', 'user experience', 'product management', 'marketing', 'sales'
-        ]
-        
-        text_lower = text.lower()
-        found_interests = []
-        
-        for interest in interest_keywords:
-            if interest in text_lower:
-                found_interests.append(interest)
-        
-        return found_interests
\ No newline at end of file
+    return build(trie)
+
+
+def _build_message_matcher():
+    """Compile one overlapping-match regex over every chatbot keyword plus the experience patterns"""
+    # Shorter keywords contained in the longest match are recovered through _KEYWORD_EFFECTS.
+    # Groups: keyword, years, plus, of_experience, within
+    experience = r'(\d+)(\+)?\s*years?(?:(\s*(?:of\s*)?experience)|(\s*in))?'
+    return re.compile(r'(?=(' + _keyword_trie_pattern(_KEYWORD_KINDS) + r')|' + experience + r')')
+
+
+_SKILL_KEYWORDS = [
+    'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'html', 'css',
+    'machine learning', 'data analysis', 'project management', 'leadership',
+    'communication', 'problem solving', 'teamwork', 'git', 'docker', 'aws'
+]
+
+_INTEREST_KEYWORDS = [
+    'web development', 'data science', 'machine learning', 'mobile development',
+    'game development', 'cybersecurity', 'cloud computing', 'ai', 'blockchain',
+    'design', 'user experience', 'product management', 'marketing', 'sales'
+]
+
+_LEVEL_KEYWORDS = {
+    'beginner': 'entry', 'entry': 'entry', 'junior': 'entry', 'new': 'entry',
+    'senior': 'senior', 'lead': 'senior', 'principal': 'senior',
+    'mid': 'mid', 'intermediate': 'mid'
+}
+
+_LEVEL_EXPERIENCE = [('entry', '0 years'), ('senior', '5+ years'), ('mid', '2-4 years')]
+
+# Longest aliases first so "ux/ui designer" wins over "designer"-style partial names
+_CAREER_ALIASES = sorted([
+    ('software engineer', 'Software Engineer'),
+    ('data scientist', 'Data Scientist'),
+    ('data science', 'Data Scientist'),
+    ('frontend', 'Frontend Developer'),
+    ('front-end', 'Frontend Developer'),
+    ('backend', 'Backend Developer'),
+    ('back-end', 'Backend Developer'),
+    ('product manager', 'Product Manager'),
+    ('product management', 'Product Manager'),
+    ('ux/ui designer', 'UX/UI Designer'),
+    ('ux designer', 'UX/UI Designer'),
+    ('ui designer', 'UX/UI Designer'),
+    ('devops', 'DevOps Engineer'),
+    ('business analyst', 'Business Analyst'),
+    ('cybersecurity', 'Cybersecurity Specialist'),
+    ('security specialist', 'Cybersecurity Specialist'),
+    ('mobile developer', 'Mobile Developer'),
+    ('mobile development', 'Mobile Developer')
+], key=lambda alias: len(alias[0]), reverse=True)
+
+_KEYWORD_KINDS = {}
+for _keyword in _SKILL_KEYWORDS:
+    _KEYWORD_KINDS.setdefault(_keyword, set()).add('skill')
+for _keyword in _INTEREST_KEYWORDS:
+    _KEYWORD_KINDS.setdefault(_keyword, set()).add('interest')
+for _keyword in _LEVEL_KEYWORDS:
+    _KEYWORD_KINDS.setdefault(_keyword, set()).add('level')
+
+# Every keyword that occurs as a substring of another one ("java" in "javascript",
+# "lead" in "leadership") is implied by it, matching plain substring semantics.
+# Each keyword maps to the (skills, interests, experience levels) it contributes.
+_KEYWORD_EFFECTS = {}
+for _keyword in _KEYWORD_KINDS:
+    _implied = [other for other in _KEYWORD_KINDS if other in _keyword]
+    _KEYWORD_EFFECTS[_keyword] = (
+        frozenset(other for other in _implied if 'skill' in _KEYWORD_KINDS[other]),
+        frozenset(other for other in _implied if 'interest' in _KEYWORD_KINDS[other]),
+        frozenset(_LEVEL_KEYWORDS[other] for other in _implied if 'level' in _KEYWORD_KINDS[other])
+    )
+
+_MESSAGE_MATCHER = _build_message_matcher()
@@ -0,0 +1,78 @@
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Text boxes are stored twice, as DrawingML (mc:Choice) and as VML (mc:Fallback); only the first is read
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Uncompressed size above which a part is refused rather than parsed (zip bombs)
+MAX_PART_BYTES = 64 * 1024 * 1024
+
+def _part_number(name):
+    match = re.search(r'(\d+)\.xml$', name)
+    return int(match.group(1)) if match else 0
+
+
+def docx_parts(archive):
+    """Text-bearing parts in reading order: headers, the document body, footers"""
+    names = archive.namelist()
+    headers = sorted((name for name in names if re.fullmatch(r'word/header\d*\.xml', name)), key=_part_number)
+    footers = sorted((name for name in names if re.fullmatch(r'word/footer\d*\.xml', name)), key=_part_number)
+    return headers + ['word/document.xml'] + footers
+
+
+def iter_part_paragraphs(source):
+    """Paragraph texts of one WordprocessingML part, streamed with iterparse.
+
+    Table cells and text boxes are made of ordinary ``w:p`` elements, so they
+    come out in document order with the body text. Elements are cleared as
+    soon as their text has been taken, which keeps memory bounded by the
+    largest paragraph (or table) rather than the document.
+    """
+    paragraphs = []
+    container = None
+    skipping = 0
+    for event, elem in iterparse(source, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == MC_FALLBACK:
+                skipping += 1
+            elif tag == W + 'p' and not skipping:
+                paragraphs.append([])
+            elif container is None and tag in (W + 'body', W + 'hdr', W + 'ftr'):
+                container = elem
+            continue
+
+        if tag == MC_FALLBACK:
+            skipping -= 1
+        elif skipping or not paragraphs:
+            pass
+        elif tag == W + 't':
+            paragraphs[-1].append(elem.text or '')
+        elif tag == W + 'tab':
+            paragraphs[-1].append('\t')
+        elif tag in (W + 'br', W + 'cr'):
+            paragraphs[-1].append('\n')
+        elif tag == W + 'p':
+            yield ''.join(paragraphs.pop())
+        if tag in (W + 'p', W + 'tbl') and not paragraphs:
+            elem.clear()
+            if container is not None:
+                # Drop the finished top-level blocks the tree builder still holds on to
+                container.clear()
+
+
+def extract_docx_text(file_stream):
+    """Text of a DOCX (headers, body paragraphs and tables, text boxes, footers), one paragraph per line"""
+    with zipfile.ZipFile(file_stream) as archive:
+        names = set(archive.namelist())
+        if 'word/document.xml' not in names:
+            raise ValueError("Not a Word document: word/document.xml is missing")
+        lines = []
+        for name in docx_parts(archive):
+            if archive.getinfo(name).file_size > MAX_PART_BYTES:
+                raise ValueError(f"{name} is larger than {MAX_PART_BYTES} bytes uncompressed")
+            with archive.open(name) as part:
+                lines.extend(iter_part_paragraphs(part))
+    return ''.join(line + '\n' for line in lines)
@@ -0,0 +1,412 @@
+import importlib.util
+import re
+import threading
+import time
+import zipfile
+from html.parser import HTMLParser
+from xml.etree.ElementTree import iterparse
+from .docx_text import MAX_PART_BYTES, extract_docx_text
+from .market_stats import QuantileSketch
+
+# Formats a resume can be uploaded in, as returned by sniff_format
+FORMATS = ('pdf', 'docx', 'odt', 'rtf', 'html', 'txt')
+
+# Backends tried per format, fastest first; later ones are fallbacks
+DEFAULT_ORDER = {
+    'pdf': ['pypdf2', 'pdfminer', 'pymupdf'],
+    'docx': ['streaming', 'python-docx'],
+    'odt': ['streaming'],
+    'rtf': ['stripper'],
+    'html': ['html-parser'],
+    'txt': ['decode'],
+}
+
+SUFFIXES = {'.pdf': 'pdf', '.docx': 'docx', '.odt': 'odt', '.rtf': 'rtf', '.html': 'html', '.htm': 'html', '.txt': 'txt'}
+
+def suffix_format(filename):
+    """Format named by a filename's suffix: None without a suffix, '' for one we do not read"""
+    suffix = re.search(r'\.[a-z0-9]+$', (filename or '').lower())
+    if not suffix:
+        return None
+    return SUFFIXES.get(suffix.group(0), '')
+
+
+def sniff_format(head, filename=''):
+    """Format of an upload from its first bytes; the filename suffix only decides among text formats.
+
+    ``head`` should be at least the first few KiB. ZIP containers (DOCX, ODT)
+    are told apart by opening them, which needs the whole stream, so those
+    come back as 'zip' for the caller to resolve. Bytes without a known
+    signature are only read as text when the name is a text one or has no
+    suffix, so a corrupt ``cv.pdf`` is rejected rather than read as text.
+    """
+    if head.startswith(b'%PDF-'):
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'zip'
+    if head.startswith(b'{\\rtf'):
+        return 'rtf'
+    named = suffix_format(filename)
+    if named not in (None, 'html', 'txt'):
+        return None
+    if head[:3] == b'\xef\xbb\xbf':
+        head = head[3:]
+    # NUL bytes mean a binary format we do not read (e.g. legacy .doc)
+    if b'\x00' in head:
+        return None
+    start = head.lstrip()[:512].lower()
+    if start.startswith((b'<!doctype html', b'<html')) or (start.startswith(b'<') and b'<body' in head.lower()):
+        return 'html'
+    if named == 'html':
+        return 'html'
+    return 'txt'
+
+
+def zip_format(file_stream):
+    """'docx' or 'odt' for a ZIP container, None for any other archive"""
+    with zipfile.ZipFile(file_stream) as archive:
+        names = set(archive.namelist())
+        if 'word/document.xml' in names:
+            return 'docx'
+        if 'mimetype' in names and archive.read('mimetype').strip() == b'application/vnd.oasis.opendocument.text':
+            return 'odt'
+    return None
+
+
+def extract_pdf_pypdf2(file_stream):
+    # Imported here: PyPDF2 is slow to import and most callers never need it
+    import PyPDF2
+    reader = PyPDF2.PdfReader(file_stream)
+    return ''.join((page.extract_text() or '') + '\n' for page in reader.pages)
+
+
+def extract_pdf_pdfminer(file_stream):
+    from pdfminer.high_level import extract_text
+    return extract_text(file_stream)
+
+
+def extract_pdf_pymupdf(file_stream):
+    import fitz
+    with fitz.open(stream=file_stream.read(), filetype='pdf') as document:
+        return ''.join(page.get_text() + '\n' for page in document)
+
+
+def extract_docx_python_docx(file_stream):
+    """Body paragraphs only, through python-docx's object model; slower, kept as a fallback"""
+    import docx
+    return ''.join(paragraph.text + '\n' for paragraph in docx.Document(file_stream).paragraphs)
+
+
+ODT_TEXT = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+ODT_OFFICE = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+ODT_BLOCKS = (ODT_TEXT + 'p', ODT_TEXT + 'h')
+
+def _odt_inline(elem, parts):
+    if elem.text:
+        parts.append(elem.text)
+    for child in elem:
+        if child.tag == ODT_TEXT + 'tab':
+            parts.append('\t')
+        elif child.tag == ODT_TEXT + 'line-break':
+            parts.append('\n')
+        elif child.tag == ODT_TEXT + 's':
+            parts.append(' ' * int(child.get(ODT_TEXT + 'c', 1)))
+        elif child.tag in ODT_BLOCKS:
+            # A paragraph inside a paragraph: a text box, frame or note
+            parts.append('\n')
+            _odt_inline(child, parts)
+            parts.append('\n')
+        else:
+            _odt_inline(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def extract_odt(file_stream):
+    """Paragraphs and headings (tables included) of an ODT's content.xml, streamed like the DOCX extractor"""
+    with zipfile.ZipFile(file_stream) as archive:
+        if archive.getinfo('content.xml').file_size > MAX_PART_BYTES:
+            raise ValueError(f"content.xml is larger than {MAX_PART_BYTES} bytes uncompressed")
+        lines = []
+        container = None
+        depth = 0
+        with archive.open('content.xml') as part:
+            for event, elem in iterparse(part, events=('start', 'end')):
+                if elem.tag not in ODT_BLOCKS:
+                    if event == 'start' and elem.tag == ODT_OFFICE + 'text':
+                        container = elem
+                    continue
+                if event == 'start':
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 0:
+                    parts = []
+                    _odt_inline(elem, parts)
+                    lines.append(''.join(parts))
+                    elem.clear()
+                    if container is not None:
+                        container.clear()
+    return ''.join(line + '\n' for line in lines)
+
+
+# RTF groups whose text is not part of the document body
+RTF_SKIPPED_GROUPS = {'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'listtable', 'listoverridetable',
+                      'rsidtbl', 'generator', 'xmlnstbl', 'themedata'}
+RTF_TOKEN = re.compile(rb"\\([a-z]+)(-?\d+)? ?|\\'([0-9a-f]{2})|\\(.)|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.I | re.S)
+
+def extract_rtf(file_stream):
+    """Plain text of an RTF document: control words dropped, \\par as newlines, escapes decoded (cp1252)"""
+    data = file_stream.read()
+    out = []
+    stack = []
+    skipping = False
+    skip_chars = 0
+    unicode_skip = 1
+    for match in RTF_TOKEN.finditer(data):
+        word, argument, hex_code, symbol, brace, text = match.groups()
+        if brace == b'{':
+            stack.append((skipping, unicode_skip))
+            continue
+        if brace == b'}':
+            if stack:
+                skipping, unicode_skip = stack.pop()
+            continue
+        if word is not None:
+            word = word.decode('ascii').lower()
+            if word in RTF_SKIPPED_GROUPS:
+                skipping = True
+            elif skipping:
+                pass
+            elif word in ('par', 'line', 'row', 'sect', 'page'):
+                out.append('\n')
+            elif word in ('tab', 'cell'):
+                out.append('\t')
+            elif word == 'uc':
+                unicode_skip = int(argument or 1)
+            elif word == 'u':
+                code = int(argument)
+                out.append(chr(code + 65536 if code < 0 else code))
+                # The \uN is followed by ANSI replacement characters for old readers
+                skip_chars = unicode_skip
+            continue
+        if symbol is not None:
+            if symbol == b'*':
+                skipping = True
+            elif not skipping and symbol in (b'\\', b'{', b'}'):
+                out.append(symbol.decode('ascii'))
+            elif not skipping and symbol == b'~':
+                out.append(' ')
+            elif not skipping and symbol in (b'\n', b'\r'):
+                out.append('\n')
+            continue
+        if skipping:
+            continue
+        if hex_code is not None:
+            if skip_chars:
+                skip_chars -= 1
+            else:
+                out.append(bytes.fromhex(hex_code.decode('ascii')).decode('cp1252', errors='replace'))
+            continue
+        if text is not None:
+            text = text.decode('cp1252', errors='replace')
+            if skip_chars:
+                dropped = min(skip_chars, len(text))
+                text = text[dropped:]
+                skip_chars -= dropped
+            out.append(text)
+    return ''.join(out)
+
+
+class _HTMLText(HTMLParser):
+    BLOCKS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article',
+              'header', 'footer', 'ul', 'ol', 'table', 'dd', 'dt'}
+    SKIPPED = {'script', 'style', 'head', 'noscript', 'template'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self.skipping += 1
+        elif tag in self.BLOCKS:
+            self.parts.append('\n')
+        elif tag in ('td', 'th'):
+            self.parts.append('\t')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED:
+            self.skipping = max(self.skipping - 1, 0)
+        elif tag in self.BLOCKS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+
+def extract_html(file_stream):
+    """Visible text of an HTML resume: scripts and styles dropped, block elements on their own lines"""
+    parser = _HTMLText()
+    parser.feed(decode_text(file_stream.read()))
+    parser.close()
+    text = ''.join(parser.parts)
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip()) + '\n'
+
+
+def decode_text(data):
+    """UTF-8 (with or without BOM), falling back to cp1252 for legacy exports"""
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace')
+
+
+def extract_txt(file_stream):
+    return decode_text(file_stream.read())
+
+
+# (format, name, extractor, module that must be importable for it to be available)
+BACKENDS = [
+    ('pdf', 'pypdf2', extract_pdf_pypdf2, 'PyPDF2'),
+    ('pdf', 'pdfminer', extract_pdf_pdfminer, 'pdfminer'),
+    ('pdf', 'pymupdf', extract_pdf_pymupdf, 'fitz'),
+    ('docx', 'streaming', extract_docx_text, None),
+    ('docx', 'python-docx', extract_docx_python_docx, 'docx'),
+    ('odt', 'streaming', extract_odt, None),
+    ('rtf', 'stripper', extract_rtf, None),
+    ('html', 'html-parser', extract_html, None),
+    ('txt', 'decode', extract_txt, None),
+]
+
+def parse_order(spec):
+    """Backend order from a spec like ``"pdf=pdfminer,pypdf2;docx=streaming"``; unlisted formats keep the default"""
+    order = {}
+    for item in (spec or '').split(';'):
+        if not item.strip():
+            continue
+        fmt, _, names = item.partition('=')
+        fmt = fmt.strip().lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown resume format '{fmt}' in extractor order, expected one of {', '.join(FORMATS)}")
+        order[fmt] = [name.strip() for name in names.split(',') if name.strip()]
+    return order
+
+
+class ExtractorRegistry:
+    """Text extractors per resume format, tried in order until one returns text.
+
+    The format is sniffed from the file's bytes, not its name. A backend that
+    raises, or returns only whitespace, hands over to the next one for that
+    format. Every attempt is timed and counted per backend so the order can
+    be tuned to the document mix (``metrics()``). Backends whose library is
+    not installed are skipped.
+    """
+
+    def __init__(self, order=None):
+        self.backends = {}
+        self.order = {fmt: list(names) for fmt, names in DEFAULT_ORDER.items()}
+        for fmt, name, extract, module in BACKENDS:
+            self.register(fmt, name, extract, module)
+        for fmt, names in (order or {}).items():
+            unknown = [name for name in names if (fmt, name) not in self.backends]
+            if unknown:
+                raise ValueError(f"Unknown {fmt} extractor(s): {', '.join(unknown)}")
+            self.order[fmt] = list(names)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, fmt, name, extract, module=None):
+        """Add a backend; it is tried after the ones already ordered for its format"""
+        self.backends[(fmt, name)] = (extract, module)
+        if name not in self.order.setdefault(fmt, []):
+            self.order[fmt].append(name)
+
+    def available(self, fmt):
+        """Backend names for a format in the order they are tried, leaving out uninstalled ones"""
+        names = []
+        for name in self.order.get(fmt, []):
+            extract, module = self.backends[(fmt, name)]
+            if module is None or importlib.util.find_spec(module) is not None:
+                names.append(name)
+        return names
+
+    def detect(self, file_stream, filename=''):
+        head = file_stream.read(4096)
+        file_stream.seek(0)
+        fmt = sniff_format(head, filename)
+        if fmt == 'zip':
+            try:
+                fmt = zip_format(file_stream)
+            except zipfile.BadZipFile:
+                fmt = None
+            file_stream.seek(0)
+        return fmt
+
+    def extract(self, file_stream, filename=''):
+        """(text, format, backend name) for a seekable binary stream"""
+        fmt = self.detect(file_stream, filename)
+        if fmt is None:
+            named = suffix_format(filename)
+            if named:
+                raise Exception(f"Error reading {named.upper()}: not a valid {named.upper()} file")
+            raise ValueError(f"Unsupported file format. Please upload one of: {', '.join(FORMATS).upper()}.")
+
+        errors = []
+        for name in self.available(fmt):
+            extract, _ = self.backends[(fmt, name)]
+            file_stream.seek(0)
+            started = time.perf_counter()
+            try:
+                text = extract(file_stream)
+            except Exception as e:
+                self._record(fmt, name, time.perf_counter() - started, 'failures')
+                errors.append(f"{name}: {e}")
+                continue
+            if not (text or '').strip():
+                self._record(fmt, name, time.perf_counter() - started, 'empty')
+                continue
+            self._record(fmt, name, time.perf_counter() - started, 'ok')
+            return text, fmt, name
+
+        if errors:
+            raise Exception(f"Error reading {fmt.upper()}: {'; '.join(errors)}")
+        # Every backend ran but none found text (e.g. a scanned PDF)
+        return '', fmt, None
+
+    def _record(self, fmt, name, seconds, outcome):
+        with self._lock:
+            stats = self._stats.get((fmt, name))
+            if stats is None:
+                stats = self._stats[(fmt, name)] = {'ok': 0, 'empty': 0, 'failures': 0, 'latency': QuantileSketch()}
+            stats[outcome] += 1
+            stats['latency'].add(seconds * 1000)
+
+    def metrics(self):
+        """Per format and backend: outcome counts and latency (ms), plus the configured order"""
+        with self._lock:
+            report = {}
+            for fmt in self.order:
+                backends = {}
+                # Backends taken out of the order still report what they did while in it
+                registered = [name for backend_fmt, name in self.backends if backend_fmt == fmt]
+                for name in self.order[fmt] + [name for name in registered if name not in self.order[fmt]]:
+                    stats = self._stats.get((fmt, name))
+                    entry = {'available': name in self.available(fmt)}
+                    if stats is not None:
+                        latency = stats['latency']
+                        p50, p95 = latency.quantiles([0.5, 0.95])
+                        entry.update({
+                            'ok': stats['ok'],
+                            'empty': stats['empty'],
+                            'failures': stats['failures'],
+                            'mean_ms': round(latency.total / latency.count, 3),
+                            'p50_ms': round(p50, 3),
+                            'p95_ms': round(p95, 3),
+                            'max_ms': round(latency.max, 3)
+                        })
+                    backends[name] = entry
+                report[fmt] = {'order': self.order[fmt], 'backends': backends}
+            return report
@@ -0,0 +1,57 @@
+import gzip
+import hashlib
+import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def content_version(*parts):
+    """Short, stable digest of JSON-serialisable data such as a catalogue"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def request_etag(payload, version):
+    """ETag for a deterministic endpoint: its canonical JSON input plus the version of the data behind it.
+
+    Key order and whitespace in the request do not change the tag, so
+    equivalent requests from different clients revalidate against each other.
+    """
+    return content_version(payload, version)
+
+
+def supported_encodings():
+    return ('zstd', 'gzip') if zstandard is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding):
+    """Best encoding the client accepts (zstd when the zstandard package is installed, else gzip)"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding, level=None):
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level or 3).compress(data)
+    if encoding == 'gzip':
+        # Level 6 is most of the ratio of level 9 at a fraction of the CPU
+        return gzip.compress(data, compresslevel=level or 6, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
@@ -0,0 +1,130 @@
+import csv
+import json
+import os
+import re
+import threading
+import zlib
+import numpy as np
+
+INTENTS = ['recommendations', 'skills_gap', 'learning_resources', 'market_insights']
+# Returned for empty messages and when no intent is likely enough: small talk
+# such as "hello" otherwise lands on whichever class the intercept favours
+GENERAL_INTENT = 'general'
+MIN_CONFIDENCE = 0.7
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+DATA_PATH = os.path.join(os.path.dirname(MODEL_DIR), 'data', 'intent_training_data.csv')
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#./']+")
+
+class IntentClassifier:
+    """Hashed unigram/bigram features scored by a linear model.
+
+    Row ``n_features`` of the weight matrix holds the intercept, so every
+    message gets at least one active feature and batches can be scored with a
+    single ``np.add.reduceat`` over the gathered weight rows. Below
+    ``min_confidence`` the intent is GENERAL_INTENT; ``scores`` still has
+    every class's probability.
+    """
+
+    def __init__(self, weights, labels, n_features, min_confidence=MIN_CONFIDENCE):
+        self.weights = weights
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR):
+        with open(os.path.join(model_dir, 'intent_classifier.json')) as f:
+            meta = json.load(f)
+        # Memory-mapped read-only so forked and sibling workers share the same pages
+        weights = np.load(os.path.join(model_dir, 'intent_classifier.npy'), mmap_mode='r')
+        return cls(weights, meta['labels'], meta['n_features'])
+
+    def save(self, model_dir=MODEL_DIR):
+        os.makedirs(model_dir, exist_ok=True)
+        np.save(os.path.join(model_dir, 'intent_classifier.npy'), np.ascontiguousarray(self.weights, dtype=np.float32))
+        with open(os.path.join(model_dir, 'intent_classifier.json'), 'w') as f:
+            json.dump({'labels': self.labels, 'n_features': self.n_features}, f, indent=2)
+
+    def features(self, text):
+        return hashed_features(text, self.n_features)
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts):
+        indices = []
+        offsets = []
+        empty = []
+        for text in texts:
+            offsets.append(len(indices))
+            features = self.features(text)
+            empty.append(not features)
+            indices.extend(features)
+            indices.append(self.n_features)
+
+        scores = np.add.reduceat(self.weights[indices], offsets, axis=0)
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+
+        return [
+            {
+                'intent': GENERAL_INTENT if is_empty or row[label] < self.min_confidence else self.labels[label],
+                'confidence': round(float(row[label]), 3),
+                'scores': {name: round(float(score), 3) for name, score in zip(self.labels, row)}
+            }
+            for label, row, is_empty in zip(best, probabilities, empty)
+        ]
+
+
+def hashed_features(text, n_features):
+    """Bucket indices for the unigrams and bigrams of a message"""
+    tokens = _TOKEN_PATTERN.findall(str(text or '').lower())
+    grams = tokens + [first + ' ' + second for first, second in zip(tokens, tokens[1:])]
+    return [zlib.crc32(gram.encode('utf-8')) % n_features for gram in grams]
+
+
+def train_intent_classifier(data_path=DATA_PATH, n_features=2 ** 13):
+    """Fit a multinomial logistic regression on the labelled intent file"""
+    from scipy.sparse import csr_matrix
+    from sklearn.linear_model import LogisticRegression
+
+    with open(data_path, newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.DictReader(f) if row['intent'] in INTENTS]
+
+    indptr = [0]
+    indices = []
+    for row in rows:
+        indices.extend(hashed_features(row['text'], n_features))
+        indptr.append(len(indices))
+    features = csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr),
+        shape=(len(rows), n_features)
+    )
+    labels = [row['intent'] for row in rows]
+
+    model = LogisticRegression(C=10.0, max_iter=1000)
+    model.fit(features, labels)
+
+    weights = np.vstack([model.coef_.T, model.intercept_]).astype(np.float32)
+    return IntentClassifier(weights, model.classes_.tolist(), n_features)
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def get_intent_classifier():
+    """Process-wide classifier, loaded on first use and trained in place if no artifact exists"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                try:
+                    _classifier = IntentClassifier.load()
+                except FileNotFoundError:
+                    print("Intent model not found, training from data/intent_training_data.csv")
+                    _classifier = train_intent_classifier()
+    return _classifier
@@ -0,0 +1,221 @@
+import io
+import time
+from datetime import datetime
+import numpy as np
+from .candidate_index import EXPERIENCE_LEVEL_YEARS, SkillVectorStore, top_k_rows
+from .market_stats import _iter_jsonl, _posting_skills
+
+# Fields of the backend Job model kept for rendering feed entries
+POSTING_FIELDS = ('title', 'company', 'location', 'type', 'experience', 'salaryMin', 'salaryMax')
+
+class JobIndex(SkillVectorStore):
+    """Open job postings ranked for a user's skill profile.
+
+    Next to the skill matrix the index keeps an inverted list of rows per
+    skill column, so a query only scores postings that share a skill with the
+    user. Expiry is a tombstone: the row is marked dead and recycled, while
+    stale entries stay in the inverted lists until enough of them pile up to
+    make compacting those lists worthwhile.
+    """
+
+    WEIGHTS = {'skills': 0.8, 'experience': 0.2}
+
+    def __init__(self, vocabulary=(), capacity=1024):
+        super().__init__(vocabulary, capacity)
+        self.deadlines = np.full(capacity, np.inf)
+        self.skill_counts = np.zeros(capacity, dtype=np.float32)
+        self.level_years = np.zeros(capacity, dtype=np.float32)
+        self.postings = {}
+        self.inverted = {}
+        self._stale = 0
+        self._entries = 0
+
+    def _on_grow(self, capacity):
+        self.deadlines = np.concatenate([self.deadlines, np.full(capacity - len(self.deadlines), np.inf)])
+        self.skill_counts = np.concatenate([self.skill_counts, np.zeros(capacity - len(self.skill_counts), dtype=np.float32)])
+        self.level_years = np.concatenate([self.level_years, np.zeros(capacity - len(self.level_years), dtype=np.float32)])
+
+    def add_posting(self, posting):
+        """Insert or replace a posting; closed, expired or private ones are removed instead"""
+        if not isinstance(posting, dict):
+            return False
+        job_id = str(posting.get('id') or '')
+        if not job_id:
+            return False
+        if posting.get('isExpired') or posting.get('status', 'active') != 'active' \
+                or posting.get('visibility', 'public') != 'public':
+            self.expire(job_id)
+            return False
+
+        skills = _posting_skills(posting)
+        with self.lock:
+            if job_id in self.rows:
+                self._stale += int(self.skill_counts[self.rows[job_id]])
+            row = self.upsert(job_id, skills)
+            columns = np.flatnonzero(self.skills[row, :len(self.skill_names)])
+            for column in columns:
+                self._append_posting(column, row)
+            self._entries += len(columns)
+            self.skill_counts[row] = len(columns)
+            self.level_years[row] = EXPERIENCE_LEVEL_YEARS.get(posting.get('experience'), 0)
+            self.deadlines[row] = _deadline(posting.get('applicationDeadline'))
+            self.postings[job_id] = {field: posting.get(field) for field in POSTING_FIELDS}
+            self._maybe_compact()
+            return True
+
+    def expire(self, job_id):
+        """Tombstone a posting without touching the inverted lists"""
+        with self.lock:
+            row = self.rows.get(job_id)
+            if row is None:
+                return False
+            self._stale += int(self.skill_counts[row])
+            self.skill_counts[row] = 0
+            self.deadlines[row] = np.inf
+            self.postings.pop(job_id, None)
+            self.delete(job_id)
+            self._maybe_compact()
+            return True
+
+    def pop_record(self, job_id):
+        """Remove a posting and return it in the form add_posting accepts"""
+        with self.lock:
+            row = self.rows[job_id]
+            deadline = float(self.deadlines[row])
+            record = dict(
+                self.postings[job_id],
+                id=job_id,
+                skills=self.row_skills(row),
+                applicationDeadline=deadline if np.isfinite(deadline) else None
+            )
+            self.expire(job_id)
+            return record
+
+    def add_record(self, record):
+        return self.add_posting(record)
+
+    def expire_before(self, now=None):
+        """Tombstone every posting whose applicationDeadline has passed, like markExpiredJobs"""
+        now = time.time() if now is None else now
+        with self.lock:
+            rows = np.flatnonzero(self.alive[:self._size] & (self.deadlines[:self._size] < now))
+            for row in rows:
+                self.expire(self.ids[row])
+            return len(rows)
+
+    def _append_posting(self, column, row):
+        """Append to a column's row list, kept as a numpy array grown by doubling"""
+        rows, length = self.inverted.get(column, (None, 0))
+        if rows is None or length == len(rows):
+            grown = np.zeros(max(16, length * 2), dtype=np.int64)
+            if rows is not None:
+                grown[:length] = rows
+            rows = grown
+        rows[length] = row
+        self.inverted[column] = (rows, length + 1)
+
+    def _posting_rows(self, column):
+        rows, length = self.inverted[column]
+        return rows[:length]
+
+    def _maybe_compact(self):
+        if self._stale * 2 > self._entries:
+            self._compact()
+
+    def _compact(self):
+        """Drop inverted-list entries that no longer match their row"""
+        entries = 0
+        for column in list(self.inverted):
+            rows = np.unique(self._posting_rows(column))
+            rows = rows[self.skills[rows, column] > 0]
+            if len(rows):
+                self.inverted[column] = (rows, len(rows))
+                entries += len(rows)
+            else:
+                del self.inverted[column]
+        self._entries = entries
+        self._stale = 0
+
+    def ingest_stream(self, stream):
+        """Load a JSONL postings snapshot line by line; returns (indexed, skipped)"""
+        if isinstance(stream, (bytes, bytearray)):
+            stream = io.BytesIO(stream)
+        if not isinstance(stream, io.TextIOBase):
+            stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+        indexed = skipped = 0
+        for posting in _iter_jsonl(stream):
+            if posting is not None and self.add_posting(posting):
+                indexed += 1
+            else:
+                skipped += 1
+        return indexed, skipped
+
+    def ingest_file(self, path):
+        with open(path, 'rb') as f:
+            return self.ingest_stream(f)
+
+    def recommend(self, skills, experience_years=0, top_k=20, offset=0, now=None):
+        """Best open postings for a skill profile; ``offset`` pages through the feed"""
+        skills = [skill.strip().lower() for skill in skills or [] if skill and skill.strip()]
+        now = time.time() if now is None else now
+
+        with self.lock:
+            # Vocabulary columns the user covers, then every row listing one of them.
+            # When those lists cover a large share of the index a dense scan is cheaper.
+            covered = self.query_columns(skills).any(axis=1)
+            columns = [column for column in np.flatnonzero(covered) if column in self.inverted]
+            if not columns:
+                return []
+            if sum(self.inverted[column][1] for column in columns) * 4 > self._size:
+                rows = np.arange(self._size)
+                hits = self.skills[:self._size] @ covered.astype(np.float32)
+            else:
+                rows = np.unique(np.concatenate([self._posting_rows(column) for column in columns]))
+                hits = self.skills[rows[:, None], columns].sum(axis=1)
+            open_rows = self.alive[rows] & (self.deadlines[rows] >= now)
+
+            coverage = hits / np.maximum(self.skill_counts[rows], 1)
+            level_years = self.level_years[rows]
+            experience_fit = np.where(
+                level_years > 0,
+                np.minimum(float(experience_years or 0) / np.maximum(level_years, 1), 1),
+                1
+            )
+            scores = (coverage * self.WEIGHTS['skills'] + experience_fit * self.WEIGHTS['experience']) * 100
+            scores[(hits == 0) | ~open_rows] = -np.inf
+
+            ranked = top_k_rows(scores, min(offset + top_k, int(np.isfinite(scores).sum())))[offset:]
+            results = []
+            for position in ranked:
+                row = rows[position]
+                job_skills = self.row_skills(row)
+                results.append({
+                    'job_id': self.ids[row],
+                    **self.postings[self.ids[row]],
+                    'score': round(float(scores[position]), 1),
+                    'skill_coverage': round(float(coverage[position]) * 100, 1),
+                    'matched_skills': [skill for skill in job_skills if covered[self.vocabulary[skill]]],
+                    'missing_skills': [skill for skill in job_skills if not covered[self.vocabulary[skill]]]
+                })
+            return results
+
+    def stats(self):
+        return {
+            'open_postings': len(self),
+            'skills': len(self.skill_names),
+            'inverted_entries': self._entries,
+            'stale_entries': self._stale
+        }
+
+
+def _deadline(value):
+    """Epoch seconds of an ISO applicationDeadline (or epoch number); inf when absent"""
+    if value in (None, ''):
+        return np.inf
+    if isinstance(value, (int, float)):
+        return float(value) / 1000 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return np.inf
@@ -0,0 +1,398 @@
+import csv
+import io
+import json
+import math
+import re
+import threading
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch (DDSketch style) with a fixed relative error.
+
+    Every value lands in bucket ceil(log(v) / log(gamma)), so the sketch is a
+    sparse histogram whose size depends only on the value range and the
+    accuracy, never on the number of values. Two sketches with the same
+    accuracy merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        value = float(value)
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantiles(self, qs):
+        """Values at the requested quantiles, computed in one pass over the sorted buckets"""
+        if not self.count:
+            return [None for _ in qs]
+
+        ranks = sorted((q * (self.count - 1), index) for index, q in enumerate(qs))
+        results = [None] * len(qs)
+        seen = self.zero_count
+        keys = iter(sorted(self.buckets))
+        value = 0.0
+        for rank, index in ranks:
+            while seen <= rank:
+                key = next(keys)
+                seen += self.buckets[key]
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in the relative-error sense
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+            results[index] = min(max(value, self.min), self.max)
+        return results
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'buckets': {str(key): count for key, count in self.buckets.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'])
+        sketch.buckets = {int(key): count for key, count in data['buckets'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+
+class HeavyHitters:
+    """Space-Saving top-k counter: at most ``capacity`` tracked items.
+
+    Counts are overestimates by at most the smallest tracked count, which is
+    plenty to rank "most requested skills". Merging adds counts and keeps the
+    ``capacity`` largest, the usual mergeable-summary construction.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, item, count=1):
+        if item in self.counts or len(self.counts) < self.capacity:
+            self.counts[item] = self.counts.get(item, 0) + count
+            return
+        smallest = min(self.counts, key=self.counts.get)
+        self.counts[item] = self.counts.pop(smallest) + count
+
+    def merge(self, other):
+        merged = dict(self.counts)
+        for item, count in other.counts.items():
+            merged[item] = merged.get(item, 0) + count
+        self.counts = dict(sorted(merged.items(), key=lambda pair: pair[1], reverse=True)[:self.capacity])
+        return self
+
+    def top(self, n):
+        return sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)[:n]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'counts': self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        hitters = cls(data['capacity'])
+        hitters.counts = dict(data['counts'])
+        return hitters
+
+
+class RoleStats:
+    """Per-role rollup: posting count, salary sketch and heavy-hitter counters"""
+
+    def __init__(self):
+        self.postings = 0
+        self.salaries = QuantileSketch()
+        self.skills = HeavyHitters()
+        self.companies = HeavyHitters()
+        self.locations = HeavyHitters()
+        self.experience_levels = {}
+
+    def add(self, posting):
+        self.postings += 1
+
+        salary = _posting_salary(posting)
+        if salary is not None:
+            self.salaries.add(salary)
+
+        for skill in _posting_skills(posting):
+            self.skills.add(skill)
+
+        company = (posting.get('company') or '').strip()
+        if company:
+            self.companies.add(company)
+
+        location = (posting.get('location') or '').strip()
+        if location:
+            self.locations.add(location)
+
+        level = posting.get('experience')
+        if level:
+            self.experience_levels[level] = self.experience_levels.get(level, 0) + 1
+
+    def merge(self, other):
+        self.postings += other.postings
+        self.salaries.merge(other.salaries)
+        self.skills.merge(other.skills)
+        self.companies.merge(other.companies)
+        self.locations.merge(other.locations)
+        for level, count in other.experience_levels.items():
+            self.experience_levels[level] = self.experience_levels.get(level, 0) + count
+        return self
+
+    def to_dict(self):
+        return {
+            'postings': self.postings,
+            'salaries': self.salaries.to_dict(),
+            'skills': self.skills.to_dict(),
+            'companies': self.companies.to_dict(),
+            'locations': self.locations.to_dict(),
+            'experience_levels': self.experience_levels
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.postings = data['postings']
+        stats.salaries = QuantileSketch.from_dict(data['salaries'])
+        stats.skills = HeavyHitters.from_dict(data['skills'])
+        stats.companies = HeavyHitters.from_dict(data['companies'])
+        stats.locations = HeavyHitters.from_dict(data['locations'])
+        stats.experience_levels = dict(data['experience_levels'])
+        return stats
+
+
+class JobMarketStats:
+    """Incrementally maintained job-market rollups keyed by catalogue role.
+
+    Postings are folded in one at a time (``add_posting`` / ``ingest_stream``),
+    so an export of any size is consumed in constant memory per role. Query
+    results are materialised once per role after each change and served from
+    that summary afterwards.
+    """
+
+    def __init__(self):
+        self.roles = {}
+        self.total_postings = 0
+        self._summaries = {}
+        self._lock = threading.Lock()
+
+    def add_posting(self, posting):
+        role = classify_role(posting.get('title', ''))
+        with self._lock:
+            self.roles.setdefault(role, RoleStats()).add(posting)
+            self.total_postings += 1
+            self._summaries.clear()
+        return role
+
+    def ingest_stream(self, stream, fmt='jsonl'):
+        """Consume a CSV or JSONL export line by line; returns (ingested, skipped)"""
+        if isinstance(stream, (bytes, bytearray)):
+            stream = io.BytesIO(stream)
+        if not isinstance(stream, io.TextIOBase):
+            stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace', newline='')
+
+        ingested = skipped = 0
+        records = csv.DictReader(stream) if fmt == 'csv' else _iter_jsonl(stream)
+        for posting in records:
+            if posting is None or not posting.get('title') or not _well_formed(posting):
+                skipped += 1
+                continue
+            self.add_posting(posting)
+            ingested += 1
+        return ingested, skipped
+
+    def ingest_file(self, path):
+        fmt = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        with open(path, 'rb') as f:
+            return self.ingest_stream(f, fmt)
+
+    def merge(self, other):
+        with self._lock:
+            for role, stats in other.roles.items():
+                if role in self.roles:
+                    self.roles[role].merge(stats)
+                else:
+                    self.roles[role] = RoleStats.from_dict(stats.to_dict())
+            self.total_postings += other.total_postings
+            self._summaries.clear()
+        return self
+
+    def has_role(self, role):
+        return role in self.roles
+
+    def insights(self, role):
+        summary = self._summaries.get(role)
+        if summary is None and role in self.roles:
+            with self._lock:
+                summary = self._summarize(role)
+                self._summaries[role] = summary
+        return summary
+
+    def _summarize(self, role):
+        stats = self.roles[role]
+        p25, p50, p75, p90 = stats.salaries.quantiles([0.25, 0.5, 0.75, 0.9])
+        average_share = self.total_postings / max(len(self.roles), 1)
+
+        return {
+            'role': role,
+            'postings': stats.postings,
+            'demand': _demand_label(stats.postings / average_share if average_share else 0),
+            'avg_salary': _format_salary(stats.salaries.mean()),
+            'salary_percentiles': {
+                'p25': _round_salary(p25),
+                'p50': _round_salary(p50),
+                'p75': _round_salary(p75),
+                'p90': _round_salary(p90)
+            },
+            'top_skills': [skill for skill, _ in stats.skills.top(5)],
+            'companies_hiring': [company for company, _ in stats.companies.top(4)],
+            'top_locations': [location for location, _ in stats.locations.top(3)],
+            'experience_levels': dict(stats.experience_levels),
+            'source': 'job_postings'
+        }
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'total_postings': self.total_postings,
+                'roles': {role: stats.to_dict() for role, stats in self.roles.items()}
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        market = cls()
+        market.total_postings = data['total_postings']
+        market.roles = {role: RoleStats.from_dict(stats) for role, stats in data['roles'].items()}
+        return market
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# Title patterns mapped to the CareerRecommender catalogue, most specific first
+ROLE_PATTERNS = [
+    (re.compile(r'data\s*scien|machine\s*learning|\bml\b'), 'Data Scientist'),
+    (re.compile(r'devops|site\s*reliability|\bsre\b|platform\s*engineer|cloud\s*engineer'), 'DevOps Engineer'),
+    (re.compile(r'secur|penetration|\bsoc\b'), 'Cybersecurity Specialist'),
+    (re.compile(r'front[\s-]*end|\bui\s*developer|react\s*developer'), 'Frontend Developer'),
+    (re.compile(r'back[\s-]*end|\bapi\s*developer'), 'Backend Developer'),
+    (re.compile(r'mobile|\bios\b|android|flutter'), 'Mobile Developer'),
+    (re.compile(r'\bux\b|\bui\b|product\s*design|designer'), 'UX/UI Designer'),
+    (re.compile(r'product\s*(manager|owner)'), 'Product Manager'),
+    (re.compile(r'business\s*analyst|data\s*analyst|analyst'), 'Business Analyst'),
+    (re.compile(r'software|developer|engineer|programmer|full[\s-]*stack'), 'Software Engineer')
+]
+
+def classify_role(title):
+    title = str(title or '').lower()
+    for pattern, role in ROLE_PATTERNS:
+        if pattern.search(title):
+            return role
+    return 'Other'
+
+
+def _iter_jsonl(stream):
+    """One posting dict per non-blank line; None for a line that is not a JSON object"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+def _well_formed(posting):
+    """Whether the fields RoleStats counts are strings (skills: a string or a list of strings)"""
+    for key in ('company', 'location', 'experience'):
+        if posting.get(key) is not None and not isinstance(posting[key], str):
+            return False
+    skills = posting.get('skills')
+    if skills is None or isinstance(skills, str):
+        return True
+    return isinstance(skills, list) and all(skill is None or isinstance(skill, str) for skill in skills)
+
+
+def _posting_salary(posting):
+    values = []
+    for keys in (('salaryMin', 'salary_min'), ('salaryMax', 'salary_max')):
+        for key in keys:
+            value = posting.get(key)
+            if value not in (None, ''):
+                try:
+                    values.append(float(value))
+                except (TypeError, ValueError):
+                    pass
+                break
+    return sum(values) / len(values) if values else None
+
+
+def _posting_skills(posting):
+    skills = posting.get('skills') or []
+    if isinstance(skills, str):
+        skills = re.split(r'[;,|]', skills.strip('{}[]'))
+    return {skill.strip().strip('"\'').lower() for skill in skills if skill and skill.strip()}
+
+
+def _demand_label(share_ratio):
+    if share_ratio >= 1.5:
+        return 'Very High'
+    elif share_ratio >= 1:
+        return 'High'
+    elif share_ratio >= 0.5:
+        return 'Moderate'
+    return 'Low'
+
+
+def _round_salary(value):
+    return int(round(value, -2)) if value is not None else None
+
+
+def _format_salary(value):
+    return f"${_round_salary(value):,}" if value is not None else None
@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+PROFILE_MODES = ('sample', 'cprofile')
+_PROFILE_ID = re.compile(r'^[\w-]+$')
+
+def frame_label(frame):
+    # The current line rather than the function's first, so two regexes in one function stay apart
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Sampling profiler for one thread: a background thread records its stack every ``interval`` seconds.
+
+    The profiled thread runs unmodified; the cost is one stack walk per
+    sample, paid by the sampler. Stacks are kept in the collapsed format
+    (``root;...;leaf count`` per line) read by flamegraph.pl, speedscope and
+    similar tools.
+    """
+
+    extension = '.collapsed'
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class DeterministicProfiler:
+    """cProfile over the calling thread: exact call counts and times, at a cost on every call.
+
+    Writes a pstats file (``python -m pstats``, snakeviz) rather than stacks,
+    since cProfile only records caller/callee pairs.
+    """
+
+    extension = '.prof'
+
+    def __init__(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.samples = None
+
+    def start(self):
+        self.profile.enable()
+        return self
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+def start_profiler(mode='sample', interval=0.005):
+    """Profile the calling thread from now until the returned profiler's stop()"""
+    if mode == 'cprofile':
+        return DeterministicProfiler().start()
+    return StackSampler(interval=interval).start()
+
+
+class ProfileStore:
+    """Recent profiles in a directory shared by the workers of a host: ``<id>.json`` metadata next to the profile file.
+
+    Only the ``keep`` newest profiles are kept.
+    """
+
+    def __init__(self, directory, keep=100):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.keep = keep
+
+    def new_id(self):
+        # Sorts by time, to the millisecond, across workers
+        now = time.time()
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(now)) + f"{int(now * 1000) % 1000:03d}"
+        return f"{stamp}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id, profiler, metadata):
+        filename = profile_id + profiler.extension
+        profiler.write(os.path.join(self.directory, filename))
+        metadata = dict(metadata, id=profile_id, file=filename, samples=profiler.samples)
+        temporary = os.path.join(self.directory, f"{profile_id}.json.tmp")
+        with open(temporary, 'w') as f:
+            json.dump(metadata, f)
+        os.replace(temporary, os.path.join(self.directory, profile_id + '.json'))
+        self.prune()
+        return metadata
+
+    def _metadata_files(self):
+        names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        return sorted(names, reverse=True)
+
+    def list(self, limit=50):
+        """Metadata of the newest profiles first"""
+        profiles = []
+        for name in self._metadata_files()[:limit]:
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, profile_id):
+        """Path of a stored profile's file, or None for an unknown or malformed id"""
+        if not _PROFILE_ID.match(profile_id or ''):
+            return None
+        for extension in (StackSampler.extension, DeterministicProfiler.extension):
+            path = os.path.join(self.directory, profile_id + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def prune(self):
+        for name in self._metadata_files()[self.keep:]:
+            profile_id = name[:-len('.json')]
+            for path in (os.path.join(self.directory, name), self.path(profile_id)):
+                try:
+                    if path:
+                        os.remove(path)
+                except OSError:
+                    pass
@@ -1,13 +1,39 @@
-import PyPDF2
-import docx
+import hashlib
 import re
-import io
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .cache import LRUCache
+from .candidate_index import skills_match
+from .extractors import ExtractorRegistry
+from .http_cache import content_version
+from .resume_dedup import ResumeDeduplicator
+from .resume_sections import section_text, segment_sections
+from .uploads import open_upload
+
+# How analyze treats a near-duplicate of the same applicant's earlier upload; 'off' is the default
+DUPLICATE_MODES = ('off', 'reuse', 'diff')
+
+# Sections each extractor reads when the resume has them (see resume_sections.section_text)
+EXPERIENCE_CLAIM_SECTIONS = ('header', 'summary', 'experience')
+EMPLOYMENT_SECTIONS = ('experience',)
+EDUCATION_SECTIONS = ('education',)
+KEYWORD_SECTIONS = ('header', 'summary', 'experience', 'projects')
+
+def text_digest(text):
+    """sha256 of a resume's text with whitespace collapsed, to tell unchanged re-uploads apart"""
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()
+
 
 class ResumeAnalyzer:
-    def __init__(self):
+    def __init__(self, deduplicator=None, snapshot=None, max_upload_bytes=None, extractors=None):
+        self.max_upload_bytes = max_upload_bytes
+        self.extractors = extractors or ExtractorRegistry()
         self.job_requirements = self._initialize_job_requirements()
         self.skill_patterns = self._initialize_skill_patterns()
+        self.deduplicator = deduplicator or ResumeDeduplicator()
+        self.analysis_cache = LRUCache(maxsize=4096)
+        self._initialize_batch_terms(snapshot)
     
     def _initialize_job_requirements(self):
         return {
@@ -67,41 +93,74 @@ class ResumeAnalyzer:
             'devops': ['jenkins', 'gitlab', 'ansible', 'prometheus', 'grafana', 'linux']
         }
     
-    def extract_text_from_pdf(self, file_stream):
-        text = ""
-        try:
-            pdf_reader = PyPDF2.PdfReader(file_stream)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        except Exception as e:
-            raise Exception(f"Error reading PDF: {str(e)}")
-        return text
+    def catalogue_fingerprint(self):
+        return content_version(self.job_requirements, self.skill_patterns)
     
-    def extract_text_from_docx(self, file_stream):
-        text = ""
-        try:
-            doc = docx.Document(file_stream)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-        except Exception as e:
-            raise Exception(f"Error reading DOCX: {str(e)}")
-        return text
+    def snapshot_tables(self):
+        """Metadata and arrays of the batch matcher, as written by train_models.py into the snapshot"""
+        skill_terms = list(dict.fromkeys(skill.lower() for skills in self.skill_patterns.values() for skill in skills))
+        experience_terms = list(dict.fromkeys(
+            keyword for requirements in self.job_requirements.values() for keyword in requirements['experience_keywords']
+        ))
+        roles = {}
+        rows = {'required_skills': [], 'preferred_skills': [], 'experience_keywords': []}
+        for job_role, requirements in self.job_requirements.items():
+            roles[job_role] = {}
+            for kind, kind_rows in rows.items():
+                start = len(kind_rows)
+                if kind == 'experience_keywords':
+                    kind_rows.extend(experience_terms.index(keyword) for keyword in requirements[kind])
+                else:
+                    # A requirement is met by any extracted skill it matches under the substring rule
+                    kind_rows.extend(
+                        [skills_match(skill.lower(), term) for term in skill_terms] for skill in requirements[kind]
+                    )
+                roles[job_role][kind] = [start, len(kind_rows)]
+        metadata = {
+            'fingerprint': self.catalogue_fingerprint(),
+            'skill_terms': skill_terms,
+            'experience_terms': experience_terms,
+            'roles': roles
+        }
+        arrays = {
+            'resume_required_masks': np.array(rows['required_skills'], dtype=np.float32).reshape(-1, len(skill_terms)),
+            'resume_preferred_masks': np.array(rows['preferred_skills'], dtype=np.float32).reshape(-1, len(skill_terms)),
+            'resume_keyword_columns': np.array(rows['experience_keywords'], dtype=np.int64)
+        }
+        return metadata, arrays
     
-    def extract_text(self, file):
-        filename = file.filename.lower()
-        
-        # Handle text files for testing
-        if filename.endswith('.txt'):
-            return file.read().decode('utf-8')
-        
-        file_stream = io.BytesIO(file.read())
-        
-        if filename.endswith('.pdf'):
-            return self.extract_text_from_pdf(file_stream)
-        elif filename.endswith('.docx'):
-            return self.extract_text_from_docx(file_stream)
+    def _initialize_batch_terms(self, snapshot=None):
+        """Columns of the batch keyword-count matrix and each role's requirements as masks over them.
+        
+        Read from a prebuilt snapshot (memory-mapped) when one matches this
+        catalogue, otherwise derived here.
+        """
+        metadata = snapshot.section('resume_analyzer', self.catalogue_fingerprint()) if snapshot else None
+        if metadata is None:
+            metadata, arrays = self.snapshot_tables()
         else:
-            raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
+            arrays = {name: snapshot.array(name) for name in
+                      ('resume_required_masks', 'resume_preferred_masks', 'resume_keyword_columns')}
+        
+        self.skill_terms = metadata['skill_terms']
+        self.experience_terms = metadata['experience_terms']
+        self._skill_columns = {skill: column for column, skill in enumerate(self.skill_terms)}
+        self._term_patterns = [re.compile(r'\b' + re.escape(skill) + r'\b') for skill in self.skill_terms]
+        sources = {
+            'required_skills': arrays['resume_required_masks'],
+            'preferred_skills': arrays['resume_preferred_masks'],
+            'experience_keywords': arrays['resume_keyword_columns']
+        }
+        self._role_masks = {
+            job_role: {kind: sources[kind][start:end] for kind, (start, end) in kinds.items()}
+            for job_role, kinds in metadata['roles'].items()
+        }
+    
+    def extract_text(self, file):
+        # The upload's own spooled stream where there is one, so the parsers read it without a copy
+        file_stream = open_upload(file, self.max_upload_bytes)
+        text, _, _ = self.extractors.extract(file_stream, file.filename)
+        return text
     
     def extract_skills(self, text):
         text_lower = text.lower()
@@ -123,7 +182,14 @@ class ResumeAnalyzer:
         
         return list(set(found_skills)), skill_categories
     
-    def extract_experience(self, text):
+    def extract_experience(self, text, sections=None):
+        if sections is None:
+            sections = segment_sections(text)
+        # "N years of experience" claims come from the summary and experience; dated
+        # positions only from the experience section, so degree years are not counted
+        claims = section_text(text, sections, EXPERIENCE_CLAIM_SECTIONS, otherwise_exclude=EDUCATION_SECTIONS)
+        employment = section_text(text, sections, EMPLOYMENT_SECTIONS, otherwise_exclude=EDUCATION_SECTIONS)
+        
         # Extract years of experience using multiple methods
         experience_patterns = [
             r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
@@ -134,19 +200,20 @@ class ResumeAnalyzer:
         ]
         
         years = []
+        claims_lower = claims.lower()
         for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
+            matches = re.findall(pattern, claims_lower)
             years.extend([int(match) for match in matches])
         
         # Extract date ranges and calculate experience
-        date_ranges = self._extract_date_ranges(text)
+        date_ranges = self._extract_date_ranges(employment)
         if date_ranges:
             calculated_years = self._calculate_total_experience(date_ranges)
             if calculated_years > 0:
                 years.append(calculated_years)
         
         # Extract employment periods
-        employment_years = self._extract_employment_periods(text)
+        employment_years = self._extract_employment_periods(employment)
         if employment_years:
             years.extend(employment_years)
         
@@ -217,7 +284,10 @@ class ResumeAnalyzer:
         
         return years
     
-    def extract_education(self, text):
+    def extract_education(self, text, sections=None):
+        if sections is None:
+            sections = segment_sections(text)
+        text = section_text(text, sections, EDUCATION_SECTIONS)
         education_patterns = [
             r'\b(?:bachelor|b\.?s\.?|b\.?a\.?)\s*(?:of|in|degree)?\s*([a-zA-Z\s]+)',
             r'\b(?:master|m\.?s\.?|m\.?a\.?|mba)\s*(?:of|in|degree)?\s*([a-zA-Z\s]+)',
@@ -277,17 +347,7 @@ class ResumeAnalyzer:
         experience_score = min(experience_years * 20, 100)  # 20 points per year, max 100
         
         # Education score
-        education_score = 0
-        for edu in education:
-            for keyword in job_req['education_keywords']:
-                if keyword in edu.lower():
-                    education_score = 100
-                    break
-            if education_score > 0:
-                break
-        
-        if not education_score and education:
-            education_score = 50  # Some education but not directly relevant
+        education_score = self._education_score(job_req, education)
         
         # Experience keywords score
         keyword_score = 0
@@ -317,6 +377,16 @@ class ResumeAnalyzer:
             'keyword_score': round(keyword_score, 1)
         }
     
+    def _education_score(self, job_req, education):
+        for edu in education:
+            for keyword in job_req['education_keywords']:
+                if keyword in edu.lower():
+                    return 100
+        
+        if education:
+            return 50  # Some education but not directly relevant
+        return 0
+    
     def _default_analysis(self, extracted_skills, experience_years):
         # Default analysis for unknown job roles
         skill_score = min(len(extracted_skills) * 10, 100)
@@ -410,7 +480,21 @@ class ResumeAnalyzer:
         
         return suggestions
     
-    def analyze(self, file, job_role="Software Developer"):
+    def extract_features(self, file):
+        """Skills, experience and education of a resume without the job-match scoring"""
+        resume_text = self.extract_text(file)
+        if not resume_text.strip():
+            raise Exception("Could not extract text from the resume. Please ensure the file is not corrupted.")
+        
+        extracted_skills, _ = self.extract_skills(resume_text)
+        sections = segment_sections(resume_text)
+        return {
+            'extracted_skills': extracted_skills,
+            'experience_years': self.extract_experience(resume_text, sections),
+            'education': self.extract_education(resume_text, sections)
+        }
+    
+    def analyze(self, file, job_role="Software Developer", duplicates='off', applicant_id=None):
         try:
             # Extract text from resume
             resume_text = self.extract_text(file)
@@ -418,50 +502,306 @@ class ResumeAnalyzer:
             if not resume_text.strip():
                 raise Exception("Could not extract text from the resume. Please ensure the file is not corrupted.")
             
-            # Extract information
-            extracted_skills, skill_categories = self.extract_skills(resume_text)
-            experience_years = self.extract_experience(resume_text)
-            education = self.extract_education(resume_text)
-            organizations = self.extract_organizations(resume_text)
+            if duplicates == 'off':
+                return self._analyze_text(resume_text, job_role)
             
-            # Calculate job match
-            match_data = self.calculate_job_match(resume_text, job_role, extracted_skills, experience_years, education)
+            # The same applicant re-uploading unchanged text can skip the pipeline entirely
+            lookup = self._lookup_duplicate(resume_text, job_role, applicant_id)
             
-            # Generate recommendations
-            recommendations = self.generate_recommendations(match_data, extracted_skills, experience_years, education)
+            if self._reusable(lookup, duplicates):
+                analysis = lookup['prior']
+            else:
+                analysis = self._analyze_text(resume_text, job_role)
             
-            # Generate improvement suggestions
-            suggestions = self.generate_improvement_suggestions(match_data, job_role)
+            return self._record_analysis(
+                lookup, analysis, job_role, duplicates, applicant_id, getattr(file, 'filename', None)
+            )
             
-            # Determine overall rating
-            overall_rating = self._get_overall_rating(match_data['match_percentage'])
+        except Exception as e:
+            raise Exception(f"Resume analysis failed: {str(e)}")
+    
+    def analyze_batch(self, files, job_roles, duplicates='off', applicant_id=None, workers=None):
+        """Analyse many resumes in one call, each against its own job role.
+        
+        Text is extracted on a thread pool, then every document is scored
+        together from one keyword-count matrix. A file that fails gets an
+        ``error`` entry instead of an ``analysis``; the rest of the batch
+        is unaffected.
+        """
+        return list(self.iter_analyze_batch(files, job_roles, duplicates, applicant_id, workers))
+    
+    def iter_analyze_batch(self, files, job_roles, duplicates='off', applicant_id=None, workers=None, chunk_size=16):
+        """analyze_batch as a generator, ``chunk_size`` files at a time.
+        
+        At most one chunk of texts and results is held at once, and the next
+        chunk is only extracted when the consumer asks for more, so a slow
+        reader holds the work back instead of letting results pile up.
+        """
+        files = list(files)
+        job_roles = list(job_roles)
+        if not files:
+            return
+        with ThreadPoolExecutor(max_workers=workers or min(len(files), 8)) as pool:
+            for start in range(0, len(files), chunk_size):
+                yield from self._analyze_chunk(
+                    pool, files[start:start + chunk_size], job_roles[start:start + chunk_size], duplicates, applicant_id
+                )
+    
+    def _analyze_chunk(self, pool, files, job_roles, duplicates, applicant_id):
+        results = [
+            {'filename': getattr(file, 'filename', None), 'job_role': job_role}
+            for file, job_role in zip(files, job_roles)
+        ]
+        extracted = list(pool.map(self._extract_for_batch, files))
+        
+        texts = {}
+        lookups = {}
+        for position, (resume_text, error) in enumerate(extracted):
+            if error is not None:
+                results[position]['error'] = error
+                continue
+            texts[position] = resume_text
+            if duplicates != 'off':
+                lookups[position] = self._lookup_duplicate(resume_text, job_roles[position], applicant_id)
+        
+        # Resumes with a reusable earlier analysis are not scored again
+        to_score = [
+            position for position in texts
+            if not (position in lookups and self._reusable(lookups[position], duplicates))
+        ]
+        scored = dict(zip(to_score, self._analyze_texts(
+            [texts[position] for position in to_score], [job_roles[position] for position in to_score]
+        )))
+        
+        for position, resume_text in texts.items():
+            job_role = job_roles[position]
+            if duplicates == 'off':
+                results[position]['analysis'] = scored[position]
+                continue
+            # Looked up again so that duplicates within the batch are found too
+            lookup = self._lookup_duplicate(resume_text, job_role, applicant_id, lookups[position]['signature'])
+            if self._reusable(lookup, duplicates):
+                analysis = lookup['prior']
+            else:
+                analysis = scored.get(position) or self._analyze_text(resume_text, job_role)
+            results[position]['analysis'] = self._record_analysis(
+                lookup, analysis, job_role, duplicates, applicant_id, results[position]['filename']
+            )
+        return results
+    
+    def _extract_for_batch(self, file):
+        """(text, None) or (None, error message) for one file of a batch"""
+        try:
+            resume_text = self.extract_text(file)
+        except Exception as e:
+            return None, str(e)
+        if not resume_text.strip():
+            return None, "Could not extract text from the resume. Please ensure the file is not corrupted."
+        return resume_text, None
+    
+    def _lookup_duplicate(self, resume_text, job_role, applicant_id, signature=None):
+        """MinHash signature and text digest of an upload, plus the applicant's nearest earlier
+        upload and its cached analysis for this role.
+        
+        Only uploads with the same ``applicant_id`` are looked at, so one
+        applicant never sees another's analysis; anonymous uploads have none.
+        """
+        if signature is None:
+            signature = self.deduplicator.signature(resume_text)
+        lookup = {'signature': signature, 'digest': text_digest(resume_text), 'near': None, 'prior': None,
+                  'unchanged': False}
+        if applicant_id is None:
+            return lookup
+        lookup['near'] = self.deduplicator.query(signature=signature, applicant_id=applicant_id)
+        cached = self.analysis_cache.get((lookup['near'][0], job_role)) if lookup['near'] else None
+        if cached is not None:
+            lookup['prior'] = cached[1]
+            lookup['unchanged'] = cached[0] == lookup['digest']
+        return lookup
+    
+    def _reusable(self, lookup, duplicates):
+        # Only an unchanged text is answered from the earlier analysis: any edit may change the result
+        return duplicates == 'reuse' and lookup['prior'] is not None and lookup['unchanged']
+    
+    def _record_analysis(self, lookup, analysis, job_role, duplicates, applicant_id, filename):
+        """Index the upload for duplicate detection and attach the duplicate details"""
+        near, prior = lookup['near'], lookup['prior']
+        resume_id, _ = self.deduplicator.add(signature=lookup['signature'], applicant_id=applicant_id, filename=filename)
+        self.analysis_cache.set((resume_id, job_role), (lookup['digest'], analysis))
+        
+        result = dict(analysis, resume_id=resume_id)
+        if near:
+            result['duplicate'] = {
+                'resume_id': near[0],
+                'similarity': round(near[1], 3),
+                'reused': analysis is prior
+            }
+            if prior is not None and duplicates == 'diff':
+                result['duplicate']['changes'] = self._diff_analyses(prior, analysis)
+        return result
+    
+    def _diff_analyses(self, prior, current):
+        """What changed between two analyses of near-identical resumes"""
+        # extracted_skills is truncated, the category lists are complete
+        prior_skills = {skill for skills in prior['skill_categories'].values() for skill in skills}
+        current_skills = {skill for skills in current['skill_categories'].values() for skill in skills}
+        return {
+            'skills_added': sorted(current_skills - prior_skills),
+            'skills_removed': sorted(prior_skills - current_skills),
+            'experience_years': current['experience_years'] - prior['experience_years'],
+            'match_percentage': round(current['match_percentage'] - prior['match_percentage'], 1)
+        }
+    
+    def keyword_counts(self, texts, keyword_texts=None):
+        """(documents, skill terms + experience keywords) occurrence matrix, matched as the single-file path does.
+        
+        Experience keywords are counted in ``keyword_texts`` (the sections
+        calculate_job_match reads) when given, else in the full texts.
+        """
+        counts = np.zeros((len(texts), len(self.skill_terms) + len(self.experience_terms)), dtype=np.int32)
+        offset = len(self.skill_terms)
+        for row, text in enumerate(texts):
+            text_lower = text.lower()
+            for column, (term, pattern) in enumerate(zip(self.skill_terms, self._term_patterns)):
+                # A plain substring test rules most terms out before any regex runs
+                if term in text_lower:
+                    counts[row, column] = len(pattern.findall(text_lower))
+            keyword_lower = keyword_texts[row].lower() if keyword_texts is not None else text_lower
+            for column, keyword in enumerate(self.experience_terms):
+                counts[row, offset + column] = keyword_lower.count(keyword)
+        return counts
+    
+    def _analyze_texts(self, texts, job_roles):
+        """Batch form of _analyze_text: skills and role matches for all documents from one count matrix"""
+        if not texts:
+            return []
+        all_sections = [segment_sections(text) for text in texts]
+        keyword_texts = [section_text(text, sections, KEYWORD_SECTIONS) for text, sections in zip(texts, all_sections)]
+        present = self.keyword_counts(texts, keyword_texts) > 0
+        skills_present = present[:, :len(self.skill_terms)]
+        keywords_present = present[:, len(self.skill_terms):]
+        
+        # Per role, one product of the documents' skills with the requirement masks
+        role_hits = {}
+        for job_role in set(job_roles) & set(self._role_masks):
+            rows = np.array([row for row, role in enumerate(job_roles) if role == job_role])
+            masks = self._role_masks[job_role]
+            documents = skills_present[rows].astype(np.float32)
+            hits = {
+                'required_skills': documents @ masks['required_skills'].T > 0,
+                'preferred_skills': documents @ masks['preferred_skills'].T > 0,
+                'experience_keywords': keywords_present[rows][:, masks['experience_keywords']]
+            }
+            for position, row in enumerate(rows.tolist()):
+                role_hits[row] = {kind: matrix[position] for kind, matrix in hits.items()}
+        
+        analyses = []
+        for row, (resume_text, job_role, sections) in enumerate(zip(texts, job_roles, all_sections)):
+            found_skills = []
+            skill_categories = {}
+            for category, skills in self.skill_patterns.items():
+                category_skills = [skill for skill in skills if skills_present[row, self._skill_columns[skill.lower()]]]
+                found_skills.extend(category_skills)
+                if category_skills:
+                    skill_categories[category.title()] = category_skills
+            extracted_skills = list(set(found_skills))
+            experience_years = self.extract_experience(resume_text, sections)
+            education = self.extract_education(resume_text, sections)
             
-            return {
-                'match_percentage': match_data['match_percentage'],
-                'skill_match': match_data['skill_match'],
-                'similarity_score': match_data['match_percentage'] / 100,
-                'extracted_skills': extracted_skills[:10],
-                'skill_categories': skill_categories,
-                'organizations': organizations,
-                'education': education,
-                'experience_years': experience_years,
-                'required_skill_matches': match_data['required_skill_matches'],
-                'missing_required_skills': match_data['missing_required_skills'],
-                'preferred_skill_matches': match_data['preferred_skill_matches'],
-                'missing_preferred_skills': match_data['missing_preferred_skills'],
-                'recommendations': recommendations,
-                'suggestions': suggestions,
+            if row in role_hits:
+                match_data = self._match_from_hits(job_role, role_hits[row], experience_years, education)
+            else:
+                match_data = self._default_analysis(extracted_skills, experience_years)
+            analyses.append(self._compose_analysis(
+                resume_text, sections, job_role, extracted_skills, skill_categories, experience_years, education, match_data
+            ))
+        return analyses
+    
+    def _match_from_hits(self, job_role, hits, experience_years, education):
+        """calculate_job_match from precomputed requirement hits"""
+        job_req = self.job_requirements[job_role]
+        required = hits['required_skills']
+        preferred = hits['preferred_skills']
+        
+        required_score = int(required.sum()) / len(job_req['required_skills']) * 100
+        preferred_score = int(preferred.sum()) / len(job_req['preferred_skills']) * 100
+        overall_skill_score = (required_score * 0.7) + (preferred_score * 0.3)
+        experience_score = min(experience_years * 20, 100)
+        education_score = self._education_score(job_req, education)
+        keyword_score = min(int(hits['experience_keywords'].sum()) * 20, 100)
+        
+        overall_match = (
+            overall_skill_score * 0.4 +
+            experience_score * 0.25 +
+            education_score * 0.2 +
+            keyword_score * 0.15
+        )
+        
+        return {
+            'match_percentage': round(overall_match, 1),
+            'skill_match': round(overall_skill_score, 1),
+            'required_skill_matches': [skill for skill, hit in zip(job_req['required_skills'], required) if hit],
+            'missing_required_skills': [skill for skill, hit in zip(job_req['required_skills'], required) if not hit][:5],
+            'preferred_skill_matches': [skill for skill, hit in zip(job_req['preferred_skills'], preferred) if hit],
+            'missing_preferred_skills': [skill for skill, hit in zip(job_req['preferred_skills'], preferred) if not hit][:5],
+            'experience_score': round(experience_score, 1),
+            'education_score': round(education_score, 1),
+            'keyword_score': round(keyword_score, 1)
+        }
+    
+    def _analyze_text(self, resume_text, job_role):
+        # Split into sections once; each extractor then reads only the sections it needs
+        sections = segment_sections(resume_text)
+        
+        # Extract information
+        extracted_skills, skill_categories = self.extract_skills(resume_text)
+        experience_years = self.extract_experience(resume_text, sections)
+        education = self.extract_education(resume_text, sections)
+        
+        # Calculate job match (experience keywords only count where work is described)
+        keyword_text = section_text(resume_text, sections, KEYWORD_SECTIONS)
+        match_data = self.calculate_job_match(keyword_text, job_role, extracted_skills, experience_years, education)
+        
+        return self._compose_analysis(
+            resume_text, sections, job_role, extracted_skills, skill_categories, experience_years, education, match_data
+        )
+    
+    def _compose_analysis(self, resume_text, sections, job_role, extracted_skills, skill_categories, experience_years, education, match_data):
+        organizations = self.extract_organizations(resume_text)
+        
+        # Generate recommendations
+        recommendations = self.generate_recommendations(match_data, extracted_skills, experience_years, education)
+        
+        # Generate improvement suggestions
+        suggestions = self.generate_improvement_suggestions(match_data, job_role)
+        
+        # Determine overall rating
+        overall_rating = self._get_overall_rating(match_data['match_percentage'])
+        
+        return {
+            'match_percentage': match_data['match_percentage'],
+            'skill_match': match_data['skill_match'],
+            'similarity_score': match_data['match_percentage'] / 100,
+            'extracted_skills': extracted_skills[:10],
+            'skill_categories': skill_categories,
+            'organizations': organizations,
+            'education': education,
+            'experience_years': experience_years,
+            'required_skill_matches': match_data['required_skill_matches'],
+            'missing_required_skills': match_data['missing_required_skills'],
+            'preferred_skill_matches': match_data['preferred_skill_matches'],
+            'missing_preferred_skills': match_data['missing_preferred_skills'],
+            'recommendations': recommendations,
+            'suggestions': suggestions,
+            'overall_rating': overall_rating,
+            'sections': sections,
+            'analysis_summary': {
+                'skill_match': f"{match_data['skill_match']:.1f}%",
+                'experience_level': self._format_experience_level(experience_years),
                 'overall_rating': overall_rating,
-                'analysis_summary': {
-                    'skill_match': f"{match_data['skill_match']:.1f}%",
-                    'experience_level': self._format_experience_level(experience_years),
-                    'overall_rating': overall_rating,
-                    'recommendation': "Apply with confidence" if match_data['match_percentage'] >= 70 else "Improve skills before applying"
-                }
+                'recommendation': "Apply with confidence" if match_data['match_percentage'] >= 70 else "Improve skills before applying"
             }
-            
-        except Exception as e:
-            raise Exception(f"Resume analysis failed: {str(e)}")
+        }
     
     def _get_overall_rating(self, match_percentage):
         if match_percentage >= 80:
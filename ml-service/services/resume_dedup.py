@@ -0,0 +1,144 @@
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+_WORD_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+# Largest prime below 2^32: with 32-bit operands a * x + b stays inside uint64
+_MERSENNE_PRIME = np.uint64(4294967291)
+
+def shingles(text, size=5):
+    """crc32 hashes of the overlapping ``size``-word windows of normalised text"""
+    words = _WORD_PATTERN.findall(str(text or '').lower())
+    size = max(min(size, len(words)), 1)
+    return np.unique(np.fromiter(
+        (zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)),
+        dtype=np.uint64
+    ))
+
+
+class ResumeDeduplicator:
+    """MinHash signatures with LSH banding for near-duplicate resume text.
+
+    A signature is ``num_perm`` minimum hash values over the text's word
+    shingles, and the fraction of equal positions between two signatures
+    estimates their Jaccard similarity. Signatures are cut into ``bands``
+    bands; two resumes become candidates when any band is identical, so a
+    lookup is a handful of dict probes instead of a scan. Near-duplicates
+    are also joined into clusters as they are added.
+    """
+
+    def __init__(self, num_perm=128, bands=32, threshold=0.8, maxsize=50000, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.maxsize = maxsize
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, int(_MERSENNE_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self._b = generator.randint(0, int(_MERSENNE_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self.signatures = OrderedDict()
+        self.metadata = {}
+        self.buckets = [{} for _ in range(bands)]
+        self._cluster_of = {}
+        self._clusters = {}
+        self._next_cluster = 0
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def signature(self, text):
+        hashes = shingles(text) % _MERSENNE_PRIME
+        if not len(hashes):
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        return ((self._a * hashes + self._b) % _MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def query(self, text=None, signature=None, exclude=None, applicant_id=None):
+        """Best earlier resume at or above the threshold, as (resume_id, similarity), else None.
+        
+        With ``applicant_id``, only that applicant's earlier uploads are considered.
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self.buckets[band].get(key, ()))
+            best = None
+            candidates.discard(exclude)
+            if applicant_id is not None:
+                candidates = {resume_id for resume_id in candidates
+                              if self.metadata[resume_id].get('applicant_id') == applicant_id}
+            # Earliest upload first, so ties go to the original rather than to set order
+            for resume_id in sorted(candidates, key=lambda rid: (self.metadata[rid]['added_at'], rid)):
+                similarity = float(np.mean(self.signatures[resume_id] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (resume_id, similarity)
+            return best
+
+    def add(self, text=None, signature=None, resume_id=None, **metadata):
+        """Index a resume and return (resume_id, nearest earlier duplicate or None)"""
+        if signature is None:
+            signature = self.signature(text)
+        duplicate = self.query(signature=signature, exclude=resume_id)
+        with self._lock:
+            if resume_id is None:
+                self._counter += 1
+                resume_id = f"resume-{self._counter}"
+            if resume_id in self.signatures:
+                self._remove(resume_id)
+            self.signatures[resume_id] = signature
+            self.metadata[resume_id] = dict(metadata, added_at=time.time())
+            for band, key in enumerate(self._band_keys(signature)):
+                self.buckets[band].setdefault(key, set()).add(resume_id)
+            if duplicate is not None and duplicate[0] in self._cluster_of:
+                cluster = self._cluster_of[duplicate[0]]
+            else:
+                self._next_cluster += 1
+                cluster = self._next_cluster
+                self._clusters[cluster] = set()
+            self._clusters[cluster].add(resume_id)
+            self._cluster_of[resume_id] = cluster
+            while len(self.signatures) > self.maxsize:
+                self._remove(next(iter(self.signatures)))
+            return resume_id, duplicate
+
+    def _remove(self, resume_id):
+        signature = self.signatures.pop(resume_id)
+        self.metadata.pop(resume_id, None)
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(resume_id)
+                if not bucket:
+                    del self.buckets[band][key]
+        cluster = self._cluster_of.pop(resume_id)
+        self._clusters[cluster].discard(resume_id)
+        if not self._clusters[cluster]:
+            del self._clusters[cluster]
+
+    def clusters(self, min_size=2):
+        """Groups of near-duplicate resumes, largest first"""
+        with self._lock:
+            return sorted(
+                (
+                    {
+                        'cluster_id': cluster,
+                        'size': len(members),
+                        'resumes': [dict(self.metadata[member], resume_id=member) for member in sorted(members)]
+                    }
+                    for cluster, members in self._clusters.items() if len(members) >= min_size
+                ),
+                key=lambda cluster: cluster['size'],
+                reverse=True
+            )
+
+    def __len__(self):
+        return len(self.signatures)
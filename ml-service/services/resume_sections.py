@@ -0,0 +1,69 @@
+import re
+
+# Section name -> headings that open it (matched case-insensitively, alone on a line or followed by a colon)
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'career summary', 'profile', 'professional profile',
+                'about me', 'objective', 'career objective'],
+    'experience': ['experience', 'work experience', 'professional experience', 'relevant experience',
+                   'employment', 'employment history', 'work history', 'career history'],
+    'education': ['education', 'academic background', 'academic qualifications', 'qualifications',
+                  'education and training'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'core competencies', 'skills and abilities'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications', 'courses'],
+    'awards': ['awards', 'honors', 'achievements', 'honors and awards'],
+    'publications': ['publications'],
+    'languages': ['languages'],
+    'interests': ['interests', 'hobbies', 'hobbies and interests'],
+    'volunteering': ['volunteering', 'volunteer experience'],
+}
+
+_HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+def _heading_pattern():
+    # Longest first, so "work experience" is not read as "experience" preceded by junk
+    alternatives = sorted(_HEADING_SECTION, key=len, reverse=True)
+    escaped = [re.escape(heading).replace(r'\ and\ ', r'\s+(?:and|&)\s+').replace(r'\ ', r'\s+') for heading in alternatives]
+    # Optional bullet or markdown marker before the heading; a colon (content may follow) or end of line after it
+    return re.compile(r'^[ \t]*(?:[#*•\-]+[ \t]*)?(' + '|'.join(escaped) + r')[ \t]*(?::[ \t]*|$)', re.I | re.M)
+
+HEADING_PATTERN = _heading_pattern()
+
+def segment_sections(text):
+    """Split a resume into sections in one pass over its headings.
+
+    Returns ``{'section', 'heading', 'start', 'end'}`` dicts in document
+    order, with character offsets of each section's body in ``text``. Text
+    before the first heading (name, contact details, often an untitled
+    summary) is the 'header' section; a resume without recognised headings
+    is all header.
+    """
+    sections = []
+    previous = None
+    for match in HEADING_PATTERN.finditer(text):
+        if previous is None:
+            if text[:match.start()].strip():
+                sections.append({'section': 'header', 'heading': None, 'start': 0, 'end': match.start()})
+        else:
+            previous['end'] = match.start()
+        heading = ' '.join(match.group(1).split())
+        previous = {'section': _HEADING_SECTION[heading.lower().replace('&', 'and')], 'heading': heading,
+                    'start': match.end(), 'end': len(text)}
+        sections.append(previous)
+    if previous is None and text.strip():
+        sections.append({'section': 'header', 'heading': None, 'start': 0, 'end': len(text)})
+    return sections
+
+
+def section_text(text, sections, names, otherwise_exclude=()):
+    """Bodies of the ``names`` sections joined by newlines.
+
+    When the resume has none of them, every section except those in
+    ``otherwise_exclude`` is used instead, so an unstructured resume is still
+    scanned in full.
+    """
+    spans = [text[section['start']:section['end']] for section in sections if section['section'] in names]
+    if not spans:
+        spans = [text[section['start']:section['end']] for section in sections
+                 if section['section'] not in otherwise_exclude]
+    return '\n'.join(spans)
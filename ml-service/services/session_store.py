@@ -0,0 +1,99 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from .cache import LRUCache
+
+class SessionStore:
+    """TTL-evicting session store with an optional SQLite write-through backing.
+
+    In memory the store holds whatever the caller puts in it (live objects with
+    locks and partial scores). Only the JSON-serialisable snapshot returned by
+    ``serialize`` is written to SQLite, so a session evicted from memory or
+    created by another worker can be rebuilt with ``deserialize``. Each row
+    carries a version bumped on every save; a worker's in-memory copy is only
+    used while it matches the row, so a turn saved by another worker is read
+    back rather than overwritten.
+    """
+
+    def __init__(self, ttl=1800, maxsize=10000, sqlite_path=None, serialize=None, deserialize=None):
+        self.ttl = ttl
+        # session_id -> (session, version of the row it was read from or saved as)
+        self.sessions = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.sqlite_path = sqlite_path
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+        if sqlite_path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS chatbot_sessions ('
+                    'session_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL, '
+                    'version INTEGER NOT NULL DEFAULT 0)'
+                )
+                columns = [row[1] for row in conn.execute('PRAGMA table_info(chatbot_sessions)')]
+                if 'version' not in columns:
+                    conn.execute('ALTER TABLE chatbot_sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+
+    def _connect(self):
+        return sqlite3.connect(self.sqlite_path, timeout=5)
+
+    def get(self, session_id):
+        cached = self.sessions.get(session_id)
+        if not self.sqlite_path:
+            return cached[0] if cached is not None else None
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                'SELECT state, version FROM chatbot_sessions WHERE session_id = ? AND updated_at > ?',
+                (session_id, time.time() - self.ttl)
+            ).fetchone()
+        if row is None:
+            # Created here and not saved yet, or cleared or expired since
+            return cached[0] if cached is not None and cached[1] is None else None
+        if cached is not None and cached[1] == row[1]:
+            return cached[0]
+
+        session = self.deserialize(json.loads(row[0]))
+        self.sessions.set(session_id, (session, row[1]))
+        return session
+
+    def get_or_create(self, session_id, factory):
+        with self._lock:
+            session = self.get(session_id)
+            if session is None:
+                session = factory()
+                self.sessions.set(session_id, (session, None))
+            return session
+
+    def save(self, session_id, session):
+        if not self.sqlite_path:
+            self.sessions.set(session_id, (session, None))
+            return
+
+        now = time.time()
+        state = json.dumps(self.serialize(session))
+        with closing(self._connect()) as conn, conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT version FROM chatbot_sessions WHERE session_id = ?', (session_id,)).fetchone()
+            version = (row[0] if row else 0) + 1
+            conn.execute(
+                'INSERT OR REPLACE INTO chatbot_sessions (session_id, state, updated_at, version) VALUES (?, ?, ?, ?)',
+                (session_id, state, now, version)
+            )
+            if now - self._last_purge > self.ttl:
+                conn.execute('DELETE FROM chatbot_sessions WHERE updated_at <= ?', (now - self.ttl,))
+                self._last_purge = now
+        self.sessions.set(session_id, (session, version))
+
+    def delete(self, session_id):
+        existed = self.sessions.pop(session_id) is not None
+        if self.sqlite_path:
+            with closing(self._connect()) as conn, conn:
+                existed = conn.execute(
+                    'DELETE FROM chatbot_sessions WHERE session_id = ?', (session_id,)
+                ).rowcount > 0 or existed
+        return existed
@@ -0,0 +1,341 @@
+import heapq
+import io
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+from itertools import islice
+from .candidate_index import CandidateIndex
+from .job_index import JobIndex
+from .market_stats import _iter_jsonl
+
+def jump_hash(key, buckets):
+    """Jump consistent hash of a string id onto ``buckets`` shards.
+
+    Growing from n to n + 1 shards moves only ~1/(n + 1) of the keys, all of
+    them onto the new shard, so a resize is a partial migration rather than a
+    full reshuffle.
+    """
+    key = zlib.crc32(str(key).encode('utf-8'))
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def shard_path(path, shard, n_shards):
+    return path if n_shards == 1 else f"{path}.{shard}-of-{n_shards}"
+
+
+def _shard_worker(conn, factory, args):
+    """Serve one index partition over a pipe until told to stop"""
+    index = factory(*args)
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            break
+        try:
+            if command == 'call':
+                method, call_args, call_kwargs = payload
+                result = getattr(index, method)(*call_args, **call_kwargs)
+            elif command == 'map':
+                method, items = payload
+                result = [getattr(index, method)(item) for item in items]
+            elif command == 'rebalance':
+                # Hand back every item that now hashes to another shard
+                shard, n_shards = payload
+                result = [
+                    index.pop_record(item_id) for item_id in list(index.rows)
+                    if jump_hash(item_id, n_shards) != shard
+                ]
+            elif command == 'stop':
+                conn.send(('ok', None))
+                break
+            else:
+                raise ValueError(f"Unknown shard command: {command}")
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+
+class _Shard:
+    def __init__(self, factory, args):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_shard_worker, args=(child_conn, factory, args), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.lock = threading.Lock()
+
+
+class _ReadWriteLock:
+    """Many concurrent queries, or one resize"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writing = True
+
+    def release_write(self):
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+
+
+class ShardedIndex:
+    """Coordinator for an index partitioned across local worker processes.
+
+    Items are placed by ``jump_hash(id, n_shards)``. Writes go to the owning
+    shard, queries are sent to every shard before any reply is read so the
+    shards work in parallel, and the per-shard top-k lists (already sorted by
+    score) are merged with a heap.
+    """
+
+    def __init__(self, factory, n_shards, args=(), loaders=None):
+        self.factory = factory
+        self.args = args
+        self._rw_lock = _ReadWriteLock()
+        # ``loaders`` optionally gives a (factory, args) pair per initial shard,
+        # e.g. to reopen saved partitions; shards added later use ``factory``
+        self.shards = [_Shard(*loader) for loader in loaders] if loaders \
+            else [_Shard(factory, args) for _ in range(n_shards)]
+
+    @property
+    def n_shards(self):
+        return len(self.shards)
+
+    def _exchange(self, requests):
+        """Send (shard, command, payload) requests, then collect the replies in order"""
+        pending = []
+        try:
+            for shard, command, payload in requests:
+                shard.lock.acquire()
+                pending.append(shard)
+                shard.conn.send((command, payload))
+            replies = [shard.conn.recv() for shard in pending]
+        finally:
+            for shard in pending:
+                shard.lock.release()
+
+        results = []
+        for status, result in replies:
+            if status == 'error':
+                raise RuntimeError(f"Shard request failed: {result}")
+            results.append(result)
+        return results
+
+    def _read(self, requests):
+        self._rw_lock.acquire_read()
+        try:
+            return self._exchange(requests)
+        finally:
+            self._rw_lock.release_read()
+
+    def route(self, item_id, method, *args, **kwargs):
+        shard = self.shards[jump_hash(item_id, self.n_shards)]
+        return self._read([(shard, 'call', (method, args, kwargs))])[0]
+
+    def route_many(self, method, items, key):
+        """Apply ``method`` to each item on its owning shard; results in input order"""
+        self._rw_lock.acquire_read()
+        try:
+            return self._route_many(method, items, key)
+        finally:
+            self._rw_lock.release_read()
+
+    def _route_many(self, method, items, key):
+        groups = {}
+        for position, item in enumerate(items):
+            groups.setdefault(jump_hash(key(item), self.n_shards), []).append(position)
+        requests = [
+            (self.shards[shard], 'map', (method, [items[position] for position in positions]))
+            for shard, positions in groups.items()
+        ]
+        results = [None] * len(items)
+        for positions, shard_results in zip(groups.values(), self._exchange(requests)):
+            for position, result in zip(positions, shard_results):
+                results[position] = result
+        return results
+
+    def broadcast(self, method, *args, **kwargs):
+        return self._read([(shard, 'call', (method, args, kwargs)) for shard in self.shards])
+
+    def merge_top_k(self, method, top_k, offset=0, **kwargs):
+        """Global top-k from each shard's own top (offset + k), merged best first"""
+        per_shard = self.broadcast(method, top_k=offset + top_k, **kwargs)
+        merged = heapq.merge(*per_shard, key=lambda result: -result['score'])
+        return list(islice(merged, offset, offset + top_k))
+
+    def resize(self, n_shards):
+        """Change the shard count, moving only the items whose owner changes"""
+        if n_shards < 1:
+            raise ValueError("A sharded index needs at least one shard")
+        self._rw_lock.acquire_write()
+        try:
+            old_count = self.n_shards
+            if n_shards == old_count:
+                return 0
+            shards = self.shards + [_Shard(self.factory, self.args) for _ in range(n_shards - old_count)]
+            moved = [
+                record
+                for records in self._exchange([
+                    (shard, 'rebalance', (position, n_shards))
+                    for position, shard in enumerate(self.shards)
+                ])
+                for record in records
+            ]
+            # Shards beyond the new count were drained completely above
+            self._stop(shards[n_shards:])
+            self.shards = shards[:n_shards]
+            self._route_many('add_record', moved, key=lambda record: record['id'])
+            return len(moved)
+        finally:
+            self._rw_lock.release_write()
+
+    def save(self, path):
+        """Write one file per shard plus a small manifest naming the shard count"""
+        self._read([
+            (shard, 'call', ('save', (shard_path(path, position, self.n_shards),), {}))
+            for position, shard in enumerate(self.shards)
+        ])
+        with open(path + '.shards', 'w') as f:
+            json.dump({'n_shards': self.n_shards}, f)
+
+    def close(self):
+        self._rw_lock.acquire_write()
+        try:
+            self._stop(self.shards)
+            self.shards = []
+        finally:
+            self._rw_lock.release_write()
+
+    def _stop(self, shards):
+        for shard in shards:
+            shard.conn.send(('stop', None))
+            shard.conn.recv()
+            shard.process.join(timeout=5)
+
+    def __len__(self):
+        return sum(self.broadcast('__len__'))
+
+
+class ShardedCandidateIndex(ShardedIndex):
+    """CandidateIndex interface over N shard processes"""
+
+    def __init__(self, vocabulary=(), n_shards=2, path=None):
+        vocabulary = list(vocabulary)
+        saved_shards = _saved_shard_count(path)
+        loaders = [
+            (CandidateIndex.load, (shard_path(path, shard, saved_shards),))
+            for shard in range(saved_shards)
+        ]
+        # A saved layout is reopened as-is and then migrated to the requested count
+        super().__init__(CandidateIndex, n_shards, (vocabulary,), loaders)
+        self.resize(n_shards)
+
+    def add(self, candidate_id, skills, experience_years=0, education=None):
+        return self.route(candidate_id, 'add', candidate_id, skills, experience_years, education)
+
+    def add_analysis(self, candidate_id, analysis):
+        return self.route(candidate_id, 'add_analysis', candidate_id, analysis)
+
+    def delete(self, candidate_id):
+        return self.route(candidate_id, 'delete', candidate_id)
+
+    def search(self, required_skills, preferred_skills=(), top_k=20, **filters):
+        return self.merge_top_k(
+            'search', top_k,
+            required_skills=required_skills, preferred_skills=preferred_skills, **filters
+        )
+
+
+class ShardedJobIndex(ShardedIndex):
+    """JobIndex interface over N shard processes"""
+
+    def __init__(self, vocabulary=(), n_shards=2):
+        super().__init__(JobIndex, n_shards, (list(vocabulary),))
+
+    def add_posting(self, posting):
+        if not isinstance(posting, dict):
+            return False
+        job_id = str(posting.get('id') or '')
+        if not job_id:
+            return False
+        return self.route(job_id, 'add_posting', posting)
+
+    def ingest_stream(self, stream, batch_size=1000):
+        """Parse a JSONL snapshot here and index it on the shards in batches"""
+        if isinstance(stream, (bytes, bytearray)):
+            stream = io.BytesIO(stream)
+        if not isinstance(stream, io.TextIOBase):
+            stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+        indexed = skipped = 0
+        batch = []
+        for posting in _iter_jsonl(stream):
+            if posting is None or not posting.get('id'):
+                skipped += 1
+                continue
+            batch.append(posting)
+            if len(batch) == batch_size:
+                added = sum(self.route_many('add_posting', batch, key=lambda p: str(p['id'])))
+                indexed, skipped = indexed + added, skipped + len(batch) - added
+                batch = []
+        if batch:
+            added = sum(self.route_many('add_posting', batch, key=lambda p: str(p['id'])))
+            indexed, skipped = indexed + added, skipped + len(batch) - added
+        return indexed, skipped
+
+    def ingest_file(self, path):
+        with open(path, 'rb') as f:
+            return self.ingest_stream(f)
+
+    def expire(self, job_id):
+        return self.route(job_id, 'expire', job_id)
+
+    def expire_before(self, now=None):
+        return sum(self.broadcast('expire_before', now))
+
+    def recommend(self, skills, experience_years=0, top_k=20, offset=0, now=None):
+        return self.merge_top_k(
+            'recommend', top_k, offset,
+            skills=skills, experience_years=experience_years, now=now
+        )
+
+    def stats(self):
+        totals = {}
+        for shard_stats in self.broadcast('stats'):
+            for key, value in shard_stats.items():
+                totals[key] = max(totals.get(key, 0), value) if key == 'skills' else totals.get(key, 0) + value
+        return dict(totals, shards=self.n_shards)
+
+
+def _saved_shard_count(path):
+    if not path:
+        return 0
+    if os.path.exists(path + '.shards'):
+        with open(path + '.shards') as f:
+            return json.load(f)['n_shards']
+    # An unsharded CandidateIndex.save is a one-shard layout
+    return 1 if os.path.exists(path + '.json') else 0
+
@@ -0,0 +1,126 @@
+import json
+import sqlite3
+import threading
+import time
+from .cache import LRUCache
+
+class SharedCache:
+    """Two-tier cache: a per-process LRU in front of an SQLite (WAL) table shared by every worker on the host.
+
+    Entries carry a ``version`` (e.g. the catalogue fingerprint); a lookup
+    only matches its own version, so results computed from an older catalogue
+    are never served, and ``invalidate`` deletes them. The table is bounded
+    to ``maxsize`` rows by evicting the least recently used, with recency
+    refreshed at most once a minute per entry to keep reads from turning into
+    writes. Values must be JSON serialisable and are returned as shared,
+    read-only objects. Without ``path`` only the in-process tier is used.
+    """
+
+    TOUCH_INTERVAL = 60
+    PRUNE_EVERY = 256
+
+    def __init__(self, path=None, maxsize=10000, ttl=3600, local_size=1024):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.local = LRUCache(maxsize=local_size, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connections = threading.local()
+        if path:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS shared_cache ('
+                    'key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL, '
+                    'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+                )
+                conn.execute('CREATE INDEX IF NOT EXISTS shared_cache_accessed ON shared_cache (accessed_at)')
+
+    def _connection(self):
+        # One connection per thread; WAL lets every worker read while one writes
+        conn = getattr(self._connections, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._connections.conn = conn
+        return conn
+
+    def get(self, key, version):
+        value = self.local.get((key, version))
+        if value is not None:
+            self._count('hits')
+            return value
+        if not self.path:
+            self._count('misses')
+            return None
+
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT value, accessed_at FROM shared_cache WHERE key = ? AND version = ? AND expires_at > ?',
+            (key, version, now)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        if now - row[1] > self.TOUCH_INTERVAL:
+            with conn:
+                conn.execute('UPDATE shared_cache SET accessed_at = ? WHERE key = ?', (now, key))
+        value = json.loads(row[0])
+        self.local.set((key, version), value)
+        self._count('hits')
+        return value
+
+    def set(self, key, version, value):
+        self.local.set((key, version), value)
+        if not self.path:
+            return
+
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO shared_cache (key, version, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, version, json.dumps(value), now + self.ttl, now)
+            )
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Delete expired rows, then the least recently used beyond ``maxsize``"""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM shared_cache WHERE expires_at <= ?', (time.time(),))
+            excess = conn.execute('SELECT COUNT(*) FROM shared_cache').fetchone()[0] - self.maxsize
+            if excess > 0:
+                conn.execute(
+                    'DELETE FROM shared_cache WHERE key IN (SELECT key FROM shared_cache ORDER BY accessed_at LIMIT ?)',
+                    (excess,)
+                )
+
+    def invalidate(self, keep_version):
+        """Drop every entry not computed under ``keep_version``, e.g. after a catalogue reload"""
+        self.local.clear()
+        if not self.path:
+            return 0
+        conn = self._connection()
+        with conn:
+            return conn.execute('DELETE FROM shared_cache WHERE version != ?', (keep_version,)).rowcount
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        stats = {'hits': self.hits, 'misses': self.misses, 'local': self.local.stats(), 'shared': self.path is not None}
+        if self.path:
+            stats['size'] = self._connection().execute('SELECT COUNT(*) FROM shared_cache').fetchone()[0]
+            stats['maxsize'] = self.maxsize
+        return stats
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+class SingleFlightTimeout(Exception):
+    """Gave up waiting for another request's identical computation"""
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls within a process.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it runs wait for it and get the same result, or the same
+    exception. Nothing is cached: once the call returns, the next caller for
+    that key computes afresh.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.counts = {'leaders': 0, 'followers': 0, 'timeouts': 0}
+
+    def do(self, key, fn, timeout=None, on_wait=None):
+        """``fn()``, or the result of the identical call already in flight.
+
+        ``on_wait`` is called before a follower starts waiting, e.g. to give
+        back resources it will not need. A follower waiting longer than
+        ``timeout`` seconds raises SingleFlightTimeout; the leader itself is
+        never interrupted.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self.counts['leaders' if leader else 'followers'] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+            return call.result
+
+        if on_wait is not None:
+            on_wait()
+        if not call.event.wait(timeout):
+            with self._lock:
+                self.counts['timeouts'] += 1
+            raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for an identical request")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, in_flight=len(self._calls))
+
+
+class FileSingleFlight:
+    """Coalescing across the worker processes of one host, through lock files.
+
+    The caller holding ``<key>.lock`` (flock) computes and leaves the outcome in
+    ``<key>.json``. Callers from other processes block on the lock; when they
+    get it and find an outcome finished after they arrived, they return that
+    instead of computing. Results must be JSON serialisable, and an error
+    crosses processes as its message only.
+    """
+
+    def __init__(self, directory, poll_interval=0.005, max_age=300):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self._calls = 0
+
+    def do(self, key, fn, timeout=None):
+        import fcntl
+        arrived = time.time()
+        path = os.path.join(self.directory, key)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with open(path + '.lock', 'a+') as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for an identical request")
+                    time.sleep(self.poll_interval)
+            # Marks the lock file as in use for prune()
+            os.utime(path + '.lock')
+            try:
+                outcome = self._read(path + '.json')
+                if outcome is not None and outcome['finished_at'] >= arrived:
+                    if 'error' in outcome:
+                        raise Exception(outcome['error'])
+                    return outcome['result']
+                try:
+                    result = fn()
+                except Exception as e:
+                    self._write(path + '.json', {'error': str(e)})
+                    raise
+                self._write(path + '.json', {'result': result})
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                self._calls += 1
+                if self._calls % 100 == 0:
+                    self.prune()
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, outcome):
+        outcome['finished_at'] = time.time()
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(outcome, f)
+        os.replace(temporary, path)
+
+    def prune(self):
+        """Remove outcomes and lock files untouched for ``max_age`` seconds.
+
+        Unlinking a lock file another process is about to take can at worst
+        let two processes compute the same thing once; results stay correct.
+        """
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def request_key(*parts):
+    """Canonical key for a request: sha256 of its parts as sorted-key JSON"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
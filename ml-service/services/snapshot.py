@@ -0,0 +1,88 @@
+import json
+import os
+import time
+import numpy as np
+
+# Bumped whenever the layout of a section changes; older snapshots are ignored
+SNAPSHOT_FORMAT = 1
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'snapshot')
+
+class Snapshot:
+    """Read-only view of a snapshot directory: the JSON manifest plus memory-mapped arrays.
+
+    Arrays are opened with ``mmap_mode='r'``, so loading costs a page-table
+    mapping rather than a read, and every worker on the host shares the same
+    physical pages through the OS page cache.
+    """
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+        # Mapped up front so a rebuild unlinking these files later cannot affect this process
+        self._arrays = {
+            name: np.load(os.path.join(path, entry['file']), mmap_mode='r')
+            for name, entry in manifest['arrays'].items()
+        }
+
+    def section(self, name, fingerprint):
+        """A service's metadata, or None when the snapshot was built from different catalogues"""
+        section = self.manifest['sections'].get(name)
+        if section is None:
+            return None
+        if section['fingerprint'] != fingerprint:
+            print(f"[WARNING] Snapshot section '{name}' is stale, rebuilding it in process (run train_models.py)")
+            return None
+        return section
+
+    def array(self, name):
+        return self._arrays[name]
+
+
+def write_snapshot(sections, path=SNAPSHOT_DIR):
+    """Write ``{name: (metadata, {array_name: array})}`` sections as .npy files plus manifest.json.
+
+    Array files carry a per-build suffix and the manifest that names them is
+    renamed into place last, so a worker starting mid-build sees either the
+    whole old snapshot or the whole new one. Files of earlier builds are then
+    unlinked; workers that still map them keep their pages until they exit.
+    """
+    os.makedirs(path, exist_ok=True)
+    build = format(time.time_ns(), 'x')
+    manifest = {'format': SNAPSHOT_FORMAT, 'build': build, 'built_at': time.time(), 'sections': {}, 'arrays': {}}
+    for name, (metadata, arrays) in sections.items():
+        manifest['sections'][name] = metadata
+        for array_name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            filename = f"{array_name}-{build}.npy"
+            np.save(os.path.join(path, filename), array)
+            manifest['arrays'][array_name] = {'file': filename, 'shape': list(array.shape), 'dtype': str(array.dtype)}
+    temporary = os.path.join(path, '.manifest.json.tmp')
+    with open(temporary, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temporary, os.path.join(path, 'manifest.json'))
+
+    current = {entry['file'] for entry in manifest['arrays'].values()}
+    for filename in os.listdir(path):
+        if filename.endswith('.npy') and filename not in current:
+            os.remove(os.path.join(path, filename))
+    return manifest
+
+
+def load_snapshot(path=SNAPSHOT_DIR):
+    """The snapshot at ``path``, or None if it is missing or in an older format"""
+    # A second attempt covers a rebuild replacing the files between reading the manifest and mapping them
+    for attempt in range(2):
+        try:
+            with open(os.path.join(path, 'manifest.json')) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get('format') != SNAPSHOT_FORMAT:
+            print(f"[WARNING] Ignoring snapshot in {path}: format {manifest.get('format')}, expected {SNAPSHOT_FORMAT}")
+            return None
+        try:
+            return Snapshot(path, manifest)
+        except FileNotFoundError:
+            if attempt:
+                raise
@@ -0,0 +1,123 @@
+import hashlib
+import io
+import shutil
+import tempfile
+
+# Uploads are kept in memory up to this size, then moved to a temporary file
+SPOOL_BYTES = 1024 * 1024
+
+class UploadTooLarge(Exception):
+    """An upload, or a request's uploads together, went over the configured limit.
+
+    Not a ValueError on purpose: Werkzeug's form parser silently swallows
+    those, which would turn an oversize upload into an empty form.
+    """
+
+    def __init__(self, limit):
+        super().__init__(f"Upload exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+class UploadBudget:
+    """Bytes still allowed for all the uploads of one request"""
+
+    def __init__(self, max_bytes=None):
+        self.remaining = max_bytes
+        self.max_bytes = max_bytes
+
+    def spend(self, count):
+        if self.remaining is None:
+            return
+        self.remaining -= count
+        if self.remaining < 0:
+            raise UploadTooLarge(self.max_bytes)
+
+
+class SpooledUpload(tempfile.SpooledTemporaryFile):
+    """Upload buffer: memory up to ``spool_bytes``, a temporary file beyond.
+
+    Bytes are counted as the multipart parser writes them. A file that goes
+    over ``max_bytes`` is marked ``oversize`` and the rest of it is dropped
+    instead of stored, so one bad file in a batch can be reported on its own;
+    a request over its ``budget`` is refused outright.
+    """
+
+    def __init__(self, max_bytes=None, budget=None, spool_bytes=SPOOL_BYTES):
+        super().__init__(max_size=spool_bytes, mode='w+b')
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self.received = 0
+        self.oversize = False
+
+    def write(self, data):
+        self.received += len(data)
+        if self.budget is not None:
+            self.budget.spend(len(data))
+        if self.max_bytes is not None and self.received > self.max_bytes:
+            if not self.oversize:
+                self.oversize = True
+                self.seek(0)
+                self.truncate()
+            return len(data)
+        return super().write(data)
+
+
+class UploadedFile:
+    """The ``filename`` + ``read()`` interface ResumeAnalyzer.extract_text expects, over a seekable stream"""
+
+    def __init__(self, filename, stream):
+        self.filename = filename
+        self.stream = stream
+
+    def read(self):
+        self.stream.seek(0)
+        return self.stream.read()
+
+
+def detach_upload(file, spool_bytes=SPOOL_BYTES):
+    """Copy an upload into a buffer of its own that outlives the request's file handles"""
+    stream = getattr(file, 'stream', None)
+    copy = SpooledUpload(spool_bytes=spool_bytes)
+    if getattr(stream, 'oversize', False):
+        # Nothing worth copying; keep the mark so the file is reported, not analysed
+        copy.oversize = True
+        copy.max_bytes = stream.max_bytes
+    elif stream is not None and stream.seekable():
+        stream.seek(0)
+        shutil.copyfileobj(stream, copy)
+    else:
+        copy.write(file.read())
+    copy.seek(0)
+    return UploadedFile(file.filename, copy)
+
+
+def open_upload(file, max_bytes=None):
+    """Seekable binary stream over an upload for the document parsers.
+
+    An upload that already has a seekable stream (Flask's FileStorage,
+    UploadedFile) is handed over as is, rewound, without copying it. Anything
+    else only offering ``read()`` is read once into a BytesIO.
+    """
+    stream = getattr(file, 'stream', None)
+    if getattr(stream, 'oversize', False):
+        raise UploadTooLarge(stream.max_bytes)
+    if stream is not None and stream.seekable():
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+    else:
+        data = file.read()
+        size = len(data)
+        stream = io.BytesIO(data)
+    if max_bytes is not None and size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    return stream
+
+
+def upload_digest(file):
+    """sha256 of an upload's bytes, read in chunks from its stream and rewound afterwards"""
+    stream = open_upload(file)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
@@ -7,6 +7,10 @@ import os
 import sys
 from services.career_recommender import CareerRecommender
 from services.resume_analyzer import ResumeAnalyzer
+from services.intent_classifier import train_intent_classifier
+from services.market_stats import JobMarketStats
+from services.ann_index import ProfileEncoder
+from services.snapshot import SNAPSHOT_DIR, write_snapshot
 
 def train_career_model():
     """Train the career recommendation model"""
@@ -30,6 +34,54 @@ def train_resume_model():
         print(f"[ERROR] Error training resume model: {e}")
         return False
 
+def train_intent_model():
+    """Train the chatbot intent classifier"""
+    print("Training Chatbot Intent Classifier...")
+    try:
+        classifier = train_intent_classifier()
+        classifier.save()
+        print(f"[SUCCESS] Intent classifier trained on {len(classifier.labels)} intents!")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Error training intent classifier: {e}")
+        return False
+
+def build_market_stats():
+    """Build job-market sketches from a postings export, if one is available"""
+    candidates = [os.getenv('JOB_POSTINGS_PATH'), 'data/job_postings.jsonl', 'data/job_postings.csv']
+    postings_path = next((path for path in candidates if path and os.path.exists(path)), None)
+    if postings_path is None:
+        print("[SKIPPED] No job postings export found (set JOB_POSTINGS_PATH)")
+        return
+    
+    print(f"Building Job Market Statistics from {postings_path}...")
+    try:
+        market_stats = JobMarketStats()
+        ingested, skipped = market_stats.ingest_file(postings_path)
+        market_stats.save(os.getenv('JOB_MARKET_STATS_PATH', 'models/job_market_stats.json'))
+        print(f"[SUCCESS] Ingested {ingested} postings ({skipped} skipped) into {len(market_stats.roles)} roles")
+    except Exception as e:
+        print(f"[ERROR] Error building job market statistics: {e}")
+
+def build_snapshot():
+    """Precompute the matcher tables every worker would otherwise derive at boot"""
+    print("Building Service Snapshot...")
+    try:
+        analyzer = ResumeAnalyzer()
+        recommender = CareerRecommender()
+        encoder = ProfileEncoder([skill for skills in analyzer.skill_patterns.values() for skill in skills])
+        path = os.getenv('SNAPSHOT_PATH', SNAPSHOT_DIR)
+        manifest = write_snapshot({
+            'resume_analyzer': analyzer.snapshot_tables(),
+            'career_recommender': recommender.snapshot_tables(),
+            'profile_encoder': encoder.snapshot_tables()
+        }, path)
+        print(f"[SUCCESS] Wrote {len(manifest['arrays'])} memory-mappable arrays to {path}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Error building snapshot: {e}")
+        return False
+
 def main():
     """Main training function"""
     print("=== Aspiro ML Model Training ===")
@@ -38,7 +90,7 @@ def main():
     os.makedirs('models', exist_ok=True)
     
     success_count = 0
-    total_models = 2
+    total_models = 3
     
     # Train models
     if train_career_model():
@@ -47,6 +99,12 @@ def main():
     if train_resume_model():
         success_count += 1
     
+    if train_intent_model():
+        success_count += 1
+    
+    build_market_stats()
+    build_snapshot()
+    
     # Summary
     print(f"\n=== Training Complete ===")
     print(f"Successfully trained: {success_count}/{total_models} models")
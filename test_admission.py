@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the cost-aware admission scheduler
+"""
+
+import sys
+import os
+import io
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.admission import AdmissionRejected, AdmissionScheduler, CostModel, upload_pages
+
+def test_admission():
+    print("Testing Admission Scheduler...")
+    print("=" * 50)
+
+    # Costs: per-endpoint unit costs, adapted from measurements
+    model = CostModel({'analyze_resume': 40}, smoothing=0.5)
+    assert model.estimate('analyze_resume', 3) == 120
+    assert model.estimate('unknown_endpoint') == 10
+    model.observe('analyze_resume', 2, 160)
+    assert model.estimate('analyze_resume') == 60
+
+    pdf = io.BytesIO(b'%PDF-1.4\n1 0 obj << /Type /Pages /Count 3 >>\n'
+                     + b''.join(b'%d 0 obj << /Type /Page /Parent 1 0 R >>\n' % n for n in range(2, 5)))
+    pdf.seek(5)
+    assert upload_pages(pdf) == 3 and pdf.tell() == 5
+    assert upload_pages(io.BytesIO(b'x' * (120 * 1024))) == 3
+
+    scheduler = AdmissionScheduler(max_concurrent=2, fast_limit=2, slow_limit=1, slow_cost_ms=100, queue_timeout=5)
+    assert scheduler.lane_for(5) == 'fast' and scheduler.lane_for(500) == 'slow'
+
+    # One slow request runs; a second waits even though a shared slot is free
+    slow = scheduler.acquire(500)
+    order = []
+    def run(cost, name):
+        ticket = scheduler.acquire(cost)
+        order.append(name)
+        time.sleep(0.05)
+        scheduler.release(ticket)
+    waiting_slow = threading.Thread(target=run, args=(500, 'slow'))
+    waiting_slow.start()
+    time.sleep(0.05)
+    assert scheduler.stats()['lanes']['slow']['queued'] == 1
+
+    # Cheap requests are admitted straight away next to the running upload
+    fast = scheduler.acquire(5, timeout=0.5)
+    assert scheduler.stats()['lanes']['fast']['running'] == 1
+    scheduler.release(fast)
+
+    # With every shared slot busy, a cheap request queued after an upload still goes first
+    blocker = scheduler.acquire(5)
+    threads = [threading.Thread(target=run, args=(5, 'fast'))]
+    threads[0].start()
+    time.sleep(0.05)
+    scheduler.release(slow)
+    scheduler.release(blocker)
+    for thread in threads + [waiting_slow]:
+        thread.join()
+    print(f"Admission order: {order}")
+    assert order == ['fast', 'slow']
+
+    # Bounded queues and queue timeouts answer instead of piling up
+    tight = AdmissionScheduler(max_concurrent=1, slow_limit=1, slow_queue=0, queue_timeout=0.05)
+    held = tight.acquire(5)
+    for cost, message in ((500, 'queue is full'), (5, 'Timed out')):
+        try:
+            tight.acquire(cost)
+            assert False, "request was admitted past the limits"
+        except AdmissionRejected as e:
+            assert message in str(e) and e.retry_after > 0
+            print(f"Rejected: {e}")
+    tight.release(held, 'recommend_career')
+    stats = tight.stats()['lanes']
+    assert stats['slow']['rejected'] == 1 and stats['fast']['timed_out'] == 1 and stats['fast']['running'] == 0
+
+    print("\n" + "=" * 50)
+    print("Admission Scheduler Test Complete!")
+
+if __name__ == "__main__":
+    test_admission()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the approximate nearest-neighbour profile index
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.ann_index import ANNIndex, ProfileEncoder
+
+def test_ann_index():
+    print("Testing ANN Profile Index...")
+    print("=" * 50)
+
+    generator = np.random.RandomState(5)
+    prototypes = generator.rand(20, 32) < 0.2
+    vectors = (prototypes[generator.randint(0, 20, 3000)] ^ (generator.rand(3000, 32) < 0.05)).astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-6)
+
+    index = ANNIndex(32, n_tables=8, n_bits=8)
+    index.build(list(range(2900)), vectors[:2900])
+    for item_id in range(2900, 3000):
+        index.add(item_id, vectors[item_id])
+    assert len(index) == 3000
+
+    # Recall@10 against brute force, counting ties at the 10th score as hits
+    hits = 0
+    for query in vectors[:50]:
+        kth_score = index.brute_force(query, 10)[-1][1]
+        hits += sum(1 for _, score in index.query(query, 10, probes=2) if score >= kth_score - 1e-6)
+    recall = hits / 500
+    print(f"Recall@10: {recall:.3f}")
+    assert recall > 0.9
+
+    assert index.remove(0)
+    assert 0 not in [item_id for item_id, _ in index.query(vectors[0], 10, probes=2)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'profiles')
+        index.save(path)
+        # Only live rows are written
+        assert len(np.load(path + '.npz')['vectors']) == 2999
+        restored = ANNIndex.load(path)
+    assert len(restored) == 2999
+    assert restored.query(vectors[1], 5, probes=2) == index.query(vectors[1], 5, probes=2)
+
+    # Re-adding the same items over and over compacts instead of growing
+    for repeat in range(10):
+        for item_id in range(1, 1001):
+            index.add(item_id, vectors[(item_id + repeat) % 3000])
+    print(f"Rows after 10000 updates: {len(index.ids)} for {len(index)} items")
+    assert len(index) == 2999 and len(index.ids) < 2999 * 1.34
+    assert sum(len(bucket) for bucket in index.tables[0].values()) == len(index.ids)
+    index.compact()
+    assert len(index.ids) == len(index) == 2999
+    assert np.array_equal(index.vector(1), vectors[10]) and index.vector(0) is None
+
+    # ...and answers like an index built from the current vectors
+    current = {item_id: vectors[(item_id + 9) % 3000] if item_id <= 1000 else vectors[item_id] for item_id in range(1, 3000)}
+    fresh = ANNIndex(32, n_tables=8, n_bits=8)
+    fresh.build(list(current), np.array(list(current.values())))
+    for query in vectors[:20]:
+        assert [score for _, score in index.query(query, 10, probes=2)] == \
+            [score for _, score in fresh.query(query, 10, probes=2)]
+
+    encoder = ProfileEncoder(['python', 'sql', 'react', 'css'])
+    python_sql = encoder.encode(['Python', 'SQL'], 3, ['Bachelor'])
+    assert float(python_sql @ encoder.encode(['python', 'sql'], 4)) > float(python_sql @ encoder.encode(['react', 'css'], 3))
+
+    print("\n" + "=" * 50)
+    print("ANN Profile Index Test Complete!")
+
+if __name__ == "__main__":
+    test_ann_index()
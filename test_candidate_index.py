@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the candidate ranking index
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+import numpy as np
+from services.candidate_index import CandidateIndex
+
+def test_candidate_index():
+    print("Testing Candidate Index...")
+    print("=" * 50)
+
+    index = CandidateIndex(['python', 'sql', 'react', 'aws'], capacity=2)
+    index.add('alice', ['python', 'sql', 'aws'], 4, ['Master of Science'])
+    index.add('bob', ['react', 'javascript'], 1, ['Bachelor of Arts'])
+    index.add('carol', ['python'], 7, [])
+    index.add('dave', ['python', 'sql'], 2, ['PhD'])
+
+    results = index.search(['python', 'sql'], ['aws'], top_k=3)
+    for result in results:
+        print(f"  {result['candidate_id']}: {result['score']} (skills {result['skill_match']}%)")
+    assert [result['candidate_id'] for result in results] == ['alice', 'dave', 'carol']
+    assert results[0]['skill_match'] == 100.0
+    assert results[2]['missing_required_skills'] == ['sql']
+
+    # Pre-filters and incremental updates
+    assert [r['candidate_id'] for r in index.search(['python'], experience_level='Senior Level')] == ['carol']
+    assert [r['candidate_id'] for r in index.search(['python'], min_education='master')] == ['alice', 'dave']
+    assert [r['candidate_id'] for r in index.search(['python'], min_education="Master's")] == ['alice', 'dave']
+    assert [r['candidate_id'] for r in index.search(['python'], min_education=3)] == ['dave']
+    try:
+        index.search(['python'], min_education='diploma')
+        assert False, "an unknown education tier was accepted"
+    except ValueError as e:
+        assert 'bachelor' in str(e)
+    assert index.skills.dtype == np.uint8
+    index.add('carol', ['python', 'sql', 'aws'], 8, ['Master'])
+    assert index.search(['python', 'sql'], ['aws'], top_k=1)[0]['candidate_id'] == 'carol'
+    assert index.delete('carol')
+    assert 'carol' not in [r['candidate_id'] for r in index.search(['python'])]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'candidates')
+        index.save(path)
+        restored = CandidateIndex.load(path)
+    assert len(restored) == 3
+    assert restored.search(['python', 'sql'], ['aws']) == index.search(['python', 'sql'], ['aws'])
+
+    print("\n" + "=" * 50)
+    print("Candidate Index Test Complete!")
+
+if __name__ == "__main__":
+    test_candidate_index()
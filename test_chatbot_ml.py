@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the chatbot ML helpers
+"""
+
+import sys
+import os
+import tempfile
+import uuid
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.chatbot_ml import ChatbotML
+
+def test_chatbot_parsing():
+    print("Testing Chatbot Message Parsing...")
+    print("=" * 50)
+
+    chatbot = ChatbotML()
+
+    test_cases = [
+        {
+            'message': 'I know Python, JavaScript and SQL with 3 years of experience',
+            'skills': 'python, javascript, java, sql',
+            'experience': '3 years'
+        },
+        {
+            'message': 'Senior engineer, I love design and blockchain',
+            'skills': '',
+            'interests': 'ai, blockchain, design',
+            'experience': '5+ years'
+        },
+        {
+            'message': 'Just starting out',
+            'skills': '',
+            'experience': '1 year'
+        }
+    ]
+
+    for i, test_case in enumerate(test_cases, 1):
+        parsed = chatbot._parse_user_input(test_case['message'])
+        print(f"Test Case {i}: {test_case['message']}")
+        print(f"  Skills: {parsed['skills'] or '-'}")
+        print(f"  Interests: {parsed['interests'] or '-'}")
+        print(f"  Experience: {parsed['experience']}")
+
+        assert parsed['skills'] == test_case['skills']
+        assert parsed['experience'] == test_case['experience']
+        if 'interests' in test_case:
+            assert parsed['interests'] == test_case['interests']
+
+    # Equivalent prompts share one cached result
+    first = chatbot.get_career_recommendations('I know Python and React')
+    second = chatbot.get_career_recommendations('  i know   PYTHON and react ')
+    assert first is second
+    print(f"Cache: {chatbot.recommendation_cache.stats()}")
+
+    print("\n" + "=" * 50)
+    print("Chatbot Parsing Test Complete!")
+
+def test_chatbot_sessions():
+    print("Testing Chatbot Sessions...")
+    print("=" * 50)
+
+    chatbot = ChatbotML()
+    session_id = uuid.uuid4().hex
+    turns = [
+        'I know Python',
+        'I also like design',
+        'and I have 4 years of experience with React, SQL'
+    ]
+
+    for turn in turns:
+        result = chatbot.get_career_recommendations(turn, session_id=session_id)
+        top = result['recommendations'][0]
+        print(f"Turn {result['session']['turns']}: {turn}")
+        print(f"  Profile skills: {', '.join(result['session']['skills'])}")
+        print(f"  Top Match: {top['career']} ({top['match_percentage']:.1f}%)")
+
+    # Incremental scoring matches a one-shot prediction on the accumulated profile
+    expected = chatbot.career_recommender.predict({
+        'skills': 'python, react, sql',
+        'interests': 'design',
+        'goals': ', '.join(turns).lower(),
+        'experience': '4 years'
+    })
+    assert result['session']['skills'] == ['python', 'react', 'sql']
+    assert result['recommendations'] == expected['recommendations']
+    assert result['insights'] == expected['insights']
+
+    assert chatbot.clear_session(session_id)
+    result = chatbot.get_career_recommendations('I like design', session_id=session_id)
+    assert result['session']['turns'] == 1
+
+    # Repeating a message does not count its goals twice
+    repeat_id = uuid.uuid4().hex
+    first = chatbot.get_career_recommendations('I enjoy data analysis and machine learning', session_id=repeat_id)
+    repeated = chatbot.get_career_recommendations('I enjoy data analysis and machine learning', session_id=repeat_id)
+    assert repeated['recommendations'] == first['recommendations']
+
+    # Two workers sharing the SQLite store see each other's turns instead of overwriting them
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'sessions.db')
+        worker_a = ChatbotML(session_db=path, career_recommender=chatbot.career_recommender)
+        worker_b = ChatbotML(session_db=path, career_recommender=chatbot.career_recommender)
+        shared_id = uuid.uuid4().hex
+        worker_a.get_career_recommendations('I know Python', session_id=shared_id)
+        worker_b.get_career_recommendations('I also know SQL', session_id=shared_id)
+        result = worker_a.get_career_recommendations('and React', session_id=shared_id)
+        assert result['session']['turns'] == 3
+        assert result['session']['skills'] == ['python', 'sql', 'react']
+        assert worker_b.get_career_recommendations('and React', session_id=shared_id)['session']['turns'] == 4
+
+    # Session ids are random tokens; guessable ones such as a user id are refused
+    for weak in ('test-session', '42', '64b7f0c2e4b0a1a2b3c4d5e6', 'a' * 40, 'not a token' * 4):
+        try:
+            chatbot.clear_session(weak)
+            assert False, f"session id {weak!r} was accepted"
+        except ValueError:
+            pass
+    assert not chatbot.clear_session(str(uuid.uuid4()))
+
+    print("\n" + "=" * 50)
+    print("Chatbot Sessions Test Complete!")
+
+def test_chatbot_intents():
+    print("Testing Chatbot Intent Routing...")
+    print("=" * 50)
+
+    chatbot = ChatbotML()
+    test_cases = [
+        ('What career suits someone who knows Python?', 'recommendations'),
+        ('What skills am I missing for DevOps Engineer?', 'skills_gap'),
+        ('Recommend courses to learn SQL', 'learning_resources'),
+        ('What is the salary of a Data Scientist?', 'market_insights')
+    ]
+
+    for message, expected in test_cases:
+        result = chatbot.handle_message(message)
+        print(f"{message} -> {result['intent']} ({result['confidence']:.2f})")
+        assert result['intent'] == expected
+        assert result['response']
+
+    batch = chatbot.classify_intents([message for message, _ in test_cases])
+    assert [item['intent'] for item in batch] == [expected for _, expected in test_cases]
+
+    # Empty messages and small talk fall back to a general answer instead of a guessed intent
+    for message in ('', 'hello', 'how are you', 'thanks'):
+        result = chatbot.handle_message(message)
+        assert result['intent'] == 'general', (message, result['intent'], result['confidence'])
+        assert result['response']['examples']
+    assert [item['intent'] for item in chatbot.classify_intents(['hi there', 'What is the salary of a Data Scientist?'])] \
+        == ['general', 'market_insights']
+
+    print("\n" + "=" * 50)
+    print("Chatbot Intent Routing Test Complete!")
+
+if __name__ == "__main__":
+    test_chatbot_parsing()
+    test_chatbot_sessions()
+    test_chatbot_intents()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming DOCX text extractor
+"""
+
+import sys
+import os
+import io
+import zipfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+import docx
+from services.docx_text import extract_docx_text
+
+TEXT_BOX_DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+            xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">
+  <w:body>
+    <w:p><w:r><w:t>Experience</w:t></w:r></w:p>
+    <w:p><w:r><mc:AlternateContent>
+      <mc:Choice Requires="wps"><w:txbxContent><w:p><w:r><w:t>Kubernetes</w:t><w:tab/><w:t>Terraform</w:t></w:r></w:p></w:txbxContent></mc:Choice>
+      <mc:Fallback><w:txbxContent><w:p><w:r><w:t>Kubernetes</w:t><w:tab/><w:t>Terraform</w:t></w:r></w:p></w:txbxContent></mc:Fallback>
+    </mc:AlternateContent></w:r></w:p>
+    <w:p><w:r><w:t xml:space="preserve">Data Engineer, </w:t></w:r><w:r><w:t>2019 - 2023</w:t></w:r></w:p>
+  </w:body>
+</w:document>"""
+
+def build_resume():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    document.sections[0].footer.paragraphs[0].text = "References on request"
+    document.add_paragraph("Summary of a backend engineer")
+    table = document.add_table(rows=2, cols=2)
+    for cell, skill in zip((cell for row in table.rows for cell in row.cells), ['python', 'docker', 'sql', 'aws']):
+        cell.text = skill
+    document.add_paragraph("Bachelor of Science in Computer Science")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+def test_docx_text():
+    print("Testing Streaming DOCX Extraction...")
+    print("=" * 50)
+
+    text = extract_docx_text(build_resume())
+    print(text)
+    lines = text.splitlines()
+    # Header first, then the body with its table in place, footer last
+    assert lines[0] == "Jane Doe | jane@example.com"
+    assert lines[-1] == "References on request"
+    assert lines.index("Summary of a backend engineer") < lines.index("python") < lines.index("Bachelor of Science in Computer Science")
+    for skill in ('python', 'docker', 'sql', 'aws'):
+        assert skill in lines
+
+    # Text boxes are read once (not again from their VML fallback), runs joined, tabs kept
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', TEXT_BOX_DOCUMENT)
+    text = extract_docx_text(buffer)
+    assert text == "Experience\nKubernetes\tTerraform\n\nData Engineer, 2019 - 2023\n", repr(text)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('content.xml', '<office/>')
+    try:
+        extract_docx_text(buffer)
+        assert False, "a zip without word/document.xml was accepted"
+    except ValueError as e:
+        print(f"Rejected: {e}")
+
+    print("\n" + "=" * 50)
+    print("Streaming DOCX Extraction Test Complete!")
+
+if __name__ == "__main__":
+    test_docx_text()
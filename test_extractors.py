@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for the resume text extractor registry
+"""
+
+import sys
+import os
+import io
+import zipfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+import docx
+from services.extractors import ExtractorRegistry, parse_order
+
+RTF = (rb"{\rtf1\ansi\deff0{\fonttbl{\f0 Calibri;}}{\*\generator Writer;}"
+       rb"\f0 Senior Data Engineer\par Skills: Python, SQL\tab Spark\par Caf\'e9 \u8212? 2019 - 2023\par}")
+
+ODT_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+    xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0">
+  <office:body><office:text>
+    <text:h>Jane Doe</text:h>
+    <text:p>Backend <text:span>engineer</text:span><text:s text:c="2"/>since 2018</text:p>
+    <table:table><table:table-row>
+      <table:table-cell><text:p>python</text:p></table:table-cell>
+      <table:table-cell><text:p>docker</text:p></table:table-cell>
+    </table:table-row></table:table>
+  </office:text></office:body>
+</office:document-content>"""
+
+HTML = b"""<!DOCTYPE html><html><head><title>CV</title><style>p {color: red}</style></head>
+<body><h1>Jane Doe</h1><script>var skills = 'cobol';</script>
+<ul><li>Python &amp; SQL</li><li>React</li></ul></body></html>"""
+
+def odt_file():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        archive.writestr('content.xml', ODT_CONTENT)
+    buffer.seek(0)
+    return buffer
+
+def docx_file():
+    document = docx.Document()
+    document.add_paragraph("Python developer")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+def test_extractors():
+    print("Testing Extractor Registry...")
+    print("=" * 50)
+
+    registry = ExtractorRegistry()
+
+    # Formats come from the bytes: the names here are deliberately wrong
+    text, fmt, backend = registry.extract(io.BytesIO(RTF), 'resume.txt')
+    assert (fmt, backend) == ('rtf', 'stripper')
+    assert text == "Senior Data Engineer\nSkills: Python, SQL\tSpark\nCafé — 2019 - 2023\n", repr(text)
+
+    text, fmt, _ = registry.extract(odt_file(), 'resume.docx')
+    assert fmt == 'odt'
+    assert text == "Jane Doe\nBackend engineer  since 2018\npython\ndocker\n", repr(text)
+
+    text, fmt, _ = registry.extract(io.BytesIO(HTML), 'resume.htm')
+    assert fmt == 'html'
+    assert text == "Jane Doe\nPython & SQL\nReact\n", repr(text)
+
+    text, fmt, backend = registry.extract(docx_file(), 'resume.bin')
+    assert (fmt, backend) == ('docx', 'streaming') and text == "Python developer\n"
+
+    text, fmt, _ = registry.extract(io.BytesIO('Développeur Python'.encode('utf-8')), 'resume')
+    assert fmt == 'txt' and text == 'Développeur Python'
+
+    # Text is only a fallback for text names: a corrupt binary upload is an error, not an empty resume
+    for data, filename, error in [(b'garbage not a pdf', 'cv.pdf', 'Error reading PDF'),
+                                  (HTML, 'resume.pdf', 'Error reading PDF'),
+                                  (b'PK\x03\x04truncated', 'resume.docx', 'Error reading DOCX'),
+                                  (b'plain text', 'resume.png', 'Unsupported file format')]:
+        try:
+            registry.extract(io.BytesIO(data), filename)
+            assert False, f"{filename} was read as text"
+        except Exception as e:
+            assert str(e).startswith(error), str(e)
+
+    try:
+        registry.extract(io.BytesIO(b'\xd0\xcf\x11\xe0\x00\x00legacy doc'), 'resume.doc')
+        assert False, "a legacy .doc was accepted"
+    except ValueError as e:
+        print(f"Rejected: {e}")
+
+    # A failing or empty backend hands over to the next one for the format
+    def broken(file_stream):
+        raise RuntimeError("parser crashed")
+    registry = ExtractorRegistry()
+    registry.register('docx', 'broken', broken)
+    registry.register('docx', 'blank', lambda file_stream: '  \n')
+    registry.order['docx'] = ['broken', 'blank', 'streaming']
+    text, _, backend = registry.extract(docx_file(), 'resume.docx')
+    assert backend == 'streaming' and text == "Python developer\n"
+    registry.order['docx'] = ['broken']
+    try:
+        registry.extract(docx_file(), 'resume.docx')
+        assert False, "a failure of every backend was not reported"
+    except Exception as e:
+        assert 'parser crashed' in str(e)
+
+    metrics = registry.metrics()['docx']['backends']
+    print(f"DOCX metrics: {metrics}")
+    assert metrics['broken']['failures'] == 2 and metrics['blank']['empty'] == 1
+    assert metrics['streaming']['ok'] == 1 and metrics['streaming']['p50_ms'] >= 0
+
+    # Order configuration
+    assert parse_order('pdf=pdfminer, pypdf2; docx=streaming') == {'pdf': ['pdfminer', 'pypdf2'], 'docx': ['streaming']}
+    assert ExtractorRegistry(parse_order('docx=python-docx')).order['docx'] == ['python-docx']
+    for spec in ('doc=streaming', 'docx=fast'):
+        try:
+            ExtractorRegistry(parse_order(spec))
+            assert False, f"{spec} was accepted"
+        except ValueError as e:
+            print(f"Rejected order: {e}")
+
+    print("\n" + "=" * 50)
+    print("Extractor Registry Test Complete!")
+
+if __name__ == "__main__":
+    test_extractors()
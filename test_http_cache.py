@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test script for ETag and response compression helpers
+"""
+
+import sys
+import os
+import gzip
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.http_cache import choose_encoding, compress, content_version, request_etag
+
+def test_http_cache():
+    print("Testing ETags and Compression...")
+    print("=" * 50)
+
+    # Key order does not change the tag; the input or the catalogue version does
+    etag = request_etag({'skills': 'python', 'interests': 'data'}, 'v1')
+    assert etag == request_etag({'interests': 'data', 'skills': 'python'}, 'v1')
+    assert etag != request_etag({'skills': 'python, sql', 'interests': 'data'}, 'v1')
+    assert etag != request_etag({'skills': 'python', 'interests': 'data'}, 'v2')
+    assert content_version({'a': [1, 2]}) == content_version({'a': [1, 2]})
+    print(f"ETag: {etag}")
+
+    assert choose_encoding('gzip, deflate, br') == 'gzip'
+    assert choose_encoding('gzip;q=0, deflate') is None
+    assert choose_encoding('*') in ('zstd', 'gzip')
+    assert choose_encoding('') is None
+
+    body = b'{"recommendations": [' + b'{"career": "Data Scientist", "match": 81.5},' * 200 + b'{}]}'
+    packed = compress(body, 'gzip')
+    assert gzip.decompress(packed) == body
+    # Deterministic output, so identical bodies compress to identical bytes
+    assert compress(body, 'gzip') == packed
+    print(f"gzip: {len(body)} -> {len(packed)} bytes")
+
+    print("\n" + "=" * 50)
+    print("ETag and Compression Test Complete!")
+
+if __name__ == "__main__":
+    test_http_cache()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk resume ingestion CLI
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+import docx
+from ingest_resumes import list_sources, load_checkpoint, main
+
+RESUME = """Jane Doe
+Backend Developer with 4 years of experience
+Skills: Python, Flask, SQL, Docker, AWS
+Bachelor of Science in Computer Science
+"""
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_ingest_resumes():
+    print("Testing Bulk Resume Ingestion...")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        resumes = os.path.join(directory, 'resumes')
+        os.makedirs(os.path.join(resumes, 'batch'))
+        for index in range(4):
+            with open(os.path.join(resumes, 'batch', f"resume-{index}.txt"), 'w') as f:
+                f.write(RESUME.replace('Jane', f"Jane {index}"))
+        with open(os.path.join(resumes, 'broken.docx'), 'wb') as f:
+            f.write(b'garbage not a docx')
+        with open(os.path.join(resumes, 'notes.md'), 'w') as f:
+            f.write('not a resume format')
+        output = os.path.join(directory, 'analyses.jsonl')
+        run = ['--output', output, '--workers', '1', '--chunk-size', '1']
+
+        sources = list_sources(resumes)
+        assert sources == ['batch/resume-0.txt', 'batch/resume-1.txt', 'batch/resume-2.txt',
+                           'batch/resume-3.txt', 'broken.docx']
+
+        # A failure is recorded and reported through the exit code
+        assert main([resumes] + run) == 1
+        records = read_records(output)
+        assert sorted(record['source'] for record in records) == sources
+        failed = [record for record in records if 'error' in record]
+        assert [record['source'] for record in failed] == ['broken.docx']
+        print(f"Failed: {failed[0]['error']}")
+
+        # A torn last line is cut off and only that source is analysed again
+        with open(output, 'rb') as f:
+            data = f.read()
+        last_line_start = data.rstrip(b'\n').rfind(b'\n') + 1
+        torn = json.loads(data[last_line_start:])['source']
+        with open(output, 'wb') as f:
+            f.write(data[:last_line_start + 20])
+        assert load_checkpoint(output) == set(sources) - {torn}
+        assert os.path.getsize(output) == last_line_start
+        main([resumes] + run)
+        records = read_records(output)
+        assert sorted(record['source'] for record in records) == sources, "a source was processed twice"
+        assert records[-1]['source'] == torn
+
+        # A plain re-run leaves the failure alone
+        before = read_records(output)
+        assert main([resumes] + run) == 0
+        assert read_records(output) == before
+
+        # --retry-failed analyses only the failed source again
+        document = docx.Document()
+        for line in RESUME.splitlines():
+            document.add_paragraph(line)
+        document.save(os.path.join(resumes, 'broken.docx'))
+        assert main([resumes] + run + ['--retry-failed']) == 0
+        records = read_records(output)
+        assert sorted(record['source'] for record in records) == sources
+        assert records[-1]['source'] == 'broken.docx' and 'analysis' in records[-1]
+        assert [record for record in records if record['source'] != 'broken.docx'] == \
+            [record for record in before if record['source'] != 'broken.docx']
+        print(f"Retried: {records[-1]['source']} ({records[-1]['analysis']['match_percentage']}% match)")
+
+    print("\n" + "=" * 50)
+    print("Bulk Resume Ingestion Test Complete!")
+
+if __name__ == "__main__":
+    test_ingest_resumes()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the job recommendation index
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.job_index import JobIndex
+from services.sharded_index import ShardedJobIndex
+
+def test_job_index():
+    print("Testing Job Index...")
+    print("=" * 50)
+
+    postings = [
+        {'id': 'j1', 'title': 'Backend Developer', 'skills': ['python', 'sql'], 'experience': 'Mid Level',
+         'applicationDeadline': '2099-01-01T00:00:00.000Z'},
+        {'id': 'j2', 'title': 'Data Engineer', 'skills': ['python', 'spark', 'aws'], 'experience': 'Senior Level',
+         'applicationDeadline': '2099-01-01T00:00:00.000Z'},
+        {'id': 'j3', 'title': 'Frontend Developer', 'skills': ['react', 'css'], 'experience': 'Entry Level'},
+        {'id': 'j4', 'title': 'Old Posting', 'skills': ['python'], 'applicationDeadline': '2001-01-01T00:00:00.000Z'},
+        {'id': 'j5', 'title': 'Closed Posting', 'skills': ['python'], 'status': 'closed'}
+    ]
+    # Lines that are not JSON objects are skipped like malformed ones
+    lines = [json.dumps(posting) for posting in postings] + ['"j6"', '[1, 2]', '{broken']
+    snapshot = '\n'.join(lines).encode('utf-8')
+
+    index = JobIndex(['python', 'sql', 'react'])
+    assert index.ingest_stream(snapshot) == (4, 4)
+    assert not index.add_posting('j6')
+
+    jobs = index.recommend(['Python', 'SQL'], experience_years=3)
+    for job in jobs:
+        print(f"  {job['job_id']} {job['title']}: {job['score']} (missing {job['missing_skills']})")
+    # Past-deadline postings are hidden even before the expiry sweep runs
+    assert [job['job_id'] for job in jobs] == ['j1', 'j2']
+    assert jobs[0]['skill_coverage'] == 100.0
+    assert index.recommend(['python', 'sql'], top_k=1, offset=1)[0]['job_id'] == 'j2'
+
+    # Expiry and closing are tombstones; reopening re-indexes the posting
+    assert index.expire_before() == 1
+    index.add_posting(dict(postings[0], status='closed'))
+    assert [job['job_id'] for job in index.recommend(['python'])] == ['j2']
+    index.add_posting(dict(postings[0], skills=['python', 'react']))
+    assert [job['job_id'] for job in index.recommend(['react', 'python'], experience_years=3)] == ['j1', 'j3', 'j2']
+    assert len(index) == 3
+
+    # The sharded index skips the same non-object postings
+    sharded = ShardedJobIndex(['python', 'sql', 'react'], n_shards=2)
+    try:
+        assert [sharded.add_posting(posting) for posting in (postings[0], 'x', 3, None)] == [True, False, False, False]
+        assert sharded.ingest_stream(snapshot) == (4, 4)
+    finally:
+        sharded.close()
+
+    print("\n" + "=" * 50)
+    print("Job Index Test Complete!")
+
+if __name__ == "__main__":
+    test_job_index()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the job market statistics engine
+"""
+
+import sys
+import os
+import io
+import json
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.market_stats import JobMarketStats, QuantileSketch
+
+def test_market_stats():
+    print("Testing Job Market Statistics...")
+    print("=" * 50)
+
+    random.seed(7)
+    titles = ['Senior Software Engineer', 'Data Scientist', 'Frontend Developer', 'DevOps Engineer']
+    postings = [
+        {
+            'title': random.choice(titles),
+            'salaryMin': random.randint(50, 90) * 1000,
+            'salaryMax': random.randint(100, 160) * 1000,
+            'skills': random.sample(['python', 'sql', 'react', 'aws', 'docker'], 2),
+            'company': random.choice(['Acme', 'Globex', 'Initech']),
+            'location': 'Remote'
+        }
+        for _ in range(2000)
+    ]
+
+    # Two workers ingest half each, then merge
+    first, second = JobMarketStats(), JobMarketStats()
+    export = '\n'.join(json.dumps(posting) for posting in postings)
+    half = export.split('\n')
+    first.ingest_stream(io.BytesIO('\n'.join(half[:1000]).encode()))
+    second.ingest_stream(io.BytesIO('\n'.join(half[1000:]).encode()))
+    merged = first.merge(JobMarketStats.from_dict(second.to_dict()))
+
+    insights = merged.insights('Data Scientist')
+    expected = sorted(
+        (p['salaryMin'] + p['salaryMax']) / 2 for p in postings if p['title'] == 'Data Scientist'
+    )
+    true_median = expected[(len(expected) - 1) // 2]
+
+    print(f"Postings: {merged.total_postings}, roles: {sorted(merged.roles)}")
+    print(f"Data Scientist: {insights['postings']} postings, median {insights['salary_percentiles']['p50']:,}")
+    print(f"Top skills: {', '.join(insights['top_skills'])}")
+
+    assert merged.total_postings == 2000
+    assert insights['postings'] == len(expected)
+    assert abs(insights['salary_percentiles']['p50'] - true_median) / true_median < 0.02
+
+    # Lines that are not JSON objects are skipped and counted, not fatal
+    stats = JobMarketStats()
+    lines = [json.dumps(postings[0]), '[1, 2]', '"x"', 'null', '{broken', json.dumps(postings[1])]
+    assert stats.ingest_stream(io.BytesIO('\n'.join(lines).encode())) == (2, 4)
+
+    # So are objects whose counted fields have the wrong types
+    malformed = [dict(postings[0], company={'name': 'Acme'}), dict(postings[0], location=7),
+                 dict(postings[0], skills=['python', 3]), dict(postings[0], skills={'python': 1}),
+                 dict(postings[0], experience=['Mid Level'])]
+    lines = [json.dumps(posting) for posting in malformed] + [json.dumps(dict(postings[0], skills='python; sql'))]
+    assert stats.ingest_stream(io.BytesIO('\n'.join(lines).encode())) == (1, 5)
+    assert stats.total_postings == 3
+
+    sketch = QuantileSketch()
+    for value in range(1, 10001):
+        sketch.add(value)
+    p90 = sketch.quantiles([0.9])[0]
+    assert abs(p90 - 9000) / 9000 < 0.02
+
+    print("\n" + "=" * 50)
+    print("Job Market Statistics Test Complete!")
+
+if __name__ == "__main__":
+    test_market_stats()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for per-request profiling and the profile store
+"""
+
+import sys
+import os
+import pstats
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.profiling import DeterministicProfiler, ProfileStore, StackSampler, start_profiler
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+def test_profiling():
+    print("Testing Per-Request Profiling...")
+    print("=" * 50)
+
+    # The sampler sees the profiled thread's stack, root first, with line numbers
+    sampler = start_profiler('sample', interval=0.002)
+    assert isinstance(sampler, StackSampler)
+    busy_loop(0.2)
+    sampler.stop()
+    print(f"Samples: {sampler.samples}, distinct stacks: {len(sampler.stacks)}")
+    assert sampler.samples > 10
+    busy_stacks = [stack for stack in sampler.stacks if 'busy_loop (test_profiling.py:' in stack]
+    assert sum(sampler.stacks[stack] for stack in busy_stacks) >= sampler.samples * 0.8
+    assert all(stack.index('test_profiling (') < stack.index('busy_loop (') for stack in busy_stacks)
+
+    deterministic = start_profiler('cprofile')
+    assert isinstance(deterministic, DeterministicProfiler)
+    busy_loop(0.01)
+    deterministic.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProfileStore(directory, keep=2)
+        first = store.save(store.new_id(), sampler, {'endpoint': 'analyze_resume', 'status': 200})
+        time.sleep(0.002)
+        second = store.save(store.new_id(), deterministic, {'endpoint': 'recommend_career', 'status': 200})
+        assert first['samples'] == sampler.samples and second['samples'] is None
+
+        with open(store.path(first['id'])) as f:
+            lines = f.read().splitlines()
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+        assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == sampler.samples
+        stats = pstats.Stats(store.path(second['id']))
+        assert any(function[2] == 'busy_loop' for function in stats.stats)
+
+        assert [profile['id'] for profile in store.list()] == [second['id'], first['id']]
+        assert store.path('../' + first['id']) is None
+        assert store.path('unknown') is None
+
+        # Only the newest `keep` profiles stay
+        time.sleep(0.002)
+        third = store.save(store.new_id(), sampler, {'endpoint': 'chatbot_message', 'status': 200})
+        assert [profile['id'] for profile in store.list()] == [third['id'], second['id']]
+        assert store.path(first['id']) is None
+        assert len(os.listdir(directory)) == 4
+
+    print("\n" + "=" * 50)
+    print("Per-Request Profiling Test Complete!")
+
+if __name__ == "__main__":
+    test_profiling()
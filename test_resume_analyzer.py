@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
 
 from services.resume_analyzer import ResumeAnalyzer
+from services.resume_sections import segment_sections
 import io
 
 def create_mock_file(content, filename="test_resume.txt"):
@@ -120,5 +121,163 @@ def test_resume_analyzer():
     print("\n" + "=" * 50)
     print("Resume Analyzer Test Complete!")
 
+def test_resume_duplicates():
+    print("Testing Near-Duplicate Resume Detection...")
+    print("=" * 50)
+
+    ra = ResumeAnalyzer()
+    resume = """
+    Priya Sharma | priya@example.com | Phone: 555-0101 | Updated: March 2024
+    Backend Engineer with a focus on Python services and data pipelines.
+
+    Experience:
+    Senior Backend Engineer at Cloudworks (2019-2024)
+    - Designed REST APIs in Python and Flask serving two million requests a day
+    - Migrated reporting jobs from cron scripts to Spark on AWS
+    - Ran PostgreSQL and Redis clusters, cutting query latency by forty percent
+    - Mentored four engineers and led the on-call rotation
+    Software Engineer at Datalane (2016-2019)
+    - Built ETL pipelines with Pandas and SQL for the analytics team
+    - Containerised services with Docker and deployed them on Kubernetes
+
+    Education:
+    Bachelor of Technology in Computer Science, National Institute (2012-2016)
+
+    Skills: Python, Flask, SQL, PostgreSQL, Redis, Spark, AWS, Docker, Kubernetes, Pandas, Git, Linux
+    """
+    edited = resume.replace('555-0101', '555-0199').replace('March 2024', 'June 2024')
+
+    # Off by default: nothing is indexed or reused
+    assert 'resume_id' not in ra.analyze(create_mock_file(resume), 'Backend Developer', applicant_id='u1')
+
+    first = ra.analyze(create_mock_file(resume), 'Backend Developer', duplicates='reuse', applicant_id='u1')
+    assert 'duplicate' not in first
+
+    # Re-uploading the same text (whitespace aside) reuses the earlier analysis
+    second = ra.analyze(create_mock_file('  ' + resume.replace('\n', '\n\n')), 'Backend Developer',
+                        duplicates='reuse', applicant_id='u1')
+    print(f"Duplicate of {second['duplicate']['resume_id']} (similarity {second['duplicate']['similarity']})")
+    assert second['duplicate']['resume_id'] == first['resume_id']
+    assert second['duplicate']['reused']
+    assert second['match_percentage'] == first['match_percentage']
+
+    diffed = ra.analyze(create_mock_file(edited + "\nGo"), 'Backend Developer', duplicates='diff', applicant_id='u1')
+    assert diffed['duplicate']['resume_id'] == first['resume_id']
+    assert not diffed['duplicate']['reused']
+    assert diffed['duplicate']['changes']['skills_added'] == ['go']
+
+    # An edited resume is analysed again in reuse mode too, so an added skill shows up
+    third = ra.analyze(create_mock_file(resume + "\nGo"), 'Backend Developer', duplicates='reuse', applicant_id='u1')
+    assert third['duplicate']['resume_id'] in (first['resume_id'], second['resume_id'], diffed['resume_id'])
+    assert not third['duplicate']['reused']
+    assert 'go' in {skill for skills in third['skill_categories'].values() for skill in skills}
+
+    # Another applicant, or an anonymous upload, never gets someone else's analysis or resume id
+    for applicant_id in ('u2', None):
+        other = ra.analyze(create_mock_file(resume), 'Backend Developer', duplicates='reuse', applicant_id=applicant_id)
+        assert 'duplicate' not in other
+        assert other['resume_id'] not in (first['resume_id'], second['resume_id'])
+
+    # An unrelated resume starts its own cluster
+    ra.analyze(create_mock_file(unrelated_resume()), 'Data Scientist', duplicates='reuse')
+    clusters = ra.deduplicator.clusters()
+    assert len(clusters) == 1 and clusters[0]['size'] == 6
+    print(f"Cluster applicants: {[entry['applicant_id'] for entry in clusters[0]['resumes']]}")
+
+    print("\n" + "=" * 50)
+    print("Near-Duplicate Detection Test Complete!")
+
+def test_resume_batch():
+    print("Testing Batch Resume Analysis...")
+    print("=" * 50)
+
+    ra = ResumeAnalyzer()
+    developer = """
+    Sam Lee, Frontend Developer. Built responsive web development projects with
+    JavaScript, React, HTML, CSS and TypeScript. Bachelor of Computer Science (2018-2022).
+    """
+    files = [
+        create_mock_file(developer, "dev.txt"),
+        create_mock_file(unrelated_resume(), "ds.txt"),
+        # Formats are sniffed from the content, so this needs an actual binary header
+        create_mock_file("\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "photo.png"),
+        create_mock_file("   ", "blank.txt"),
+        create_mock_file(developer.replace("\n", "\n\n"), "dev-copy.txt")
+    ]
+    roles = ['Frontend Developer', 'Data Scientist', 'Data Scientist', 'Software Developer', 'Frontend Developer']
+    results = ra.analyze_batch(files, roles, duplicates='reuse', applicant_id='u1')
+
+    # Bad files are reported per file, the rest of the batch still succeeds
+    assert [('error' in result) for result in results] == [False, False, True, True, False]
+    print(f"Errors: {[result['error'] for result in results if 'error' in result]}")
+
+    # Scores from the shared keyword matrix match the one-at-a-time pipeline
+    single = ResumeAnalyzer()
+    for result, text in [(results[0], developer), (results[1], unrelated_resume())]:
+        expected = single.analyze(create_mock_file(text), result['job_role'], duplicates='off')
+        assert {key: value for key, value in result['analysis'].items() if key != 'resume_id'} == expected
+        print(f"{result['filename']} ({result['job_role']}): {result['analysis']['match_percentage']}%")
+
+    # The same text again later in the same batch reuses the earlier analysis
+    assert results[4]['analysis']['duplicate']['resume_id'] == results[0]['analysis']['resume_id']
+    assert results[4]['analysis']['duplicate']['reused']
+
+    # The streaming form yields the same per-file outcomes a chunk at a time
+    streamed = ResumeAnalyzer().iter_analyze_batch(files, roles, duplicates='off', chunk_size=2)
+    assert [('error' in result) for result in streamed] == [False, False, True, True, False]
+
+    print("\n" + "=" * 50)
+    print("Batch Resume Analysis Test Complete!")
+
+def test_resume_sections():
+    print("Testing Resume Section Segmentation...")
+    print("=" * 50)
+
+    resume = """Alex Kim
+Backend developer, 4 years of experience in software development.
+
+WORK EXPERIENCE
+Software Engineer, Acme Systems, 2020 - 2024
+Built REST APIs in Python and SQL.
+
+Education:
+Bachelor of Science in Computer Science, 2012 - 2016
+
+## Skills & Abilities
+Python, SQL, Docker, Git
+"""
+    sections = segment_sections(resume)
+    print([(section['section'], section['heading']) for section in sections])
+    assert [section['section'] for section in sections] == ['header', 'experience', 'education', 'skills']
+    assert sections[3]['heading'] == 'Skills & Abilities'
+    assert resume[sections[2]['start']:sections[2]['end']].strip() == "Bachelor of Science in Computer Science, 2012 - 2016"
+    # Offsets tile the document after the header
+    assert all(a['end'] <= b['start'] for a, b in zip(sections, sections[1:]))
+
+    ra = ResumeAnalyzer()
+    analysis = ra.analyze(create_mock_file(resume, "alex.txt"), "Software Developer", duplicates='off')
+    # The 2012 - 2016 degree is not counted as four more years of work
+    assert analysis['experience_years'] == 4
+    assert analysis['education'] == ['science in computer science']
+    assert [section['section'] for section in analysis['sections']] == ['header', 'experience', 'education', 'skills']
+    assert analysis == ra._analyze_texts([resume], ["Software Developer"])[0]
+
+    # Without headings the whole text is one section and is scanned in full
+    assert segment_sections(unrelated_resume())[0]['section'] == 'header'
+    assert ra.extract_experience(unrelated_resume()) == 2
+
+    print("\n" + "=" * 50)
+    print("Resume Section Segmentation Test Complete!")
+
+def unrelated_resume():
+    return """
+    Jane Smith, Data Scientist. Performed statistical analysis using Python and R,
+    built machine learning models with TensorFlow and created Tableau dashboards.
+    Master of Data Science, Tech University (2017-2019).
+    """
+
 if __name__ == "__main__":
-    test_resume_analyzer()
\ No newline at end of file
+    test_resume_analyzer()
+    test_resume_duplicates()
+    test_resume_batch()
+    test_resume_sections()
\ No newline at end of file
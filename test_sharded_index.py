@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the sharded candidate and job indexes
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.candidate_index import CandidateIndex
+from services.job_index import JobIndex
+from services.sharded_index import ShardedCandidateIndex, ShardedJobIndex, jump_hash
+
+def test_sharded_index():
+    print("Testing Sharded Indexes...")
+    print("=" * 50)
+
+    # Growing the shard count only moves keys onto the new shard
+    keys = [f"candidate-{i}" for i in range(2000)]
+    before = {key: jump_hash(key, 4) for key in keys}
+    after = {key: jump_hash(key, 5) for key in keys}
+    moved = [key for key in keys if before[key] != after[key]]
+    assert all(after[key] == 4 for key in moved)
+    print(f"4 -> 5 shards moved {len(moved)} of {len(keys)} keys")
+
+    random.seed(11)
+    vocabulary = ['python', 'sql', 'react', 'aws', 'docker']
+    local = CandidateIndex(vocabulary)
+    sharded = ShardedCandidateIndex(vocabulary, n_shards=3)
+    jobs_local = JobIndex(vocabulary)
+    jobs_sharded = ShardedJobIndex(vocabulary, n_shards=2)
+    try:
+        for i in range(500):
+            skills = random.sample(vocabulary, 2)
+            experience = random.randint(0, 8)
+            local.add(f"c{i}", skills, experience)
+            sharded.add(f"c{i}", skills, experience)
+            posting = {'id': f"j{i}", 'skills': skills, 'experience': 'Mid Level'}
+            jobs_local.add_posting(posting)
+            jobs_sharded.add_posting(posting)
+
+        query = {'required_skills': ['python', 'sql'], 'preferred_skills': ['aws'], 'top_k': 25}
+        expected = [result['score'] for result in local.search(**query)]
+        assert [result['score'] for result in sharded.search(**query)] == expected
+
+        # Rebalancing keeps every item and every answer
+        sharded.resize(5)
+        assert len(sharded) == 500
+        assert [result['score'] for result in sharded.search(**query)] == expected
+
+        expected_jobs = [job['score'] for job in jobs_local.recommend(['python'], 3, top_k=10, offset=10)]
+        assert [job['score'] for job in jobs_sharded.recommend(['python'], 3, top_k=10, offset=10)] == expected_jobs
+        print(f"Shard sizes: {sharded.broadcast('__len__')}")
+    finally:
+        sharded.close()
+        jobs_sharded.close()
+
+    print("\n" + "=" * 50)
+    print("Sharded Index Test Complete!")
+
+if __name__ == "__main__":
+    test_sharded_index()
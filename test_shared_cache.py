@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-worker recommendation cache
+"""
+
+import sys
+import os
+import multiprocessing
+import random
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.career_recommender import CareerRecommender
+from services.chatbot_ml import ChatbotML
+from services.shared_cache import SharedCache
+
+def predict_in_process(path, profile, queue):
+    recommender = CareerRecommender(cache=SharedCache(path))
+    queue.put((recommender.cached_prediction(profile), recommender.cache.stats()['hits']))
+
+def test_shared_cache():
+    print("Testing Shared Recommendation Cache...")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.db')
+
+        # Versions are part of the lookup; invalidate drops the others
+        cache = SharedCache(path, maxsize=3)
+        cache.set('a', 'v1', {'value': 1})
+        assert cache.get('a', 'v1') == {'value': 1}
+        assert cache.get('a', 'v2') is None
+        other = SharedCache(path)
+        assert other.get('a', 'v1') == {'value': 1}, "entry not visible to another cache on the file"
+        assert other.invalidate('v2') == 1
+        assert SharedCache(path).get('a', 'v1') is None
+
+        # Least recently used rows go first once over maxsize
+        for position, key in enumerate(['a', 'b', 'c', 'd']):
+            cache.set(key, 'v1', position)
+            time.sleep(0.01)
+        cache.prune()
+        fresh = SharedCache(path)
+        assert fresh.get('a', 'v1') is None
+        assert [fresh.get(key, 'v1') for key in 'bcd'] == [1, 2, 3]
+        print(f"Cache stats: {fresh.stats()}")
+        assert fresh.stats()['size'] == 3
+
+        # Expired rows are not served
+        short = SharedCache(os.path.join(directory, 'short.db'), ttl=0.05)
+        short.set('a', 'v1', 1)
+        short.local.clear()
+        time.sleep(0.1)
+        assert short.get('a', 'v1') is None
+
+        # Equivalent profiles share an entry, and the result matches an uncached prediction
+        recommender = CareerRecommender(cache=SharedCache(path))
+        profile = {'skills': 'Python, SQL, Docker', 'interests': 'data analysis',
+                   'experience': '3 years', 'education': "Master's in CS"}
+        reordered = {'skills': ' python,docker ,sql', 'goals': 'Data Analysis',
+                     'experience': '3', 'education': 'MSc, Master of Science'}
+        first = recommender.predict(profile)
+        assert recommender.predict(reordered) is first
+        assert first == CareerRecommender().predict(profile)
+        print(f"Canonical profile: {recommender.canonical_profile(reordered)}")
+
+        # Reordering that changes which tied skill area comes first is a different entry
+        tied = {'skills': 'Java, docker, Node.js'}
+        assert 'strongest skill area is programming' in ' '.join(recommender.predict(tied)['insights'])
+        flipped = recommender.predict({'skills': 'docker, Java, Node.js'})
+        assert 'strongest skill area is cloud' in ' '.join(flipped['insights'])
+
+        # Different experience changes salaries, so it is a different entry
+        senior = recommender.predict(dict(profile, experience='8 years'))
+        assert senior != first
+
+        # Cached predictions are exactly what the recommender computes for each input as given
+        generator = random.Random(0)
+        skill_pool = ['python', 'Java', 'docker', 'Node.js', 'sql', 'react', 'figma', 'aws', 'excel', 'ios']
+        uncached = CareerRecommender()
+        equivalent = CareerRecommender(cache=SharedCache(os.path.join(directory, 'equivalence.db')))
+        for _ in range(500):
+            candidate = {
+                'skills': ', '.join(generator.sample(skill_pool, generator.randint(0, 4))),
+                'interests': generator.choice(['', 'design', 'data analysis, research']),
+                'experience': f"{generator.randint(0, 3)} years",
+                'education': generator.choice(['', 'MBA', 'PhD'])
+            }
+            assert equivalent.predict(candidate) == uncached.predict(candidate)
+        assert equivalent.cache.stats()['hits'] > 0
+
+        # Another process sees the prediction without computing it
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=predict_in_process, args=(path, reordered, queue))
+        process.start()
+        shared, hits = queue.get(timeout=30)
+        process.join()
+        assert shared == first and hits == 1
+
+        # Chatbot answers go through the same cache, streamed or not
+        chatbot = ChatbotML(career_recommender=CareerRecommender(cache=SharedCache(path)))
+        message = "I know python and sql with 2 years of experience"
+        answer = chatbot.get_career_recommendations(message)
+        streamed = ChatbotML(career_recommender=CareerRecommender(cache=SharedCache(path)))
+        events = list(streamed.stream_career_recommendations(message))
+        assert [data for event, data in events if event != 'insights'] == answer['recommendations']
+        assert streamed.career_recommender.cache.stats()['hits'] == 1
+
+    print("\n" + "=" * 50)
+    print("Shared Recommendation Cache Test Complete!")
+
+if __name__ == "__main__":
+    test_shared_cache()
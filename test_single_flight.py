@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight coalescing of identical requests
+"""
+
+import sys
+import os
+import multiprocessing
+import tempfile
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.single_flight import FileSingleFlight, SingleFlight, SingleFlightTimeout, request_key
+
+def run_concurrently(count, target):
+    results = [None] * count
+    def worker(position):
+        try:
+            results[position] = target()
+        except Exception as e:
+            results[position] = e
+    threads = [threading.Thread(target=worker, args=(position,)) for position in range(count)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    return results
+
+def compute_in_process(directory, key, queue):
+    def compute():
+        time.sleep(0.3)
+        return {'pid': os.getpid()}
+    queue.put(FileSingleFlight(directory).do(key, compute, timeout=5))
+
+def test_single_flight():
+    print("Testing Single-Flight Coalescing...")
+    print("=" * 50)
+
+    # Canonical keys: argument order inside a payload does not matter
+    assert request_key({'skills': 'python', 'interests': 'data'}) == request_key({'interests': 'data', 'skills': 'python'})
+    assert request_key('a', 'b') != request_key('ab')
+
+    flight = SingleFlight()
+    calls = []
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'match': 81.5}
+    waits = []
+    results = run_concurrently(5, lambda: flight.do('k', compute, timeout=5, on_wait=lambda: waits.append(1)))
+    assert len(calls) == 1 and len(waits) == 4
+    assert all(result is results[0] for result in results)
+    # Nothing is cached once the call is over
+    flight.do('k', compute)
+    assert len(calls) == 2
+
+    # Every waiter sees the leader's exception
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("unreadable resume")
+    results = run_concurrently(3, lambda: flight.do('bad', failing))
+    assert all(isinstance(result, ValueError) and str(result) == "unreadable resume" for result in results)
+
+    # Followers give up after their timeout; the leader finishes regardless
+    results = run_concurrently(2, lambda: flight.do('slow', lambda: time.sleep(0.3) or 'done', timeout=0.05))
+    assert results[0] == 'done' and isinstance(results[1], SingleFlightTimeout)
+    print(f"Stats: {flight.stats()}")
+    assert flight.stats() == {'leaders': 4, 'followers': 7, 'timeouts': 1, 'in_flight': 0}
+
+    # Across processes: the ones that waited on the lock reuse the first one's outcome
+    with tempfile.TemporaryDirectory() as directory:
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        processes = [context.Process(target=compute_in_process, args=(directory, 'key', queue)) for _ in range(3)]
+        for process in processes:
+            process.start()
+            time.sleep(0.05)
+        outcomes = [queue.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join()
+        print(f"Cross-process outcomes: {outcomes}")
+        assert len({outcome['pid'] for outcome in outcomes}) == 1
+
+        file_flight = FileSingleFlight(directory)
+        try:
+            file_flight.do('error', failing)
+            assert False, "error was swallowed"
+        except ValueError:
+            pass
+
+    print("\n" + "=" * 50)
+    print("Single-Flight Coalescing Test Complete!")
+
+if __name__ == "__main__":
+    test_single_flight()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the precomputed, memory-mapped service snapshot
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.ann_index import ProfileEncoder
+from services.career_recommender import CareerRecommender
+from services.resume_analyzer import ResumeAnalyzer
+from services.snapshot import load_snapshot, write_snapshot
+
+def test_snapshot():
+    print("Testing Service Snapshot...")
+    print("=" * 50)
+
+    analyzer = ResumeAnalyzer()
+    recommender = CareerRecommender()
+    vocabulary = [skill for skills in analyzer.skill_patterns.values() for skill in skills]
+    path = tempfile.mkdtemp()
+    assert load_snapshot(path) is None
+
+    manifest = write_snapshot({
+        'resume_analyzer': analyzer.snapshot_tables(),
+        'career_recommender': recommender.snapshot_tables(),
+        'profile_encoder': ProfileEncoder(vocabulary).snapshot_tables()
+    }, path)
+    print(f"Arrays: {sorted(manifest['arrays'])}")
+
+    # Services built from the mapped tables answer exactly as ones that derive them
+    snapshot = load_snapshot(path)
+    mapped = CareerRecommender(snapshot=snapshot)
+    assert isinstance(mapped._required_table, np.memmap)
+    profile = {'skills': 'python, sql, react, kubernetes, excel', 'interests': 'data', 'experience': '3 years'}
+    assert mapped.predict(profile) == recommender.predict(profile)
+
+    mapped_analyzer = ResumeAnalyzer(snapshot=snapshot)
+    text = "Backend developer: Python, SQL, Docker and API design on AWS. Bachelor of Computer Science."
+    for role in analyzer.job_requirements:
+        assert mapped_analyzer._analyze_texts([text], [role]) == analyzer._analyze_texts([text], [role])
+
+    encoder = ProfileEncoder(vocabulary, snapshot=snapshot)
+    assert np.array_equal(encoder.encode(['python', 'react', 'golang']), ProfileEncoder(vocabulary).encode(['python', 'react', 'golang']))
+
+    # A rebuild replaces the arrays; a snapshot of another catalogue is ignored
+    write_snapshot({'career_recommender': recommender.snapshot_tables()}, path)
+    assert len([name for name in os.listdir(path) if name.endswith('.npy')]) == 2
+    stale = load_snapshot(path)
+    stale.manifest['sections']['career_recommender']['fingerprint'] = 'other'
+    assert CareerRecommender(snapshot=stale).predict(profile) == recommender.predict(profile)
+
+    print("\n" + "=" * 50)
+    print("Service Snapshot Test Complete!")
+
+if __name__ == "__main__":
+    test_snapshot()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for spooled, size-bounded resume uploads
+"""
+
+import sys
+import os
+import io
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ml-service'))
+
+from services.uploads import SpooledUpload, UploadBudget, UploadTooLarge, UploadedFile, detach_upload, open_upload
+
+def test_uploads():
+    print("Testing Upload Limits...")
+    print("=" * 50)
+
+    # Past the spool size the buffer moves to a temporary file
+    upload = SpooledUpload(max_bytes=10000, spool_bytes=100)
+    upload.write(b'a' * 50)
+    assert not upload._rolled
+    upload.write(b'b' * 100)
+    assert upload._rolled and not upload.oversize
+
+    # An oversize file is marked and dropped, not stored
+    upload.write(b'c' * 20000)
+    assert upload.oversize
+    upload.seek(0, io.SEEK_END)
+    assert upload.tell() == 0
+    try:
+        open_upload(UploadedFile('big.txt', upload))
+        assert False, "oversize upload was opened"
+    except UploadTooLarge as e:
+        assert e.limit == 10000
+        print(f"Oversize file: {e}")
+    assert detach_upload(UploadedFile('big.txt', upload)).stream.oversize
+
+    # The request budget is shared by every file and refuses the request
+    budget = UploadBudget(300)
+    first = SpooledUpload(budget=budget)
+    first.write(b'x' * 200)
+    try:
+        SpooledUpload(budget=budget).write(b'y' * 200)
+        assert False, "request budget was not enforced"
+    except UploadTooLarge as e:
+        print(f"Request budget: {e}")
+
+    # Seekable uploads are parsed in place; read()-only files are read once
+    stream = SpooledUpload()
+    stream.write(b'resume text')
+    uploaded = UploadedFile('resume.txt', stream)
+    assert open_upload(uploaded) is stream and stream.tell() == 0
+    try:
+        open_upload(uploaded, max_bytes=5)
+        assert False, "per-file limit was not enforced"
+    except UploadTooLarge:
+        pass
+
+    class ReadOnly:
+        filename = 'resume.txt'
+
+        def read(self):
+            return b'resume text'
+
+    assert open_upload(ReadOnly()).read() == b'resume text'
+    assert detach_upload(uploaded).read() == b'resume text'
+
+    print("\n" + "=" * 50)
+    print("Upload Limits Test Complete!")
+
+if __name__ == "__main__":
+    test_uploads()